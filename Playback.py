@@ -1,300 +1,174 @@
 # (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+import sys
 import time
-from pynput import mouse, keyboard
-import json
+from pynput import keyboard
 import threading
-import pyautogui # <-- New import!
-
-# --- Global Variables ---
-recorded_events = []
-is_recording = False
-recording_start_time = 0
-is_playing = False # <-- New flag for playback state
-
-# --- Event Handlers (from Step 1, unchanged) ---
-
-def on_mouse_click(x, y, button, pressed):
-    """Callback for mouse click events."""
-    global recorded_events, is_recording, recording_start_time
-    if is_recording:
-        event_type = "mouse_click"
-        timestamp = time.time() - recording_start_time
-        recorded_events.append({
-            "type": event_type,
-            "x": x,
-            "y": y,
-            "button": str(button),
-            "pressed": pressed,
-            "time": timestamp
-        })
-        print(f"[REC] Click: ({x}, {y}) {button} {'Pressed' if pressed else 'Released'} @ {timestamp:.3f}s")
-
-def on_mouse_move(x, y):
-    """Callback for mouse movement events."""
-    global recorded_events, is_recording, recording_start_time
-    if is_recording:
-        event_type = "mouse_move"
-        timestamp = time.time() - recording_start_time
-        if not recorded_events or \
-           recorded_events[-1]["type"] != event_type or \
-           abs(recorded_events[-1]["x"] - x) > 1 or \
-           abs(recorded_events[-1]["y"] - y) > 1:
-            recorded_events.append({
-                "type": event_type,
-                "x": x,
-                "y": y,
-                "time": timestamp
-            })
-            # print(f"[REC] Move: ({x}, {y}) @ {timestamp:.3f}s")
-
-def on_mouse_scroll(x, y, dx, dy):
-    """Callback for mouse scroll events."""
-    global recorded_events, is_recording, recording_start_time
-    if is_recording:
-        event_type = "mouse_scroll"
-        timestamp = time.time() - recording_start_time
-        recorded_events.append({
-            "type": event_type,
-            "x": x,
-            "y": y,
-            "dx": dx,
-            "dy": dy,
-            "time": timestamp
-        })
-        print(f"[REC] Scroll: ({x}, {y}) dx={dx}, dy={dy} @ {timestamp:.3f}s")
-
-def on_key_press(key):
-    """Callback for keyboard key press events."""
-    global recorded_events, is_recording, recording_start_time
-    if is_recording:
-        event_type = "key_press"
-        timestamp = time.time() - recording_start_time
-        try:
-            char = key.char
-        except AttributeError:
-            char = str(key)
-        recorded_events.append({
-            "type": event_type,
-            "key": char,
-            "time": timestamp
-        })
-        print(f"[REC] Key Press: {char} @ {timestamp:.3f}s")
-
-def on_key_release(key):
-    """Callback for keyboard key release events."""
-    global recorded_events, is_recording, recording_start_time
-    if is_recording:
-        event_type = "key_release"
-        timestamp = time.time() - recording_start_time
-        try:
-            char = key.char
-        except AttributeError:
-            char = str(key)
-        recorded_events.append({
-            "type": event_type,
-            "key": char,
-            "time": timestamp
-        })
-        print(f"[REC] Key Release: {char} @ {timestamp:.3f}s")
-        
-        # --- Hotkey to Stop Recording (ESC) ---
-        if key == keyboard.Key.esc:
-            print("\nESC key released. Stopping recording...")
-            stop_recording_listeners()
-            return False # Stop the keyboard listener
+from tinytask.recorder import Recorder, recording_tracer
+from tinytask.player import Player, playback_tracer
+from tinytask.macrostore import MacroStore, describe_load_error
+from tinytask.simplify import MoveSimplifier
+from tinytask.looping import FOREVER
+from tinytask.timewarp import TimeWarp, AS_FAST_AS_POSSIBLE
+from tinytask.streamlog import StreamingRecorder
+from tinytask.log import get_logger, setup_logging, TRACE
+
+# Moves closer together than one 120 Hz frame are merged into one injection
+# (clicks, keys and scrolls are never merged or reordered; see coalesce_moves)
+MOVE_QUANTUM_S = 1 / 120
+# Playback speed and repeat count, see parse_time_warp()/parse_repeat() for the command-line flags
+playback_warp = TimeWarp()
+playback_repeat = 1 # Number of iterations, or FOREVER
+playback_repeat_for = None # Seconds after which no new iteration starts
+timing_report_path = None # --timing-report PATH: per-event timing of each run, as .csv or .json
+
+log = get_logger("cli")
+
+# --- Core objects (tinytask/recorder.py, player.py, macrostore.py) ---
+# The recorded or loaded macro and its compiled plan, with any background load in progress
+macro = MacroStore(MOVE_QUANTUM_S)
+
+def on_stop_key():
+    # --- Hotkey to Stop Recording (ESC) ---
+    log.info("\nESC key released. Stopping recording...")
+    stop_recording_listeners()
+
+recorder = Recorder(stop_key=keyboard.Key.esc, on_stop_key=on_stop_key)
 
 
 # --- Listener Management (from Step 1, with minor changes) ---
 
-mouse_listener = None
-keyboard_listener = None
-
-def start_recording_listeners():
-    """Starts listening for mouse and keyboard events."""
-    global is_recording, recorded_events, recording_start_time, mouse_listener, keyboard_listener
+def start_recording_listeners(stream_path=None, source=None):
+    """Starts listening for mouse and keyboard events.
 
-    if is_recording:
-        print("Already recording.")
+    With stream_path, events are streamed to an append-only .ttlog file while
+    recording instead of being held in memory (see tinytask/streamlog.py).
+    `source` replaces the real mouse/keyboard, e.g. with a SyntheticSource.
+    """
+    if recorder.is_recording:
+        log.info("Already recording.")
         return
-    if is_playing: # Prevent recording while playing
-        print("Cannot start recording while playback is active. Stop playback first.")
+    if player.is_playing: # Prevent recording while playing
+        log.info("Cannot start recording while playback is active. Stop playback first.")
         return
 
-    recorded_events = []
-    is_recording = True
-    recording_start_time = time.time()
-    print("\n--- Recording Started ---")
-    print("Press ESC key to stop recording and save 'my_macro.json'.")
-    print("Performing actions now...\n")
-
-    mouse_listener = mouse.Listener(
-        on_click=on_mouse_click,
-        on_move=on_mouse_move,
-        on_scroll=on_mouse_scroll
-    )
-    mouse_listener.start()
-
-    keyboard_listener = keyboard.Listener(
-        on_press=on_key_press,
-        on_release=on_key_release
-    )
-    keyboard_listener.start()
+    log.info("\n--- Recording Started ---")
+    log.info("Press ESC key to stop recording and save 'my_macro.json'.")
+    log.info("Performing actions now...\n")
+    # Per-event [REC] lines only when TRACE logging is on (--trace or TINYTASK_TRACE=1),
+    # so by default the listener callbacks do no console work at all
+    recorder.trace = recording_tracer(log) if log.isEnabledFor(TRACE) else None
+    recorder.start(source=source, stream_path=stream_path)
 
 def stop_recording_listeners():
     """Stops listening for mouse and keyboard events."""
-    global is_recording, mouse_listener, keyboard_listener
-
-    if not is_recording:
-        print("Not currently recording.")
+    if not recorder.is_recording:
+        log.info("Not currently recording.")
         return
 
-    is_recording = False
-    print("\n--- Recording Stopped ---")
-
-    if mouse_listener and mouse_listener.is_alive():
-        mouse_listener.stop()
-        mouse_listener.join()
-        print("Mouse listener stopped.")
+    log.info("\n--- Recording Stopped ---")
+    streamed_to = recorder.events.path if isinstance(recorder.events, StreamingRecorder) else None
+    macro.set_events(recorder.stop()) # Stops and joins the listener threads; compiles the plan
+    log.info("Input listeners stopped.")
+    if recorder.simplifier is not None:
+        log.info(f"Path simplification: {recorder.simplifier.report()}")
+    if recorder.stream_error is not None:
+        log.error(f"Recording log incomplete, kept {len(recorder.events)} events: {recorder.stream_error}")
+    elif streamed_to:
+        log.info(f"Recording log finalized: '{streamed_to}'")
 
-    if keyboard_listener and keyboard_listener.is_alive():
-        keyboard_listener.stop()
-        keyboard_listener.join()
-        print("Keyboard listener stopped.")
-    
     save_recorded_events("my_macro.json")
 
 def save_recorded_events(filename="macro_events.json"):
-    """Saves the recorded events to a JSON file."""
-    if recorded_events:
+    """Saves the recorded events to a JSON file (or a binary .ttm file, by extension)."""
+    if macro:
         try:
-            with open(filename, 'w') as f:
-                json.dump(recorded_events, f, indent=4)
-            print(f"Recorded {len(recorded_events)} events. Saved to '{filename}'")
+            macro.save(filename)
+            log.info(f"Recorded {len(macro)} events. Saved to '{filename}'")
         except Exception as e:
-            print(f"Error saving events to '{filename}': {e}")
+            log.error(f"Error saving events to '{filename}': {e}")
     else:
-        print("No events to save.")
+        log.info("No events to save.")
 
 # --- NEW: Playback Functionality ---
 
 def load_recorded_events(filename="my_macro.json"):
-    """Loads recorded events from a JSON file."""
-    global recorded_events
+    """Loads recorded events from a JSON file (or a memory-mapped binary .ttm file)."""
     try:
-        with open(filename, 'r') as f:
-            loaded_events = json.load(f)
-            # Basic validation: Check if events have 'type' and 'time' keys
-            if all(isinstance(e, dict) and "type" in e and "time" in e for e in loaded_events):
-                recorded_events = loaded_events
-                print(f"Successfully loaded {len(recorded_events)} events from '{filename}'.")
-                return True
-            else:
-                print(f"Error: Invalid event format in '{filename}'.")
-                return False
-    except FileNotFoundError:
-        print(f"Error: File '{filename}' not found. Please record a macro first.")
-        return False
-    except json.JSONDecodeError:
-        print(f"Error: Invalid JSON format in '{filename}'.")
-        return False
+        # load_macro validates that every event has 'type' and 'time' keys; the plan is
+        # compiled once here, outside the timed playback loop
+        plan = macro.load(filename)
+        log.info(f"Successfully loaded {len(macro)} events from '{filename}' "
+                 f"({plan.coalesced} moves coalesced).")
+        return True
     except Exception as e:
-        print(f"An unexpected error occurred while loading '{filename}': {e}")
+        log.error(describe_load_error(filename, e))
         return False
 
+def _on_macro_loaded(loader):
+    """Called from the loader thread once a background load has finished."""
+    if loader.error is not None:
+        log.error(describe_load_error(loader.path, loader.error))
+    else:
+        log.info(f"Finished loading {len(macro)} events from '{loader.path}' "
+                 f"({macro.plan.coalesced} moves coalesced).")
+
+def load_in_background(filename="my_macro.json"):
+    """Starts loading a macro on a background thread; playback can begin before it finishes."""
+    macro.load_async(filename, on_done=_on_macro_loaded)
+
 def play_recorded_macro():
     """Plays back the currently loaded recorded events."""
-    global is_playing, recorded_events
-
-    if not recorded_events:
-        print("No events loaded to play. Load a macro first!")
+    if not macro.playable:
+        log.info("No events loaded to play. Load a macro first!")
         return
 
-    if is_playing:
-        print("Playback is already active.")
+    if player.is_playing:
+        log.info("Playback is already active.")
         return
     
-    if is_recording: # Prevent playing while recording
-        print("Cannot start playback while recording is active. Stop recording first.")
+    if recorder.is_recording: # Prevent playing while recording
+        log.info("Cannot start playback while recording is active. Stop recording first.")
         return
 
-    is_playing = True
-    print("\n--- Playback Started ---")
-    print("Press F9 to STOP playback.") # Define a hotkey to stop playback (more on this below)
-
-    # Use a separate thread for playback to keep the main script responsive
-    playback_thread = threading.Thread(target=_execute_playback)
-    playback_thread.daemon = True # Allow the main program to exit even if thread is running
-    playback_thread.start()
-
-def _execute_playback():
-    """Internal function to handle the actual event execution."""
-    global is_playing
-
-    pyautogui.FAILSAFE = False # Disable failsafe for now. Be careful!
-                               # In a real app, you might want to re-enable/manage this.
-                               # Failsafe is good for development to stop runaway macros.
-                               # pyautogui.FAILSAFE = True will stop if mouse is moved to top-left corner.
-
-    last_event_time = 0
-    try:
-        for event in recorded_events:
-            if not is_playing: # Check the flag to allow stopping playback mid-way
-                print("Playback interrupted.")
-                break
-
-            # Calculate time to wait based on relative timestamps
-            time_to_wait = event["time"] - last_event_time
-            if time_to_wait > 0:
-                time.sleep(time_to_wait)
-
-            if event["type"] == "mouse_click":
-                # pyautogui.click performs both mouseDown and mouseUp
-                # We need to simulate the individual pressed/released states for accuracy
-                button_name = event["button"].replace("Button.", "").lower()
-                if event["pressed"]:
-                    pyautogui.mouseDown(event["x"], event["y"], button=button_name)
-                    print(f"[PLAY] Mouse Down: ({event['x']}, {event['y']}) {button_name}")
-                else:
-                    pyautogui.mouseUp(event["x"], event["y"], button=button_name)
-                    print(f"[PLAY] Mouse Up: ({event['x']}, {event['y']}) {button_name}")
-
-            elif event["type"] == "mouse_move":
-                # pyautogui.moveTo can take a duration for smooth movement
-                # For recorded macros, usually instant movement is desired unless duration was recorded.
-                pyautogui.moveTo(event["x"], event["y"], _pause=False) # _pause=False prevents pyautogui's default 0.1s pause
-                # print(f"[PLAY] Mouse Move: ({event['x']}, {event['y']})")
-
-            elif event["type"] == "mouse_scroll":
-                # pyautogui.scroll takes integer steps
-                # dy is vertical scroll, dx is horizontal (less common for scroll wheel)
-                scroll_amount = int(event["dy"]) # positive for up, negative for down
-                pyautogui.scroll(scroll_amount, x=event["x"], y=event["y"])
-                print(f"[PLAY] Mouse Scroll: ({event['x']}, {event['y']}) dy={scroll_amount}")
-
-            elif event["type"] == "key_press":
-                key_to_press = event["key"]
-                # pyautogui.keyDown handles special keys (e.g., 'alt', 'shift') as strings
-                # pynput gives 'Key.ctrl_l', so convert if necessary
-                if key_to_press.startswith('Key.'):
-                    key_to_press = key_to_press.split('Key.')[1].lower()
-                pyautogui.keyDown(key_to_press, _pause=False)
-                print(f"[PLAY] Key Down: {key_to_press}")
-
-            elif event["type"] == "key_release":
-                key_to_release = event["key"]
-                if key_to_release.startswith('Key.'):
-                    key_to_release = key_to_release.split('Key.')[1].lower()
-                pyautogui.keyUp(key_to_release, _pause=False)
-                print(f"[PLAY] Key Up: {key_to_release}")
-            
-            last_event_time = event["time"]
-
-    except Exception as e:
-        print(f"An error occurred during playback: {e}")
-    finally:
-        is_playing = False
-        pyautogui.FAILSAFE = True # Re-enable failsafe after playback
-        print("\n--- Playback Finished ---")
+    log.info("\n--- Playback Started ---")
+    log.info("Press F9 to STOP playback.") # Define a hotkey to stop playback (more on this below)
+    player.trace = playback_tracer(log) if log.isEnabledFor(TRACE) else None
+    # Each event waits for its absolute deadline (playback epoch + recorded offset),
+    # so sleep overshoot and injection time don't pile up over the macro.
+    # The player runs on its own thread to keep the main script responsive.
+    player.start(macro, iterations=playback_repeat, max_seconds=playback_repeat_for, warp=playback_warp)
+
+def _on_iteration(player, index, stats):
+    if player.iterations != 1:
+        log.info(f"Iteration {index + 1} done in {stats.wall_s[-1]:.2f} s "
+                 f"(drift {stats.drift_s[-1] * 1e3:.1f} ms, {stats.actions[-1]} actions)")
+
+def _on_playback_finished(player):
+    """Called on the player thread when a run ends."""
+    stats, telemetry = player.stats, player.telemetry
+    if player.error is not None:
+        log.error(f"An error occurred during playback: {player.error}")
+    else:
+        if not stats.completed:
+            log.info("Playback interrupted.")
+        log.info(f"Speed: {player.warp.describe()}; {stats.summary()}")
+        if stats.timing.count:
+            log.info(f"Timing: {stats.timing.summary()}")
+            log.info(f"Injection timing: {telemetry.summary()}")
+        if timing_report_path and telemetry.count:
+            telemetry.export(timing_report_path)
+            log.info(f"Wrote timing for {telemetry.count} events to '{timing_report_path}'.")
+        if stats.released:
+            log.info(f"Released {stats.released} key(s)/button(s) left held by the macro.")
+    log.info("\n--- Playback Finished ---")
+
+# Failsafe disabled for now. Be careful!
+# Failsafe is good for development to stop runaway macros: with failsafe=True
+# playback stops if the mouse is moved to the top-left corner.
+# The injector (pyautogui by default, created on the first run) restores pyautogui's
+# previous settings when playback ends; pass injector=NullInjector() or a
+# RecordingInjector from tinytask/injectors.py to run without a display.
+player = Player(failsafe=False, on_iteration=_on_iteration, on_finished=_on_playback_finished)
 
 # --- Hotkey for stopping Playback (F9) ---
 # We need a separate listener specifically for the F9 key to stop playback
@@ -304,8 +178,8 @@ stop_playback_listener = None
 def setup_playback_stop_listener():
     global stop_playback_listener
     def on_f9_release(key):
-        if is_playing and key == keyboard.Key.f9:
-            print("\nF9 key released. Stopping playback...")
+        if player.is_playing and key == keyboard.Key.f9:
+            log.info("\nF9 key released. Stopping playback...")
             stop_playback()
             # return False # Don't stop this listener, it needs to stay active for future playbacks
     
@@ -314,22 +188,60 @@ def setup_playback_stop_listener():
     stop_playback_listener.join() # This will block, so we'll run it in a thread later
 
 def stop_playback():
-    """Sets the flag to stop the currently running playback."""
-    global is_playing
-    if is_playing:
-        is_playing = False
-        print("Playback stop requested.")
+    """Asks the player to stop the currently running playback."""
+    if player.stop():
+        log.info("Playback stop requested.")
     else:
-        print("No playback is currently active.")
+        log.info("No playback is currently active.")
+
+def parse_time_warp(argv):
+    """Builds the playback TimeWarp from --speed N|max, --max-gap SECONDS and --keep-key-timing."""
+    def value(flag):
+        if flag in argv and argv.index(flag) + 1 < len(argv):
+            return argv[argv.index(flag) + 1]
+        return None
+    speed = value("--speed")
+    max_gap = value("--max-gap")
+    return TimeWarp(speed=AS_FAST_AS_POSSIBLE if speed == "max" else float(speed or 1.0),
+                    max_gap=float(max_gap) if max_gap is not None else None,
+                    keep_key_timing="--keep-key-timing" in argv)
+
+def parse_repeat(argv):
+    """Reads --repeat N|forever and --repeat-for SECONDS; returns (iterations, max_seconds)."""
+    iterations, max_seconds = 1, None
+    if "--repeat" in argv and argv.index("--repeat") + 1 < len(argv):
+        value = argv[argv.index("--repeat") + 1]
+        iterations = FOREVER if value == "forever" else int(value)
+    if "--repeat-for" in argv and argv.index("--repeat-for") + 1 < len(argv):
+        max_seconds = float(argv[argv.index("--repeat-for") + 1])
+        if "--repeat" not in argv:
+            iterations = FOREVER # Loop until the time is up
+    return iterations, max_seconds
 
 # --- Main execution block ---
 if __name__ == "__main__":
+    setup_logging(trace=True if "--trace" in sys.argv else None)
+    playback_warp = parse_time_warp(sys.argv)
+    playback_repeat, playback_repeat_for = parse_repeat(sys.argv)
+    if "--timing-report" in sys.argv and sys.argv.index("--timing-report") + 1 < len(sys.argv):
+        timing_report_path = sys.argv[sys.argv.index("--timing-report") + 1]
+    if "--simplify" in sys.argv:
+        # Thin mouse paths while recording (within 2 px of the captured path)
+        recorder.simplifier = MoveSimplifier()
     print("Welcome to the Macro Recorder/Player (Step 2)")
     print("Ensure your Python environment/Terminal has Accessibility permissions.")
+    print(f"Playback speed: {playback_warp.describe()} (options: --speed N|max, --max-gap SECONDS, --keep-key-timing)")
+    print(f"Repeat: {'forever' if playback_repeat is FOREVER else playback_repeat}"
+          f"{f' for up to {playback_repeat_for:g} s' if playback_repeat_for else ''} "
+          f"(options: --repeat N|forever, --repeat-for SECONDS)")
+    if timing_report_path:
+        print(f"Per-event timing is written to '{timing_report_path}' after each run.")
     print("\nCommands:")
     print("  'rec'   - Start recording (then press ESC to stop and save 'my_macro.json')")
     print("  'play'  - Load 'my_macro.json' and start playback (then press F9 to stop playback)")
     print("  'load'  - Load 'my_macro.json' without playing")
+    print("  'srec'  - Like 'rec', but streams events to 'my_macro.ttlog' while recording")
+    print("  'recover' - Load events from 'my_macro.ttlog' (e.g. after a crash mid-recording)")
     print("  'exit'  - Exit the program")
 
     # Start the global F9 listener in a separate daemon thread
@@ -342,38 +254,40 @@ if __name__ == "__main__":
     while True:
         command = input("\nEnter command: ").lower().strip()
 
-        if command == "rec":
-            start_recording_listeners()
+        if command in ("rec", "srec"):
+            start_recording_listeners(stream_path="my_macro.ttlog" if command == "srec" else None)
             # Recording listeners will run in their own threads.
             # The main loop continues, but the `is_recording` flag
             # prevents other actions until recording is stopped.
             # We need to wait for recording to truly finish.
-            while is_recording:
+            while recorder.is_recording:
                 time.sleep(0.1) # Keep main thread alive while recording is active
             
         elif command == "play":
-            # Before playing, attempt to load the default macro file
-            if not recorded_events: # Only load if no events are currently loaded
-                load_success = load_recorded_events("my_macro.json")
-                if not load_success:
-                    continue # Skip playback if loading failed
+            # Before playing, load the default macro file if nothing is loaded yet.
+            # It loads in the background and playback starts with the first chunk.
+            if not macro.playable:
+                load_in_background("my_macro.json")
             play_recorded_macro()
             # Playback runs in its own thread, main loop continues.
-            # We don't need to wait here, as `is_playing` manages state.
+            # We don't need to wait here, as the player tracks its own state.
 
         elif command == "load":
             load_recorded_events("my_macro.json")
 
+        elif command == "recover":
+            load_recorded_events("my_macro.ttlog")
+
         elif command == "exit":
-            print("Exiting program.")
-            if is_recording:
+            log.info("Exiting program.")
+            if recorder.is_recording:
                 stop_recording_listeners()
-            if is_playing:
+            if player.is_playing:
                 stop_playback()
             # Give a moment for threads to clean up
             time.sleep(0.5) 
             break
         else:
-            print("Unknown command. Please use 'rec', 'play', 'load', or 'exit'.")
+            print("Unknown command. Please use 'rec', 'srec', 'play', 'load', 'recover', or 'exit'.")
 
 # git tst set - fcph due dec25
@@ -0,0 +1,104 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Microbenchmark: per-event dispatch overhead of the playback loop.
+
+Compares the old loop (string type checks and button/key parsing per event)
+with the code that ships: tinytask.player.play_plan over a compiled
+PlaybackPlan, with and without per-event telemetry, and a whole Player.run
+(held-input tracking, telemetry, cancellation checks). Everything injects
+into the same NullInjector and nothing waits, so only the loop's own
+overhead is measured.
+
+The old loop no longer exists in the tree; legacy_dispatch is its body from
+_execute_playback with the sleeps and prints taken out and pyautogui
+replaced by the injector.
+
+Usage: python benchmarks/bench_dispatch.py [event_count]
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore
+from tinytask.injectors import NullInjector
+from tinytask.macrostore import MacroStore
+from tinytask.player import Player, play_plan
+from tinytask.plan import compile_plan
+from tinytask.telemetry import PlaybackTelemetry
+from tinytask.timewarp import TimeWarp, AS_FAST_AS_POSSIBLE
+
+from bench_event_store import synthetic_events
+
+
+def legacy_dispatch(events, injector, is_playing):
+    """The pre-plan loop body from _execute_playback, minus the sleeps and prints."""
+    last_event_time = 0
+    for event in events:
+        if not is_playing():
+            break
+        time_to_wait = event["time"] - last_event_time
+        if time_to_wait > 0:
+            pass # time.sleep(time_to_wait)
+        if event["type"] == "mouse_click":
+            button_name = event["button"].replace("Button.", "").lower()
+            if event["pressed"]:
+                injector.mouse_down(event["x"], event["y"], button_name)
+            else:
+                injector.mouse_up(event["x"], event["y"], button_name)
+        elif event["type"] == "mouse_move":
+            injector.move(event["x"], event["y"])
+        elif event["type"] == "mouse_scroll":
+            scroll_amount = int(event["dy"])
+            injector.scroll(scroll_amount, event["x"], event["y"])
+        elif event["type"] == "key_press":
+            key_to_press = event["key"]
+            if key_to_press.startswith('Key.'):
+                key_to_press = key_to_press.split('Key.')[1].lower()
+            injector.key_down(key_to_press)
+        elif event["type"] == "key_release":
+            key_to_release = event["key"]
+            if key_to_release.startswith('Key.'):
+                key_to_release = key_to_release.split('Key.')[1].lower()
+            injector.key_up(key_to_release)
+
+
+def best_of(runs, func, *args):
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    events = list(synthetic_events(count))
+    store = EventStore.from_dicts(events)
+
+    started = time.perf_counter()
+    plan = compile_plan(store)
+    compile_s = time.perf_counter() - started
+    macro = MacroStore()
+    macro.set_events(store)
+
+    cancel = threading.Event() # What Player passes as is_cancelled
+    legacy_s = best_of(5, legacy_dispatch, events, NullInjector(), lambda: True)
+    plan_s = best_of(5, lambda: play_plan(plan, NullInjector(), is_cancelled=cancel.is_set))
+    telemetry_s = best_of(5, lambda: play_plan(plan, NullInjector(), is_cancelled=cancel.is_set,
+                                               telemetry=PlaybackTelemetry(capacity=len(plan))))
+    player = Player(NullInjector())
+    player_s = best_of(5, player.run, macro, 1, None, TimeWarp(speed=AS_FAST_AS_POSSIBLE))
+
+    # Per source event, so the plan's skipped/coalesced events don't flatter it
+    print(f"{count:,} events, {len(plan):,} plan steps (compile once: {compile_s * 1e3:.1f} ms)")
+    rows = [("legacy dict loop", legacy_s), ("play_plan", plan_s), ("play_plan + telemetry", telemetry_s),
+            ("Player.run", player_s)]
+    for label, seconds in rows:
+        print(f"{label:<22}: {seconds / count * 1e9:8.1f} ns/event  ({legacy_s / seconds:5.2f}x legacy)")
+
+
+if __name__ == "__main__":
+    main()
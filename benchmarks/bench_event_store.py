@@ -0,0 +1,85 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Memory benchmark: legacy list-of-dicts vs the columnar EventStore.
+
+Usage: python benchmarks/bench_event_store.py [event_count]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore, KEY_PRESS, KEY_RELEASE
+
+
+def synthetic_events(count, seed=1):
+    """Yields a recording that is mostly mouse moves with some clicks, scrolls and keys."""
+    rng = random.Random(seed)
+    x, y, t = 500, 500, 0.0
+    for i in range(count):
+        t += 0.004
+        roll = rng.random()
+        if roll < 0.9:
+            x += rng.randint(-3, 3)
+            y += rng.randint(-3, 3)
+            yield {"type": "mouse_move", "x": x, "y": y, "time": t}
+        elif roll < 0.94:
+            yield {"type": "mouse_click", "x": x, "y": y, "button": "Button.left",
+                   "pressed": i % 2 == 0, "time": t}
+        elif roll < 0.96:
+            yield {"type": "mouse_scroll", "x": x, "y": y, "dx": 0, "dy": -1, "time": t}
+        else:
+            yield {"type": "key_press" if i % 2 == 0 else "key_release",
+                   "key": rng.choice("abcdefgh"), "time": t}
+
+
+def measure(build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak, elapsed
+
+
+def build_dicts(count):
+    return list(synthetic_events(count))
+
+
+def build_store(count):
+    store = EventStore()
+    for event in synthetic_events(count):
+        code = event["type"]
+        if code == "mouse_move":
+            store.append_move(event["time"], event["x"], event["y"])
+        elif code == "mouse_click":
+            store.append_click(event["time"], event["x"], event["y"], event["button"], event["pressed"])
+        elif code == "mouse_scroll":
+            store.append_scroll(event["time"], event["x"], event["y"], event["dx"], event["dy"])
+        else:
+            store.append_key(KEY_PRESS if code == "key_press" else KEY_RELEASE, event["time"], event["key"])
+    return store
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Synthetic recording: {count:,} events")
+
+    dicts, dict_bytes, dict_peak, dict_time = measure(lambda: build_dicts(count))
+    del dicts
+    store, store_bytes, store_peak, store_time = measure(lambda: build_store(count))
+
+    print(f"{'layout':<14}{'retained MB':>14}{'peak MB':>10}{'bytes/event':>14}{'build s':>10}")
+    for name, retained, peak, elapsed in (("list of dicts", dict_bytes, dict_peak, dict_time),
+                                          ("EventStore", store_bytes, store_peak, store_time)):
+        print(f"{name:<14}{retained / 1e6:>14.1f}{peak / 1e6:>10.1f}{retained / count:>14.1f}{elapsed:>10.2f}")
+    print(f"EventStore column data: {store.nbytes() / count:.1f} bytes/event, "
+          f"{len(store.symbols)} interned symbols")
+    print(f"Reduction: {dict_bytes / max(store_bytes, 1):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
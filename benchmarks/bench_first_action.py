@@ -0,0 +1,68 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Time from "play this file" to the first injected action.
+
+  eager     - load_macro + compile_plan, then play (the old behaviour)
+  streaming - MacroLoader on a background thread, playback consumes its chunks
+
+Usage: python benchmarks/bench_first_action.py [sizes] [formats]
+  e.g. python benchmarks/bench_first_action.py 10000,100000,1000000 json,ttm,ttz
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore
+from tinytask.injectors import RecordingInjector
+from tinytask.macrofile import load_macro, save_macro, MacroReader
+from tinytask.packed import save_packed
+from tinytask.pipeline import MacroLoader
+from tinytask.plan import compile_plan
+from tinytask.player import play_plan, play_plans
+
+from bench_event_store import synthetic_events
+
+
+def first_action_eager(path):
+    injector = RecordingInjector()
+    started = time.perf_counter_ns()
+    events = load_macro(path)
+    play_plan(compile_plan(events), injector, is_cancelled=lambda: len(injector.times_ns) > 0)
+    if isinstance(events, MacroReader):
+        events.close()
+    return (injector.times_ns[0] - started) / 1e6
+
+
+def first_action_streaming(path):
+    injector = RecordingInjector()
+    started = time.perf_counter_ns()
+    loader = MacroLoader(path).start()
+    is_cancelled = lambda: len(injector.times_ns) > 0
+    play_plans(loader.plans(is_cancelled), injector, is_cancelled=is_cancelled)
+    first = (injector.times_ns[0] - started) / 1e6
+    loader.join() # Don't let the rest of the load overlap the next measurement
+    return first
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1].split(",")] if len(sys.argv) > 1 else [10_000, 100_000, 1_000_000]
+    formats = sys.argv[2].split(",") if len(sys.argv) > 2 else ["json", "ttm", "ttz"]
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in sizes:
+            store = EventStore.from_dicts(synthetic_events(count))
+            for fmt in formats:
+                path = os.path.join(tmp, f"macro_{count}.{fmt}")
+                if fmt == "ttz":
+                    save_packed(path, store)
+                else:
+                    save_macro(path, store)
+                eager = first_action_eager(path)
+                streaming = first_action_streaming(path)
+                print(f"{count:>9,} events  {fmt:<4}  eager {eager:9.1f} ms   streaming {streaming:7.1f} ms   "
+                      f"({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Sustained repeat-playback benchmark (headless).
+
+  sustained - thousands of iterations of a short macro through NullInjector, unpaced
+  paced     - a few iterations on the real schedule, reporting per-iteration drift
+              and per-event injection timing (see tinytask/telemetry.py)
+
+Usage: python benchmarks/bench_loop.py [iterations] [paced_iterations]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore
+from tinytask.injectors import NullInjector
+from tinytask.looping import play_loop
+from tinytask.plan import compile_plan
+from tinytask.telemetry import PlaybackTelemetry
+
+from bench_event_store import synthetic_events
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    paced = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    plan = compile_plan(EventStore.from_dicts(synthetic_events(100))) # 0.4 s macro
+    injector = NullInjector()
+    stats = play_loop(plan, injector, iterations=iterations, realtime=False)
+    print(f"sustained: {stats.summary()}; {injector.count:,} injections, "
+          f"slowest iteration {max(stats.wall_s) * 1e6:.0f} us")
+
+    telemetry = PlaybackTelemetry(capacity=len(plan) * paced)
+    stats = play_loop(plan, NullInjector(), iterations=paced, telemetry=telemetry)
+    drifts = ", ".join(f"{d * 1e3:.2f}" for d in stats.drift_s)
+    print(f"paced: {stats.summary()}; drift per iteration (ms): {drifts}; {stats.timing.summary()}")
+    print(f"injection: {telemetry.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Headless playback benchmark.
+
+  throughput - plays a synthetic macro through NullInjector with no waiting
+  coalesced  - the same macro with moves merged per 120 Hz frame (coalesce_moves)
+  accuracy   - plays a short macro on its real schedule through
+               RecordingInjector and compares injection times to the deadlines
+
+Usage: python benchmarks/bench_playback.py [event_count] [accuracy_seconds]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore
+from tinytask.injectors import NullInjector, RecordingInjector
+from tinytask.plan import coalesce_moves, compile_plan
+from tinytask.player import play_plan
+from tinytask.scheduler import DeadlineScheduler
+
+from bench_event_store import synthetic_events
+
+
+def throughput(plan):
+    injector = NullInjector()
+    started = time.perf_counter()
+    play_plan(plan, injector)
+    elapsed = time.perf_counter() - started
+    return injector.count, elapsed
+
+
+def accuracy(plan):
+    injector = RecordingInjector()
+    scheduler = DeadlineScheduler()
+    play_plan(plan, injector, scheduler)
+    lateness = sorted((t_ns - scheduler.epoch_ns) / 1e9 - deadline
+                      for (t_ns, _, _, _, _), deadline in zip(injector.actions(), plan.times))
+    return lateness, scheduler
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+
+    plan = compile_plan(EventStore.from_dicts(synthetic_events(count)))
+    injected, elapsed = throughput(plan)
+    print(f"throughput: {injected:,} actions in {elapsed:.3f} s "
+          f"({injected / elapsed:,.0f} actions/s, {elapsed / injected * 1e9:.0f} ns/action)")
+
+    coalesced = coalesce_moves(plan, 1 / 120)
+    injected_c, elapsed_c = throughput(coalesced)
+    print(f"coalesced (8.3 ms quantum): {injected_c:,} actions in {elapsed_c:.3f} s, "
+          f"{coalesced.coalesced:,} injections saved ({coalesced.coalesced / len(plan):.0%})")
+
+    # synthetic_events() spaces events 4 ms apart
+    short_plan = compile_plan(EventStore.from_dicts(synthetic_events(int(seconds / 0.004))))
+    lateness, scheduler = accuracy(short_plan)
+    n = len(lateness)
+    print(f"accuracy over {seconds:.1f} s ({n} actions): "
+          f"p50 {lateness[n // 2] * 1e6:.0f} us, p99 {lateness[int(n * 0.99)] * 1e6:.0f} us, "
+          f"max {lateness[-1] * 1e6:.0f} us, end drift {(scheduler.elapsed_s() - short_plan.duration) * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
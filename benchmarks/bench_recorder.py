@@ -0,0 +1,58 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Recorder stress test driven by a SyntheticSource (no display needed).
+
+  flood    - pushes synthetic input through Recorder callbacks as fast as possible
+  realtime - replays a 1000 Hz mouse on its real schedule and checks the recorder keeps up
+
+Usage: python benchmarks/bench_recorder.py [flood_events] [realtime_seconds]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.recorder import Recorder
+from tinytask.simplify import MoveSimplifier
+from tinytask.sources import SyntheticSource, mouse_sweep
+
+from bench_event_store import synthetic_events
+
+
+def record(events, realtime, simplifier=None):
+    recorder = Recorder(simplifier=simplifier)
+    source = SyntheticSource(events, realtime=realtime)
+    tracemalloc.start()
+    started = time.perf_counter()
+    recorder.start(source=source)
+    source.join()
+    elapsed = time.perf_counter() - started
+    recorded = recorder.stop()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return source.delivered, recorded, elapsed, current, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+
+    delivered, recorded, elapsed, current, peak = record(list(synthetic_events(count)), realtime=False)
+    print(f"flood: {delivered:,} callbacks in {elapsed:.2f} s ({delivered / elapsed:,.0f}/s, "
+          f"{elapsed / delivered * 1e6:.2f} us/callback), kept {len(recorded):,} events, "
+          f"{current / len(recorded):.1f} bytes/event retained")
+
+    delivered, recorded, elapsed, current, peak = record(mouse_sweep(hz=1000, seconds=seconds), realtime=True)
+    print(f"1000 Hz realtime: {delivered:,} moves over {elapsed:.2f} s "
+          f"(lag {max(0.0, elapsed - seconds) * 1e3:.1f} ms), kept {len(recorded):,} after jitter filter, "
+          f"peak {peak / 1e6:.2f} MB")
+
+    simplifier = MoveSimplifier()
+    delivered, recorded, elapsed, current, peak = record(mouse_sweep(hz=1000, seconds=seconds), True, simplifier)
+    print(f"1000 Hz realtime, simplified: kept {len(recorded):,} moves (lag {max(0.0, elapsed - seconds) * 1e3:.1f} ms); "
+          f"{simplifier.report()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Cold-start time of the GUI entry point, measured with `python -X importtime`.
+
+Each run starts a fresh interpreter that runs tinytask_gui.py as __main__
+(exactly like `python tinytask_gui.py`) with Tk patched to report two
+moments back to this process:
+
+  ready   - create_gui() is about to create the window: everything imported,
+            logging set up, interrupted installs checked
+  window  - the first frame has been drawn (the window is then closed
+            instead of entering mainloop)
+
+Both are measured from process launch. The -X importtime log of the last
+run gives the slowest imports. Without a display (or Tk) only `ready` is
+reported.
+
+Usage:
+  python benchmarks/bench_startup.py [--runs N] [--top N] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUI = os.path.join(ROOT, "tinytask_gui.py")
+
+# Runs in the child: report when Tk is about to be created and when the first
+# frame is drawn, then close the window instead of entering the main loop
+_HARNESS = """
+import runpy, sys, tkinter
+_init = tkinter.Tk.__init__
+def _report(marker):
+    sys.stdout.write(marker + "\\n")
+    sys.stdout.flush()
+def _init_and_report(self, *args, **kwargs):
+    _report("ready")
+    try:
+        _init(self, *args, **kwargs)
+    except tkinter.TclError:
+        _report("no-display")
+        raise SystemExit(0)
+def _draw_and_close(self, n=0):
+    self.update()
+    _report("window")
+    self.destroy()
+tkinter.Tk.__init__ = _init_and_report
+tkinter.Tk.mainloop = _draw_and_close
+sys.argv = [%r]
+runpy.run_path(%r, run_name="__main__")
+""" % (GUI, GUI)
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def start_once():
+    """One cold start; returns ({marker: ms since launch}, -X importtime log)."""
+    with tempfile.TemporaryFile("w+") as log:
+        started = time.perf_counter()
+        child = subprocess.Popen([sys.executable, "-X", "importtime", "-c", _HARNESS], cwd=ROOT,
+                                 stdout=subprocess.PIPE, stderr=log, text=True)
+        marks = {}
+        for line in child.stdout:
+            marks[line.strip()] = (time.perf_counter() - started) * 1e3
+        child.wait()
+        log.seek(0)
+        return marks, log.read()
+
+
+def parse_importtime(text):
+    """-X importtime stderr -> [(module, self us, cumulative us, depth)] in import order."""
+    rows = []
+    for line in text.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2))
+    return rows
+
+
+def measure_startup(runs=5, top=10):
+    start_once() # Warm the bytecode and OS file caches
+    marks = [start_once() for _ in range(runs)]
+    rows = parse_importtime(marks[-1][1])
+    # "site" is interpreter startup (site-packages .pth files), not something the app imports
+    app = [row for row in rows if row[3] == 0 and row[0] != "site"]
+    result = {
+        "runs": runs,
+        "display": all("window" in m for m, _ in marks),
+        "imports_ms": sum(row[2] for row in app) / 1e3,
+        "site_ms": sum(row[2] for row in rows if row[0] == "site") / 1e3,
+        "slowest_imports": [{"module": name, "self_ms": own / 1e3, "cumulative_ms": total / 1e3}
+                            for name, own, total, _ in sorted(app, key=lambda row: -row[2])[:top]],
+    }
+    for marker in ("ready", "window"):
+        times = [m[marker] for m, _ in marks if marker in m]
+        if times:
+            result[f"{marker}_ms"] = statistics.median(times)
+            result[f"{marker}_min_ms"] = min(times)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure GUI cold start (time-to-window).")
+    parser.add_argument("--runs", type=int, default=5, help="cold starts to take the median of")
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    parser.add_argument("--output", help="also write the results as JSON here")
+    args = parser.parse_args()
+
+    result = measure_startup(args.runs, args.top)
+    print(f"ready:   {result['ready_ms']:7.1f} ms median ({result['ready_min_ms']:.1f} min) "
+          f"over {args.runs} runs, after {result['site_ms']:.1f} ms of interpreter site setup")
+    if result["display"]:
+        print(f"window:  {result['window_ms']:7.1f} ms median ({result['window_min_ms']:.1f} min)")
+    else:
+        print("window:  not measured (no display)")
+    print(f"imports: {result['imports_ms']:7.1f} ms; slowest top-level imports (cumulative / self ms):")
+    for entry in result["slowest_imports"]:
+        print(f"  {entry['module']:<28} {entry['cumulative_ms']:7.2f} / {entry['self_ms']:.2f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Checks the playback speed modes headlessly against the recorded schedule.
+
+Each mode plays the same macro (synthetic input plus two long idle pauses)
+through RecordingInjector and reports wall time and speed-up. It also
+checks that the injected actions match the original plan in the same order,
+and how late each one was against its warped deadline.
+
+Usage: python benchmarks/bench_timewarp.py [recorded_seconds]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore
+from tinytask.injectors import RecordingInjector
+from tinytask.plan import compile_plan, OP_KEY_DOWN, OP_KEY_UP
+from tinytask.player import play_plan
+from tinytask.scheduler import DeadlineScheduler
+from tinytask.timewarp import TimeWarp, AS_FAST_AS_POSSIBLE
+
+from bench_event_store import synthetic_events
+
+MODES = [
+    ("1x", TimeWarp()),
+    ("2x", TimeWarp(speed=2.0)),
+    ("10x", TimeWarp(speed=10.0)),
+    ("max", TimeWarp(speed=AS_FAST_AS_POSSIBLE)),
+    ("1x, pauses capped at 0.1 s", TimeWarp(max_gap=0.1)),
+    ("10x, typing at recorded speed", TimeWarp(speed=10.0, keep_key_timing=True)),
+]
+
+
+def paused_macro(seconds):
+    """Synthetic events (4 ms apart) with a 1 s idle pause after each third."""
+    events = list(synthetic_events(int(seconds / 0.004)))
+    for index, event in enumerate(events):
+        event["time"] += 1.0 * (index * 3 // len(events))
+    return EventStore.from_dicts(events)
+
+
+def key_gaps(times, ops):
+    previous = 0.0
+    for t, op in zip(times, ops):
+        if op == OP_KEY_DOWN or op == OP_KEY_UP:
+            yield t - previous
+        previous = t
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    plan = compile_plan(paused_macro(seconds))
+    print(f"macro: {len(plan):,} actions over {plan.duration:.2f} s recorded")
+
+    for label, warp in MODES:
+        warped = warp.apply(plan)
+        injector = RecordingInjector()
+        scheduler = None if warp.as_fast_as_possible else DeadlineScheduler()
+        started = time.perf_counter()
+        play_plan(warped, injector, scheduler)
+        elapsed = time.perf_counter() - started
+
+        same_actions = (list(injector.ops) == list(plan.ops) and list(injector.xs) == list(plan.xs)
+                        and list(injector.ys) == list(plan.ys))
+        line = f"{label:<32} {warp.summary(elapsed)}, same actions: {same_actions}"
+        if scheduler is not None:
+            lateness = sorted((t_ns - scheduler.epoch_ns) / 1e9 - deadline
+                              for t_ns, deadline in zip(injector.times_ns, warped.times))
+            line += f", p99 lateness {lateness[int(len(lateness) * 0.99)] * 1e3:.2f} ms"
+        if warp.keep_key_timing:
+            kept = all(abs(a - b) < 1e-9 for a, b in zip(key_gaps(warped.times, warped.ops), key_gaps(plan.times, plan.ops)))
+            line += f", key spacing kept: {kept}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Updater checks against the local fake releases server (no network needed).
+
+  check     - release lookups: cold, from the TTL cache, revalidated (304), and via UpdateChecker
+  fresh     - first download of a release (parallel segments for large archives)
+  cached    - the same release again: served from the content-addressed cache
+  resume    - a download cut off half-way, then resumed with a Range request
+  no-ranges - a server that ignores Range: the retry starts over
+  corrupt   - an archive that doesn't match its digest is rejected
+  install   - differential install of this repo's files with one file changed,
+              against the old extract-everything-and-copy approach
+
+Usage: python benchmarks/bench_updater.py [archive_mb]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.installer import plan_update, apply_update, rollback_update
+from tinytask.updater import Updater, UpdateChecker, UpdateError, file_sha256
+
+from fake_release_server import FakeReleaseServer, make_archive
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def repo_files():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    names = subprocess.run(["git", "ls-files"], cwd=root, capture_output=True, text=True).stdout.split()
+    return {name: open(os.path.join(root, name), "rb").read() for name in names}
+
+
+def full_copy(zip_path, target_dir):
+    """The old installer: extract everything, rmtree each directory, copy2 each file."""
+    extract_dir = os.path.join(target_dir, "temp_update_extract")
+    with zipfile.ZipFile(zip_path) as archive:
+        top_level = archive.namelist()[0].split("/")[0]
+        archive.extractall(extract_dir)
+    source = os.path.join(extract_dir, top_level)
+    for item in os.listdir(source):
+        s, d = os.path.join(source, item), os.path.join(target_dir, item)
+        if os.path.isdir(s):
+            shutil.rmtree(d, ignore_errors=True)
+            shutil.copytree(s, d)
+        else:
+            shutil.copy2(s, d)
+    shutil.rmtree(extract_dir)
+
+
+def install(tmp):
+    files = repo_files()
+    changed = dict(files)
+    changed["Playback.py"] = files["Playback.py"] + b"\n# changed\n"
+    zip_path = os.path.join(tmp, "update.zip")
+    with open(zip_path, "wb") as f:
+        f.write(make_archive(changed))
+    for label in ("full copy", "differential"):
+        target = os.path.join(tmp, label.replace(" ", "_"))
+        for name, data in files.items():
+            os.makedirs(os.path.dirname(os.path.join(target, name)), exist_ok=True)
+            with open(os.path.join(target, name), "wb") as f:
+                f.write(data)
+        started = time.perf_counter()
+        if label == "full copy":
+            full_copy(zip_path, target)
+            print(f"install, {label + ':':<14} {(time.perf_counter() - started) * 1e3:7.1f} ms, "
+                  f"{len(files)} files rewritten")
+        else:
+            plan = plan_update(zip_path, target)
+            apply_update(plan)
+            elapsed = time.perf_counter() - started
+            print(f"install, {label + ':':<14} {elapsed * 1e3:7.1f} ms, {plan.describe()}, "
+                  f"rollback restores {rollback_update(target)} file(s)")
+
+
+def check(server, cache_dir):
+    updater = Updater(server.api_url, cache_dir=cache_dir)
+    for label, ttl in (("cold", 3600), ("cached", 3600), ("expired", 0)):
+        server.requests.clear()
+        release, elapsed = timed(updater.latest_release, ttl)
+        statuses = len(server.requests)
+        print(f"check, {label + ':':<9} {elapsed * 1e3:6.2f} ms, {updater.last_check}, "
+              f"{statuses} request(s), {release.tag}")
+    results = []
+    checker = UpdateChecker(updater, lambda release, error, manual: results.append((release, error, manual)),
+                            interval=0.05).start()
+    started = time.perf_counter()
+    checker.check_now()
+    returned = time.perf_counter() - started
+    time.sleep(0.3)
+    checker.stop()
+    print(f"check, background: check_now() returned in {returned * 1e6:.0f} us; {len(results)} checks "
+          f"({sum(1 for _, _, manual in results if not manual)} scheduled), errors: "
+          f"{[error for _, error, _ in results if error]}")
+    updater.close()
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 16
+    # Incompressible payload, so the archive really is size_mb
+    archive = make_archive({"payload.bin": os.urandom(int(size_mb * (1 << 20))), "README.md": b"fake\n"})
+    server = FakeReleaseServer(archive).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            check(server, cache_dir)
+            updater = Updater(server.api_url, cache_dir=cache_dir)
+            release = updater.latest_release()
+            print(f"release {release.tag}: {len(archive) / 1e6:.1f} MB, sha256 {release.sha256[:12]}...")
+
+            path, elapsed = timed(updater.download, release)
+            ranged = sum(1 for method, _, ranges in server.requests if method == "GET" and ranges)
+            print(f"fresh:     {elapsed * 1e3:7.1f} ms ({len(archive) / elapsed / 1e6:,.0f} MB/s, "
+                  f"{ranged} ranged GETs), verified: {file_sha256(path) == release.sha256}")
+
+            server.requests.clear()
+            _, elapsed = timed(updater.download, release)
+            print(f"cached:    {elapsed * 1e3:7.1f} ms, download requests: "
+                  f"{sum(1 for method, _, _ in server.requests if method == 'GET')}")
+
+            for label, ranges in (("resume", True), ("no-ranges", False)):
+                os.remove(path)
+                server.ranges, server.fail_after = ranges, len(archive) // 2
+                single = Updater(server.api_url, cache_dir=cache_dir, workers=1)
+                try:
+                    single.download(release)
+                    print(f"{label}: first attempt unexpectedly succeeded")
+                except Exception as e:
+                    first_error = type(e).__name__
+                server.requests.clear()
+                path, elapsed = timed(single.download, release)
+                resumed_from = [r for method, _, r in server.requests if method == "GET"]
+                print(f"{label + ':':<10} {elapsed * 1e3:7.1f} ms after {first_error}, "
+                      f"retry Range {resumed_from[0]!r}, verified: {file_sha256(path) == release.sha256}")
+                single.close()
+            server.ranges = True
+
+            os.remove(path)
+            server.corrupt = True
+            try:
+                updater.download(release)
+                print("corrupt:   NOT rejected")
+            except UpdateError as e:
+                print(f"corrupt:   rejected ({str(e)[:60]}...), blobs left: {os.listdir(os.path.join(cache_dir, 'blobs'))}")
+            updater.close()
+
+            install(cache_dir)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Local stand-in for the GitHub releases API and download host.
+
+Serves one fake release so the updater can be exercised without network
+access:
+
+  GET  /repos/<owner>/<repo>/releases/latest   release JSON (with a .zip asset and its digest),
+                                               an ETag, and 304 for a matching If-None-Match
+  GET  /download/<tag>.zip                     the archive, with Range and If-Range support
+  HEAD /download/<tag>.zip                     Content-Length, Accept-Ranges and the ETag
+
+Knobs on the server object make it misbehave on purpose: fail_after cuts the
+next download off after that many bytes, ranges=False ignores Range headers,
+and corrupt=True serves different bytes than the published digest.
+
+Usage: python benchmarks/fake_release_server.py [port]
+  then run the GUI with TINYTASK_RELEASES_URL=http://127.0.0.1:<port>/repos/EXBStudios/TinyTaskForMac/releases/latest
+"""
+import hashlib
+import io
+import json
+import re
+import sys
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_RANGE = re.compile(r"bytes=(\d+)-(\d*)")
+
+
+def make_archive(files, top_level="TinyTaskForMac-fake"):
+    """Builds a GitHub-style zipball (everything under one top-level directory) in memory."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files.items():
+            archive.writestr(f"{top_level}/{name}", data)
+    return buffer.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, so connection pooling is exercised
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.command, self.path, self.headers.get("Range")))
+        if self.path.endswith("/releases/latest"):
+            body = json.dumps(server.release_json()).encode("utf-8")
+            etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", [("ETag", etag)])
+            else:
+                self._send(200, body, [("Content-Type", "application/json"), ("ETag", etag)])
+        elif self.path == f"/download/{server.tag}.zip":
+            self._send_archive(server)
+        else:
+            self._send(404, b"not found")
+
+    def _send_archive(self, server):
+        data = server.served_bytes()
+        etag = f'"{hashlib.sha256(data).hexdigest()[:16]}"'
+        start, end = 0, len(data) - 1
+        status = 200
+        match = _RANGE.match(self.headers.get("Range") or "")
+        if_range = self.headers.get("If-Range")
+        # A Range whose If-Range doesn't match the current archive gets the whole archive
+        if match and server.ranges and (if_range is None or if_range == etag):
+            start = int(match.group(1))
+            end = min(int(match.group(2)), end) if match.group(2) else end
+            if start > end:
+                self._send(416, b"", [("Content-Range", f"bytes */{len(data)}")])
+                return
+            status = 206
+        body = data[start:end + 1]
+        self.send_response(status)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        if server.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        limit = server.take_fail_after()
+        if limit is not None and limit < len(body):
+            self.wfile.write(body[:limit])
+            self.wfile.flush()
+            self.close_connection = True
+            self.connection.shutdown(2) # Drop the connection mid-body
+            return
+        self.wfile.write(body)
+
+
+class FakeReleaseServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, archive, tag="v9.9.9", port=0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.archive = archive
+        self.tag = tag
+        self.ranges = True
+        self.corrupt = False
+        self.fail_after = None
+        self.requests = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    @property
+    def api_url(self):
+        return f"{self.base_url}/repos/EXBStudios/TinyTaskForMac/releases/latest"
+
+    def release_json(self):
+        return {
+            "tag_name": self.tag,
+            "zipball_url": f"{self.base_url}/download/{self.tag}.zip",
+            "body": "Fake release for updater checks.",
+            "assets": [{
+                "name": f"TinyTaskForMac-{self.tag}.zip",
+                "browser_download_url": f"{self.base_url}/download/{self.tag}.zip",
+                "size": len(self.archive),
+                "digest": "sha256:" + hashlib.sha256(self.archive).hexdigest(),
+            }],
+        }
+
+    def served_bytes(self):
+        if self.corrupt:
+            return self.archive[:-1] + bytes([self.archive[-1] ^ 0xFF])
+        return self.archive
+
+    def take_fail_after(self):
+        with self._lock:
+            limit, self.fail_after = self.fail_after, None
+            return limit
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    archive = make_archive({"README.md": b"Fake TinyTask release\n"})
+    server = FakeReleaseServer(archive, port=port)
+    print(f"Serving a fake release at {server.api_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
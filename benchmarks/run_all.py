@@ -0,0 +1,218 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Headless benchmark suite with machine-readable results.
+
+Runs the recorder, storage, playback and memory hot paths on synthetic input
+and writes one JSON document, so runs can be compared over time:
+
+  recorder - Recorder callback throughput (on_mouse_move/on_key_press/... fed by a SyntheticSource)
+  storage  - save time, load time and file size per macro format
+  playback - dispatch cost of the playback loop into a NullInjector: play_plan, play_loop, and a
+             Player run (what Playback.py and the GUI use)
+  memory   - retained bytes per event for the legacy dicts and the EventStore
+  startup  - GUI cold start: time until the window is created/drawn, and time spent importing
+
+Usage:
+  python benchmarks/run_all.py [--events N] [--output results.json] [--compare baseline.json]
+                               [--only recorder,storage,...]
+
+The individual bench_*.py scripts cover each area in more depth.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore
+from tinytask.injectors import NullInjector
+from tinytask.looping import play_loop
+from tinytask.macrostore import MacroStore
+from tinytask.macrofile import load_macro, save_macro, MacroReader
+from tinytask.packed import save_packed
+from tinytask.plan import compile_plan
+from tinytask.player import Player, play_plan
+from tinytask.timewarp import TimeWarp, AS_FAST_AS_POSSIBLE
+
+from bench_event_store import synthetic_events, measure, build_dicts, build_store
+from bench_recorder import record
+from bench_startup import measure_startup
+
+FORMATS = ("json", "ttm", "ttz", "ttz-lzma")
+RUNS = 3 # Timings are the best of this many runs
+
+
+def best_of(func, *args):
+    best = float("inf")
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+# --- Sections (each returns a dict of metrics, nested per format for storage) ---
+
+def bench_recorder(count):
+    delivered, recorded, elapsed, current, peak = record(list(synthetic_events(count)), realtime=False)
+    return {
+        "callbacks": delivered,
+        "callbacks_per_s": delivered / elapsed,
+        "us_per_callback": elapsed / delivered * 1e6,
+        "events_kept": len(recorded),
+        "peak_bytes": peak,
+    }
+
+
+def _save(path, fmt, store):
+    if fmt == "ttz-lzma":
+        save_packed(path, store, codec="lzma")
+    else:
+        save_macro(path, store)
+
+
+def _load(path):
+    # Compile as well: .ttm loads are lazy memory maps, so this is the real cost of getting ready to play
+    events = load_macro(path)
+    compile_plan(events)
+    if isinstance(events, MacroReader):
+        events.close()
+
+
+def bench_storage(count):
+    store = EventStore.from_dicts(synthetic_events(count))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in FORMATS:
+            path = os.path.join(tmp, f"macro.{fmt.split('-')[0]}")
+            save_s = best_of(_save, path, fmt, store)
+            size = os.path.getsize(path)
+            load_s = best_of(_load, path)
+            results[fmt] = {"save_s": save_s, "load_s": load_s, "bytes": size, "bytes_per_event": size / count}
+    return results
+
+
+def bench_playback(count):
+    store = EventStore.from_dicts(synthetic_events(count))
+    started = time.perf_counter()
+    plan = compile_plan(store)
+    compile_s = time.perf_counter() - started
+    play_s = best_of(play_plan, plan, NullInjector())
+    loop_s = best_of(lambda: play_loop(plan, NullInjector(), realtime=False))
+    macro = MacroStore()
+    macro.set_events(store)
+    player = Player(NullInjector())
+    player_s = best_of(player.run, macro, 1, None, TimeWarp(speed=AS_FAST_AS_POSSIBLE))
+    return {
+        "compile_ns_per_event": compile_s / count * 1e9,
+        "play_plan_ns_per_event": play_s / len(plan) * 1e9,
+        "play_loop_ns_per_event": loop_s / len(plan) * 1e9,
+        "player_ns_per_event": player_s / len(plan) * 1e9,
+        "actions_per_s": len(plan) / loop_s,
+    }
+
+
+def bench_memory(count):
+    _, dict_bytes, _, _ = measure(lambda: build_dicts(count))
+    store, store_bytes, store_peak, _ = measure(lambda: build_store(count))
+    return {
+        "dicts_bytes_per_event": dict_bytes / count,
+        "store_bytes_per_event": store_bytes / count,
+        "store_column_bytes_per_event": store.nbytes() / count,
+        "store_peak_bytes": store_peak,
+    }
+
+
+def bench_startup(count):
+    result = measure_startup(runs=RUNS, top=0)
+    return {name: value for name, value in result.items() if isinstance(value, float)}
+
+
+SECTIONS = {
+    "recorder": bench_recorder,
+    "storage": bench_storage,
+    "playback": bench_playback,
+    "memory": bench_memory,
+    "startup": bench_startup,
+}
+
+
+# --- Reporting ---
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def flatten(results, prefix=""):
+    """{"a": {"b": 1}} -> {"a.b": 1}, for printing and comparing."""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def print_results(results, baseline=None, stream=sys.stdout):
+    current = flatten(results["results"])
+    previous = flatten(baseline["results"]) if baseline else {}
+    for name, value in current.items():
+        line = f"{name:<44} {value:>16,.3f}" if isinstance(value, float) else f"{name:<44} {value:>16,}"
+        if previous.get(name):
+            line += f"   {value / previous[name]:6.2f}x baseline"
+        print(line, file=stream)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the TinyTask benchmark suite.")
+    parser.add_argument("--events", type=int, default=100_000, help="synthetic events per benchmark")
+    parser.add_argument("--output", help="write the JSON results here (default: stdout)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--only", help="comma-separated sections: " + ",".join(SECTIONS))
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(SECTIONS)
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "events": args.events,
+            "runs": RUNS,
+        },
+        "results": {},
+    }
+    for name in names:
+        started = time.perf_counter()
+        results["results"][name] = SECTIONS[name](args.events)
+        print(f"{name}: done in {time.perf_counter() - started:.1f} s", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.output or args.compare:
+        baseline = None
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        # Keep stdout pure JSON when that's where the results went
+        print_results(results, baseline, sys.stdout if args.output else sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
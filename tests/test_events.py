@@ -0,0 +1,74 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""EventStore: the legacy dict form round-trips through the columns.
+
+Run with: python -m unittest discover -s tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore, KEY_PRESS, MOUSE_MOVE, merge_stores
+
+EVENTS = [
+    {"type": "mouse_move", "x": 10, "y": 20, "time": 0.0},
+    {"type": "mouse_click", "x": 10, "y": 20, "button": "Button.left", "pressed": True, "time": 0.1},
+    {"type": "mouse_click", "x": 10, "y": 20, "button": "Button.left", "pressed": False, "time": 0.2},
+    {"type": "mouse_scroll", "x": 5, "y": 6, "dx": 0, "dy": -3, "time": 0.3},
+    {"type": "key_press", "key": "Key.shift", "time": 0.4},
+    {"type": "key_press", "key": "a", "time": 0.5},
+    {"type": "key_release", "key": "a", "time": 0.6},
+    {"type": "key_release", "key": None, "time": 0.7}, # Keys pynput can't name are stored as None
+]
+
+
+class EventStoreTests(unittest.TestCase):
+    def test_dicts_round_trip(self):
+        store = EventStore.from_dicts(EVENTS)
+        self.assertEqual(len(store), len(EVENTS))
+        self.assertEqual(store.to_dicts(), EVENTS)
+        self.assertEqual(store[3], EVENTS[3])
+        self.assertEqual(store[1:3].to_dicts(), EVENTS[1:3])
+
+    def test_symbols_are_interned_once(self):
+        store = EventStore.from_dicts(EVENTS)
+        self.assertEqual(store.symbols.symbols, ["Button.left", "Key.shift", "a", None])
+        self.assertEqual(store.row(5), (KEY_PRESS, 0.5, 0, 0, 2, 0))
+
+    def test_rows_slice(self):
+        store = EventStore.from_dicts(EVENTS)
+        self.assertEqual(list(store.rows(1, 3)), [store.row(1), store.row(2)])
+        self.assertEqual(len(list(store.rows())), len(EVENTS))
+
+    def test_append_store_remaps_symbols(self):
+        first = EventStore.from_dicts(EVENTS[5:])
+        second = EventStore.from_dicts(EVENTS[:5])
+        first.append_store(second)
+        self.assertEqual(first.to_dicts(), EVENTS[5:] + EVENTS[:5])
+
+    def test_merge_interleaves_by_time(self):
+        keys = EventStore.from_dicts([event for event in EVENTS if event["type"].startswith("key")])
+        mouse = EventStore.from_dicts([event for event in EVENTS if event["type"].startswith("mouse")])
+        self.assertEqual(merge_stores(keys, mouse).to_dicts(), EVENTS)
+
+    def test_last_move_within(self):
+        store = EventStore()
+        self.assertFalse(store.last_move_within(0, 0, 5))
+        store.append_move(0.0, 100, 100)
+        self.assertTrue(store.last_move_within(103, 98, 5))
+        self.assertFalse(store.last_move_within(110, 100, 5))
+        store.append_key(KEY_PRESS, 0.1, "a")
+        self.assertFalse(store.last_move_within(100, 100, 5))
+
+    def test_clear_and_bool(self):
+        store = EventStore.from_dicts(EVENTS)
+        self.assertTrue(store)
+        store.clear()
+        self.assertFalse(store)
+        store.append_move(1.0, 1.5, 2.9) # Coordinates are stored as ints
+        self.assertEqual(store.row(0), (MOUSE_MOVE, 1.0, 1, 2, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
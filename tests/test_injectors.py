@@ -0,0 +1,93 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""play_plan drives an injector with every action of a plan, and stops when cancelled.
+
+Run with: python -m unittest discover -s tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore
+from tinytask.injectors import Injector, NullInjector, RecordingInjector
+from tinytask.plan import OP_MOVE, OP_MOUSE_DOWN, OP_MOUSE_UP, OP_SCROLL, OP_KEY_DOWN, OP_KEY_UP, compile_plan
+from tinytask.player import play_plan, play_plans
+
+EVENTS = [
+    {"type": "mouse_move", "x": 10, "y": 20, "time": 0.0},
+    {"type": "mouse_click", "x": 10, "y": 20, "button": "Button.left", "pressed": True, "time": 0.1},
+    {"type": "mouse_click", "x": 10, "y": 20, "button": "Button.left", "pressed": False, "time": 0.2},
+    {"type": "mouse_scroll", "x": 5, "y": 6, "dx": 0, "dy": -3, "time": 0.3},
+    {"type": "key_press", "key": "Key.enter", "time": 0.4},
+    {"type": "key_release", "key": "Key.enter", "time": 0.5},
+]
+ACTIONS = [
+    (OP_MOVE, 10, 20, None),
+    (OP_MOUSE_DOWN, 10, 20, "left"),
+    (OP_MOUSE_UP, 10, 20, "left"),
+    (OP_SCROLL, 5, 6, -3),
+    (OP_KEY_DOWN, 0, 0, "enter"),
+    (OP_KEY_UP, 0, 0, "enter"),
+]
+
+
+class BracketingInjector(RecordingInjector):
+    """Also records begin()/end() calls."""
+
+    def __init__(self):
+        RecordingInjector.__init__(self)
+        self.calls = []
+
+    def begin(self):
+        self.calls.append("begin")
+
+    def end(self):
+        self.calls.append("end")
+
+
+class PlayPlanTests(unittest.TestCase):
+    def setUp(self):
+        self.plan = compile_plan(EventStore.from_dicts(EVENTS))
+
+    def test_every_action_is_injected(self):
+        injector = BracketingInjector()
+        self.assertTrue(play_plan(self.plan, injector))
+        self.assertEqual([action[1:] for action in injector.actions()], ACTIONS)
+        self.assertEqual(injector.calls, ["begin", "end"])
+
+    def test_trace_sees_non_moves(self):
+        traced = []
+        play_plan(self.plan, NullInjector(), trace=lambda op, x, y, arg: traced.append((op, x, y, arg)))
+        self.assertEqual(traced, [action for action in ACTIONS if action[0] != OP_MOVE])
+
+    def test_cancel_stops_and_still_ends(self):
+        injector = BracketingInjector()
+        self.assertFalse(play_plan(self.plan, injector, is_cancelled=lambda: len(injector) >= 2))
+        self.assertEqual(len(injector), 2)
+        self.assertEqual(injector.calls, ["begin", "end"])
+
+    def test_failing_injector_still_ends(self):
+        class Failing(BracketingInjector):
+            def scroll(self, amount, x, y):
+                raise RuntimeError("no display")
+
+        injector = Failing()
+        with self.assertRaises(RuntimeError):
+            play_plan(self.plan, injector)
+        self.assertEqual(injector.calls, ["begin", "end"])
+
+    def test_chunks_play_on_one_timeline(self):
+        first = compile_plan(EventStore.from_dicts(EVENTS[:3]))
+        second = compile_plan(EventStore.from_dicts(EVENTS[3:]))
+        injector = RecordingInjector()
+        self.assertTrue(play_plans(iter((first, second)), injector))
+        self.assertEqual([action[1:] for action in injector.actions()], ACTIONS)
+
+    def test_base_injector_is_abstract(self):
+        with self.assertRaises(NotImplementedError):
+            play_plan(self.plan, Injector())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Installer tests: journalled swaps, removals, rollback and crash recovery on a scratch install.
+
+Run with: python -m unittest discover -s tests
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from tinytask import installer
+from tinytask.installer import (plan_update, apply_update, rollback_update, recover_interrupted_install,
+                                JOURNAL, BACKUP_DIR, INSTALLED)
+from tinytask.updater import UpdateError
+
+from fake_release_server import make_archive
+
+
+class InstallerTests(unittest.TestCase):
+    OLD = {"Playback.py": b"old playback\n", "tinytask/player.py": b"old player\n", "README.md": b"same\n",
+           "my_macro.json": b"[]\n"}
+    NEW = {"Playback.py": b"new playback\n", "tinytask/player.py": b"new player\n", "README.md": b"same\n",
+           "tinytask/added.py": b"added\n"}
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.target = os.path.join(self._tmp.name, "install")
+        for name, data in self.OLD.items():
+            self.write(name, data)
+        self.archive = os.path.join(self._tmp.name, "update.zip")
+        with open(self.archive, "wb") as f:
+            f.write(make_archive(self.NEW))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.target, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def contents(self):
+        found = {}
+        for folder, dirs, files in os.walk(self.target):
+            dirs[:] = [d for d in dirs if not d.startswith(".tinytask_")]
+            for name in files:
+                if name.startswith(".tinytask_"): # The installer's own bookkeeping
+                    continue
+                path = os.path.join(folder, name)
+                with open(path, "rb") as f:
+                    found[os.path.relpath(path, self.target).replace(os.sep, "/")] = f.read()
+        return found
+
+    def test_only_changed_files_are_written(self):
+        plan = plan_update(self.archive, self.target)
+        self.assertEqual(sorted(relative.replace(os.sep, "/") for relative, _ in plan.changed),
+                         ["Playback.py", "tinytask/added.py", "tinytask/player.py"])
+        self.assertEqual(plan.unchanged, 1)
+        self.assertEqual(apply_update(plan), 3)
+        self.assertEqual(self.contents(), dict(self.NEW, **{"my_macro.json": b"[]\n"}))
+
+    def test_rollback_restores_previous_files(self):
+        apply_update(plan_update(self.archive, self.target))
+        self.assertEqual(rollback_update(self.target), 3)
+        self.assertEqual(self.contents(), self.OLD)
+        with self.assertRaises(UpdateError):
+            rollback_update(self.target) # Nothing left to roll back
+
+    def test_failed_swap_rolls_back(self):
+        real_write = installer._write_journal
+        def fail_on_second_file(target_dir, entries):
+            if len(entries) == 2:
+                raise OSError("disk full")
+            real_write(target_dir, entries)
+        with mock.patch.object(installer, "_write_journal", fail_on_second_file):
+            with self.assertRaises(OSError):
+                apply_update(plan_update(self.archive, self.target))
+        self.assertEqual(self.contents(), self.OLD)
+        self.assertFalse(os.path.exists(os.path.join(self.target, JOURNAL)))
+
+    def test_interrupted_install_is_recovered(self):
+        apply_update(plan_update(self.archive, self.target))
+        # A crash just before the commit step leaves the journal in place of the manifest
+        os.replace(os.path.join(self.target, BACKUP_DIR, "manifest.json"), os.path.join(self.target, JOURNAL))
+        self.assertEqual(recover_interrupted_install(self.target), 3)
+        self.assertEqual(self.contents(), self.OLD)
+        self.assertFalse(os.path.exists(os.path.join(self.target, JOURNAL)))
+        self.assertEqual(recover_interrupted_install(self.target), 0)
+
+    def test_files_dropped_by_the_release_are_removed(self):
+        self.write("tinytask/stale.py", b"deleted upstream\n")
+        plan = plan_update(self.archive, self.target)
+        # No INSTALLED list yet: everything under the archive's directories is the app's
+        self.assertEqual([relative.replace(os.sep, "/") for relative in plan.removed], ["tinytask/stale.py"])
+        self.assertEqual(apply_update(plan), 4)
+        self.assertNotIn("tinytask/stale.py", self.contents())
+        self.assertIn("my_macro.json", self.contents()) # Top-level files aren't the app's unless listed
+        with open(os.path.join(self.target, INSTALLED)) as f:
+            self.assertEqual(sorted(json.load(f)), sorted(self.NEW))
+
+        # The next release drops a file the last one shipped; its INSTALLED list says so
+        with open(self.archive, "wb") as f:
+            f.write(make_archive({name: data for name, data in self.NEW.items() if name != "tinytask/added.py"}))
+        self.assertEqual(apply_update(plan_update(self.archive, self.target)), 1)
+        self.assertNotIn("tinytask/added.py", self.contents())
+        rollback_update(self.target)
+        self.assertEqual(self.contents()["tinytask/added.py"], b"added\n")
+        with open(os.path.join(self.target, INSTALLED)) as f:
+            self.assertIn("tinytask/added.py", json.load(f)) # Rolled back with the files
+
+    def test_failed_swap_restores_removed_files(self):
+        self.write("tinytask/stale.py", b"deleted upstream\n")
+        real_replace = os.replace
+        def fail_on_removal(src, dst):
+            if src.endswith("stale.py"):
+                raise OSError("file in use")
+            real_replace(src, dst)
+        with mock.patch.object(installer.os, "replace", fail_on_removal):
+            with self.assertRaises(OSError):
+                apply_update(plan_update(self.archive, self.target))
+        self.assertEqual(self.contents(), dict(self.OLD, **{"tinytask/stale.py": b"deleted upstream\n"}))
+        self.assertFalse(os.path.exists(os.path.join(self.target, INSTALLED)))
+
+    def test_unsafe_member_paths_are_refused(self):
+        with open(self.archive, "wb") as f:
+            f.write(make_archive({"../escape.py": b"x"}))
+        with self.assertRaises(UpdateError):
+            plan_update(self.archive, self.target)
+
+
+if __name__ == "__main__":
+    unittest.main()
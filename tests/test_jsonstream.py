@@ -0,0 +1,105 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Streaming JSON reader: same events and same errors as json.load(), at any chunk size.
+
+Run with: python -m unittest discover -s tests
+"""
+import io
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.jsonstream import iter_json_events, validate_event
+from tinytask.macrofile import MacroFormatError
+
+EVENTS = [
+    {"type": "mouse_move", "x": 10, "y": -20.5, "time": 0.0},
+    {"type": "mouse_click", "x": 10, "y": 20, "button": "Button.left", "pressed": True, "time": 1e-3},
+    {"type": "mouse_scroll", "x": 5, "y": 6, "dx": 0, "dy": -3, "time": 0.3},
+    {"type": "key_press", "key": "\"\\ é \U0001F600", "time": 0.4},
+    {"type": "key_release", "key": None, "time": 12345.678},
+]
+CHUNK_SIZES = (1, 2, 3, 7, 64, 1 << 16)
+
+
+def _stream(text, chunk_size):
+    return list(iter_json_events(io.StringIO(text), chunk_size))
+
+
+class IterJsonEventsTests(unittest.TestCase):
+    def test_matches_json_load_at_every_chunk_size(self):
+        documents = [json.dumps(EVENTS), json.dumps(EVENTS, indent=4), json.dumps(EVENTS, ensure_ascii=False),
+                     "  [ ]  ", "[]", "\n[\n" + ",\n".join(json.dumps(event) for event in EVENTS) + "\n]\n"]
+        for text in documents:
+            for chunk_size in CHUNK_SIZES:
+                with self.subTest(text=text[:20], chunk_size=chunk_size):
+                    self.assertEqual(_stream(text, chunk_size), json.loads(text))
+
+    def test_decode_errors_match_json_load(self):
+        good = json.dumps(EVENTS, indent=4)
+        documents = ["", "   ", "[", "[{", good[:-1], good + " x", good + "]",
+                     good.replace(",", "", 1), good.replace('"mouse_move"', "mouse_move"),
+                     good.replace("-20.5", "-20.5.5"), good.replace("\\\\", "\\q"),
+                     good[:-2] + ",\n]"]
+        for text in documents:
+            try:
+                json.loads(text)
+            except json.JSONDecodeError as e:
+                expected = e
+            else:
+                self.fail(f"{text!r} is valid JSON")
+            for chunk_size in CHUNK_SIZES:
+                with self.subTest(text=text[-20:], chunk_size=chunk_size):
+                    with self.assertRaises(json.JSONDecodeError) as raised:
+                        _stream(text, chunk_size)
+                    self.assertEqual(str(raised.exception), str(expected))
+                    self.assertEqual((raised.exception.lineno, raised.exception.colno),
+                                     (expected.lineno, expected.colno))
+
+    def test_events_are_yielded_before_the_end_is_read(self):
+        f = io.StringIO(json.dumps(EVENTS) + "garbage" * 10000)
+        events = iter_json_events(f, chunk_size=256)
+        self.assertEqual(next(events), EVENTS[0])
+        self.assertLess(f.tell(), 1000)
+
+    def test_not_a_list(self):
+        for text in ('{"type": "mouse_move"}', "42", '"events"'):
+            with self.subTest(text), self.assertRaises(MacroFormatError):
+                _stream(text, 8)
+
+    def test_invalid_event_stops_the_stream(self):
+        text = json.dumps([EVENTS[0], {"type": "mouse_move", "x": 1, "time": 0}, EVENTS[1]])
+        events = iter_json_events(io.StringIO(text), 8)
+        self.assertEqual(next(events), EVENTS[0])
+        with self.assertRaises(MacroFormatError) as raised:
+            next(events)
+        self.assertIn("missing 'y'", str(raised.exception))
+
+
+class ValidateEventTests(unittest.TestCase):
+    def test_valid_events(self):
+        for event in EVENTS:
+            with self.subTest(event["type"]):
+                validate_event(event)
+
+    def test_invalid_events(self):
+        cases = [
+            [],
+            {"type": "mouse_drag", "x": 1, "y": 1, "time": 0},
+            {"type": "mouse_move", "x": 1, "y": 1},
+            {"type": "mouse_move", "x": 1, "y": 1, "time": "0"},
+            {"type": "mouse_move", "x": True, "y": 1, "time": 0}, # bool is not a coordinate
+            {"type": "mouse_move", "x": 1 << 31, "y": 1, "time": 0}, # Doesn't fit the int32 column
+            {"type": "mouse_move", "x": float("nan"), "y": 1, "time": 0},
+            {"type": "mouse_click", "x": 1, "y": 1, "button": "Button.left", "pressed": 1, "time": 0},
+            {"type": "key_press", "key": 65, "time": 0},
+        ]
+        for event in cases:
+            with self.subTest(event), self.assertRaises(MacroFormatError):
+                validate_event(event, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Repeat playback: iteration counts, cancellation, and never leaving input held down.
+
+Run with: python -m unittest discover -s tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore
+from tinytask.injectors import HeldInputTracker, RecordingInjector
+from tinytask.looping import FOREVER, play_loop
+from tinytask.plan import OP_MOUSE_UP, OP_KEY_UP, compile_plan
+from tinytask.timewarp import AS_FAST_AS_POSSIBLE, TimeWarp
+
+# Ends with the shift key and the left button still held, like a macro stopped mid-drag
+EVENTS = [
+    {"type": "mouse_move", "x": 1, "y": 2, "time": 0.0},
+    {"type": "key_press", "key": "Key.shift", "time": 0.1},
+    {"type": "key_press", "key": "a", "time": 0.2},
+    {"type": "key_release", "key": "a", "time": 0.3},
+    {"type": "mouse_click", "x": 5, "y": 6, "button": "Button.left", "pressed": True, "time": 0.4},
+]
+FAST = TimeWarp(speed=AS_FAST_AS_POSSIBLE)
+
+
+class PlayLoopTests(unittest.TestCase):
+    def setUp(self):
+        self.plan = compile_plan(EventStore.from_dicts(EVENTS))
+
+    def test_iterations_release_held_input_each_time(self):
+        injector = RecordingInjector()
+        seen = []
+        stats = play_loop(self.plan, injector, iterations=3, warp=FAST,
+                          on_iteration=lambda index, stats: seen.append(index))
+        self.assertEqual(seen, [0, 1, 2])
+        self.assertTrue(stats.completed)
+        self.assertEqual(stats.iterations, 3)
+        self.assertEqual(list(stats.actions), [len(self.plan)] * 3)
+        self.assertEqual(stats.released, 6)
+        releases = [(op, arg) for _, op, _, _, arg in injector.actions()][len(self.plan):len(self.plan) + 2]
+        self.assertEqual(releases, [(OP_KEY_UP, "shift"), (OP_MOUSE_UP, "left")])
+        self.assertEqual(len(injector), (len(self.plan) + 2) * 3)
+
+    def test_cancel_ends_forever(self):
+        injector = RecordingInjector()
+        stats = play_loop(self.plan, injector, iterations=FOREVER, warp=FAST,
+                          is_cancelled=lambda: len(injector) >= 20)
+        self.assertFalse(stats.completed)
+        self.assertEqual(stats.released, 2 * stats.iterations)
+
+    def test_max_seconds(self):
+        stats = play_loop(self.plan, RecordingInjector(), iterations=FOREVER, max_seconds=0, warp=FAST)
+        self.assertEqual(stats.iterations, 0)
+        self.assertEqual(stats.summary(), "no iterations played")
+
+    def test_failure_still_releases(self):
+        class Failing(RecordingInjector):
+            def mouse_down(self, x, y, button):
+                raise RuntimeError("no display")
+
+        injector = Failing()
+        with self.assertRaises(RuntimeError):
+            play_loop(self.plan, injector, warp=FAST)
+        self.assertEqual([(op, arg) for _, op, _, _, arg in injector.actions()][-1], (OP_KEY_UP, "shift"))
+
+
+class HeldInputTrackerTests(unittest.TestCase):
+    def test_release_all_in_reverse_press_order(self):
+        inner = RecordingInjector()
+        held = HeldInputTracker(inner)
+        held.key_down("ctrl")
+        held.key_down("shift")
+        held.mouse_down(3, 4, "left")
+        held.key_up("ctrl")
+        del inner.args[:]
+        self.assertEqual(held.release_all(), 2)
+        self.assertEqual(inner.args[-2:], ["shift", "left"])
+        self.assertEqual(held.release_all(), 0)
+
+    def test_failed_release_does_not_keep_the_rest_held(self):
+        class Stuck(RecordingInjector):
+            def key_up(self, key):
+                if key == "shift":
+                    raise OSError("stuck")
+                RecordingInjector.key_up(self, key)
+
+        held = HeldInputTracker(Stuck())
+        for key in ("ctrl", "shift", "alt"):
+            held.key_down(key)
+        held.mouse_down(0, 0, "right")
+        with self.assertLogs("tinytask.injectors", "WARNING"):
+            self.assertEqual(held.release_all(), 3)
+        self.assertEqual(held.inner.args[-3:], ["alt", "ctrl", "right"])
+        self.assertFalse(held.keys or held.buttons)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Macro files: .ttm and JSON round trips, conversion, and rejecting bad files.
+
+Run with: python -m unittest discover -s tests
+"""
+import json
+import os
+import struct
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore
+from tinytask.macrofile import (HEADER, FORMAT_VERSION, MacroFormatError, MacroReader, MacroWriter,
+                                convert_macro, load_macro, save_macro)
+
+EVENTS = [
+    {"type": "mouse_move", "x": 10, "y": 20, "time": 0.0},
+    {"type": "mouse_click", "x": 10, "y": 20, "button": "Button.left", "pressed": True, "time": 0.125},
+    {"type": "mouse_click", "x": 10, "y": 20, "button": "Button.left", "pressed": False, "time": 0.25},
+    {"type": "mouse_scroll", "x": -5, "y": 6, "dx": 0, "dy": -3, "time": 0.5},
+    {"type": "key_press", "key": "é", "time": 0.75},
+    {"type": "key_release", "key": "é", "time": 1.0},
+    {"type": "key_press", "key": None, "time": 1.5},
+]
+
+
+class MacroFileTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self._tmp.name, name)
+
+
+class BinaryFormatTests(MacroFileTestCase):
+    def test_round_trip(self):
+        save_macro(self.path("m.ttm"), EventStore.from_dicts(EVENTS))
+        with load_macro(self.path("m.ttm")) as reader:
+            self.assertIsInstance(reader, MacroReader)
+            self.assertEqual(len(reader), len(EVENTS))
+            self.assertEqual(reader.to_dicts(), EVENTS)
+            self.assertEqual(reader[4], EVENTS[4])
+            self.assertEqual(reader.to_store().to_dicts(), EVENTS)
+
+    def test_streaming_writer(self):
+        with MacroWriter(self.path("m.ttm")) as writer:
+            for event in EVENTS:
+                writer.write_event(event)
+        with MacroReader(self.path("m.ttm")) as reader:
+            self.assertEqual(reader.to_dicts(), EVENTS)
+
+    def test_empty_macro(self):
+        save_macro(self.path("empty.ttm"), EventStore())
+        with MacroReader(self.path("empty.ttm")) as reader:
+            self.assertFalse(reader)
+            self.assertEqual(reader.to_dicts(), [])
+
+    def test_progress_reaches_total(self):
+        calls = []
+        save_macro(self.path("m.ttm"), EventStore.from_dicts(EVENTS), progress=lambda done, total: calls.append(done))
+        self.assertEqual(calls[-1], len(EVENTS))
+
+    def test_bad_files_are_rejected(self):
+        save_macro(self.path("good.ttm"), EventStore.from_dicts(EVENTS))
+        with open(self.path("good.ttm"), "rb") as f:
+            good = f.read()
+        header = list(HEADER.unpack_from(good, 0))
+        future = header[:1] + [FORMAT_VERSION + 1] + header[2:]
+        cases = {
+            "tiny.ttm": b"TTM",
+            "magic.ttm": b"NOTAMACRO" + good[9:],
+            "future.ttm": HEADER.pack(*future) + good[HEADER.size:],
+            "truncated.ttm": good[:HEADER.size + 10],
+            "strings.ttm": good[:-2] + struct.pack("<H", 0xFFFE), # A symbol length past the end
+        }
+        for name, data in cases.items():
+            with open(self.path(name), "wb") as f:
+                f.write(data)
+            with self.subTest(name), self.assertRaises(MacroFormatError):
+                MacroReader(self.path(name))
+
+    def test_failed_save_keeps_the_old_file(self):
+        save_macro(self.path("m.ttm"), EventStore.from_dicts(EVENTS[:2]))
+        with mock.patch.object(MacroWriter, "write_store", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                save_macro(self.path("m.ttm"), EventStore.from_dicts(EVENTS))
+        with MacroReader(self.path("m.ttm")) as reader:
+            self.assertEqual(reader.to_dicts(), EVENTS[:2])
+        self.assertEqual(os.listdir(self._tmp.name), ["m.ttm"]) # No temporary file left behind
+
+
+class JsonFormatTests(MacroFileTestCase):
+    def test_round_trip_matches_json_dump(self):
+        events = EVENTS * 3000 # More than one write chunk
+        save_macro(self.path("m.json"), EventStore.from_dicts(events))
+        with open(self.path("m.json")) as f:
+            self.assertEqual(f.read(), json.dumps(events, indent=4))
+        self.assertEqual(load_macro(self.path("m.json")).to_dicts(), events)
+
+    def test_empty_list(self):
+        save_macro(self.path("empty.json"), EventStore())
+        self.assertEqual(len(load_macro(self.path("empty.json"))), 0)
+
+    def test_invalid_events_raise_format_error(self):
+        with open(self.path("bad.json"), "w") as f:
+            json.dump([{"type": "mouse_move", "x": 1, "time": 0}], f)
+        with self.assertRaises(MacroFormatError):
+            load_macro(self.path("bad.json"))
+
+    def test_convert_between_formats(self):
+        with open(self.path("a.json"), "w") as f:
+            json.dump(EVENTS, f)
+        self.assertEqual(convert_macro(self.path("a.json"), self.path("b.ttm")), len(EVENTS))
+        self.assertEqual(convert_macro(self.path("b.ttm"), self.path("c.json")), len(EVENTS))
+        self.assertEqual(load_macro(self.path("c.json")).to_dicts(), EVENTS)
+
+
+if __name__ == "__main__":
+    unittest.main()
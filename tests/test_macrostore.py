@@ -0,0 +1,138 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""MacroStore: loading, replacing and saving, and when replaced files get closed.
+
+Run with: python -m unittest discover -s tests
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask import macrostore, pipeline
+from tinytask.events import EventStore
+from tinytask.macrofile import MacroFormatError, MacroReader, load_macro, save_macro
+from tinytask.macrostore import MacroStore, describe_load_error
+
+EVENTS = [
+    {"type": "mouse_move", "x": 1, "y": 2, "time": 0.0},
+    {"type": "mouse_click", "x": 1, "y": 2, "button": "Button.left", "pressed": True, "time": 0.1},
+    {"type": "key_press", "key": "a", "time": 0.2},
+]
+TIMEOUT = 5
+
+
+class MacroStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.ttm = os.path.join(self._tmp.name, "m.ttm")
+        save_macro(self.ttm, EventStore.from_dicts(EVENTS))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_load_compiles_the_plan(self):
+        store = MacroStore()
+        self.assertFalse(store.playable)
+        store.load(self.ttm)
+        self.assertIsInstance(store.events, MacroReader)
+        self.assertEqual(store.path, self.ttm)
+        self.assertEqual(len(store), len(EVENTS))
+        self.assertIs(store.source, store.plan)
+        self.assertEqual(store.expected_steps(3), len(EVENTS) * 3)
+        store.set_events(EventStore()) # Closes the file
+
+    def test_replacing_a_loaded_file_closes_it(self):
+        store = MacroStore()
+        store.load(self.ttm)
+        reader = store.events
+        store.set_events(EventStore.from_dicts(EVENTS[:1]))
+        self.assertTrue(reader._mmap.closed)
+        self.assertIsNone(store.path)
+        self.assertEqual(len(store.plan), 1)
+
+    def test_failed_load_keeps_the_current_macro(self):
+        store = MacroStore()
+        store.set_events(EventStore.from_dicts(EVENTS))
+        bad = os.path.join(self._tmp.name, "bad.json")
+        with open(bad, "w") as f:
+            json.dump([{"type": "mouse_move"}], f)
+        with self.assertRaises(MacroFormatError):
+            store.load(bad)
+        self.assertEqual(store.events.to_dicts(), EVENTS)
+
+    def test_replaced_while_saving_is_closed_after_the_save(self):
+        store = MacroStore()
+        store.load(self.ttm)
+        reader = store.events
+        saving, replaced = threading.Event(), threading.Event()
+        open_while_writing = []
+
+        def slow_save(path, events, progress=None):
+            saving.set()
+            replaced.wait(TIMEOUT)
+            open_while_writing.append(not reader._mmap.closed)
+            save_macro(path, events, progress=progress)
+
+        copy = os.path.join(self._tmp.name, "copy.ttm")
+        with mock.patch.object(macrostore, "save_macro", side_effect=slow_save):
+            saver = threading.Thread(target=store.save, args=(copy,))
+            saver.start()
+            self.assertTrue(saving.wait(TIMEOUT))
+            store.set_events(EventStore())
+            self.assertFalse(reader._mmap.closed)
+            replaced.set()
+            saver.join(TIMEOUT)
+        self.assertEqual(open_while_writing, [True])
+        self.assertTrue(reader._mmap.closed)
+        with load_macro(copy) as saved:
+            self.assertEqual(saved.to_dicts(), EVENTS)
+
+    def test_load_async(self):
+        store = MacroStore()
+        done = threading.Event()
+        results = []
+
+        def on_done(loader):
+            results.append((loader.error, store.is_loading))
+            done.set()
+
+        gate = threading.Event()
+        iter_macro_chunks = pipeline.iter_macro_chunks
+
+        def gated_chunks(*args):
+            gate.wait(TIMEOUT) # Keeps the load running until the test has looked at it
+            return iter_macro_chunks(*args)
+
+        with mock.patch.object(pipeline, "iter_macro_chunks", side_effect=gated_chunks):
+            loader = store.load_async(self.ttm, on_done)
+            self.assertTrue(store.is_loading)
+            self.assertIs(store.source, loader)
+            self.assertEqual(store.expected_steps(), 0)
+            self.assertIs(store.load_async(self.ttm), loader) # Only one load at a time
+            gate.set()
+            self.assertTrue(done.wait(TIMEOUT))
+        self.assertEqual(results, [(None, False)])
+        self.assertEqual(store.events.to_dicts(), EVENTS)
+        self.assertEqual(store.path, self.ttm)
+        self.assertEqual(len(store.plan), len(EVENTS))
+
+    def test_failed_load_async(self):
+        store = MacroStore()
+        store.set_events(EventStore.from_dicts(EVENTS))
+        done = threading.Event()
+        missing = os.path.join(self._tmp.name, "missing.ttm")
+        loader = store.load_async(missing, lambda loader: done.set())
+        self.assertTrue(done.wait(TIMEOUT))
+        self.assertIsInstance(loader.error, FileNotFoundError)
+        self.assertFalse(store.is_loading)
+        self.assertEqual(store.events.to_dicts(), EVENTS)
+        self.assertIn("not found", describe_load_error(missing, loader.error))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Compressed .ttz containers: round trips for every codec, and rejecting damaged files.
+
+Run with: python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore
+from tinytask.macrofile import MacroFormatError, load_macro, save_macro
+from tinytask.packed import (BLOCK_HEADER, CODECS, PACK_HEADER, iter_packed_blocks, load_packed,
+                             save_packed)
+
+EVENTS = [
+    {"type": "mouse_move", "x": 10, "y": 20, "time": 0.0},
+    {"type": "mouse_click", "x": 10, "y": 20, "button": "Button.left", "pressed": True, "time": 0.125},
+    {"type": "mouse_click", "x": 10, "y": 20, "button": "Button.left", "pressed": False, "time": 0.25},
+    {"type": "mouse_scroll", "x": -5, "y": 6, "dx": 0, "dy": -3, "time": 0.5},
+    {"type": "key_press", "key": "é", "time": 0.75},
+    {"type": "mouse_move", "x": 4000, "y": -20, "time": 0.875},
+    {"type": "key_release", "key": "é", "time": 1.0},
+    {"type": "key_press", "key": None, "time": 1.5},
+]
+
+
+class PackedTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "m.ttz")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip_every_codec(self):
+        events = EVENTS * 50
+        for codec in CODECS:
+            with self.subTest(codec):
+                save_packed(self.path, EventStore.from_dicts(events), codec=codec, block_events=64)
+                self.assertEqual(load_packed(self.path).to_dicts(), events)
+
+    def test_blocks_carry_their_own_symbols(self):
+        save_packed(self.path, EventStore.from_dicts(EVENTS), block_events=3)
+        blocks = list(iter_packed_blocks(self.path))
+        self.assertEqual([len(block) for block in blocks], [3, 3, 2])
+        self.assertEqual([event for block in blocks for event in block.to_dicts()], EVENTS)
+
+    def test_times_keep_microseconds(self):
+        events = [{"type": "mouse_move", "x": 0, "y": 0, "time": t} for t in (0.000001, 0.5, 3600.123456)]
+        save_packed(self.path, EventStore.from_dicts(events))
+        self.assertEqual([event["time"] for event in load_packed(self.path).to_dicts()], [0.000001, 0.5, 3600.123456])
+
+    def test_through_save_macro(self):
+        save_macro(self.path, EventStore.from_dicts(EVENTS))
+        self.assertEqual(load_macro(self.path).to_dicts(), EVENTS)
+
+    def test_unknown_codec(self):
+        with self.assertRaises(MacroFormatError):
+            save_packed(self.path, EventStore.from_dicts(EVENTS), codec="brotli")
+
+    def test_damaged_files_are_rejected(self):
+        save_packed(self.path, EventStore.from_dicts(EVENTS))
+        with open(self.path, "rb") as f:
+            good = f.read()
+        flipped = bytearray(good)
+        flipped[-1] ^= 0xFF
+        cases = {
+            "short": good[:4],
+            "magic": b"NOTAPACK" + good[8:],
+            "block header": good[:PACK_HEADER.size + 3],
+            "block body": good[:-1],
+            "checksum": bytes(flipped),
+        }
+        for name, data in cases.items():
+            with open(self.path, "wb") as f:
+                f.write(data)
+            with self.subTest(name), self.assertRaises(MacroFormatError):
+                load_packed(self.path)
+
+    def test_corrupt_block_contents(self):
+        # A block that passes its checksum but doesn't decode (e.g. written by a buggy encoder)
+        save_packed(self.path, EventStore.from_dicts(EVENTS), codec="none")
+        with open(self.path, "rb") as f:
+            data = bytearray(f.read())
+        start = PACK_HEADER.size
+        packed_size, raw_size, count, _ = BLOCK_HEADER.unpack_from(data, start)
+        checksum = zlib.crc32(data[start + BLOCK_HEADER.size:])
+        BLOCK_HEADER.pack_into(data, start, packed_size, raw_size, count + 100, checksum)
+        with open(self.path, "wb") as f:
+            f.write(data)
+        with self.assertRaises(MacroFormatError):
+            load_packed(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
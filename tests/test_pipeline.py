@@ -0,0 +1,141 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Background loading: chunked decoding of every format adds up to load_macro().
+
+Run with: python -m unittest discover -s tests
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore, KEY_PRESS
+from tinytask.macrofile import MacroFormatError, load_macro, save_macro
+from tinytask.packed import save_packed
+from tinytask.pipeline import FIRST_CHUNK_EVENTS, MacroLoader, iter_macro_chunks
+from tinytask.plan import OP_MOVE, OP_SCROLL, compile_plan
+from tinytask.streamlog import StreamingRecorder
+
+
+def _events(count):
+    events = []
+    for i in range(count):
+        t = i / 100
+        if i % 10 == 3:
+            events.append({"type": "key_press", "key": f"k{i % 7}", "time": t})
+        elif i % 10 == 7:
+            events.append({"type": "mouse_click", "x": i, "y": -i, "button": "Button.left",
+                           "pressed": i % 20 == 7, "time": t})
+        else:
+            events.append({"type": "mouse_move", "x": i, "y": i * 2, "time": t})
+    return events
+
+
+EVENTS = _events(2000)
+
+
+def _resolved(plan):
+    """The plan's steps with name indexes replaced by the names (chunks number them differently)."""
+    return [(t, op, x, y, plan.names[arg] if op not in (OP_MOVE, OP_SCROLL) else arg)
+            for t, op, x, y, arg in plan.steps()]
+
+
+class PipelineTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self._tmp.name, name)
+
+    def save_every_format(self):
+        paths = []
+        for name in ("m.ttm", "m.json"):
+            save_macro(self.path(name), EventStore.from_dicts(EVENTS))
+            paths.append(self.path(name))
+        save_packed(self.path("m.ttz"), EventStore.from_dicts(EVENTS), block_events=600) # One chunk per block
+        paths.append(self.path("m.ttz"))
+        log = StreamingRecorder(self.path("m.ttlog"), flush_interval=0, poll_interval=0.001)
+        log.start()
+        for start in range(0, len(EVENTS), 600): # Wait for each batch to be written as its own chunk
+            for event in EVENTS[start:start + 600]:
+                if event["type"] == "mouse_move":
+                    log.append_move(event["time"], event["x"], event["y"])
+                elif event["type"] == "mouse_click":
+                    log.append_click(event["time"], event["x"], event["y"], event["button"], event["pressed"])
+                else:
+                    log.append_key(KEY_PRESS, event["time"], event["key"])
+            deadline = time.monotonic() + 5
+            while log.chunks_written <= start // 600 and time.monotonic() < deadline:
+                time.sleep(0.001)
+        log.close()
+        paths.append(self.path("m.ttlog"))
+        return paths
+
+
+class IterMacroChunksTests(PipelineTestCase):
+    def test_chunks_add_up_to_load_macro(self):
+        for path in self.save_every_format():
+            with self.subTest(os.path.basename(path)):
+                whole = load_macro(path)
+                chunks = list(iter_macro_chunks(path, chunk_events=600))
+                self.assertGreater(len(chunks), 1)
+                self.assertEqual([event for chunk in chunks for event in chunk.to_dicts()], whole.to_dicts())
+                if hasattr(whole, "close"):
+                    whole.close()
+
+    def test_first_chunk_is_small(self):
+        save_macro(self.path("m.json"), EventStore.from_dicts(EVENTS))
+        sizes = [len(chunk) for chunk in iter_macro_chunks(self.path("m.json"), chunk_events=600)]
+        self.assertEqual(sizes[:3], [FIRST_CHUNK_EVENTS, 512, 600])
+        self.assertEqual(sum(sizes), len(EVENTS))
+
+    def test_bad_json_raises_format_error(self):
+        with open(self.path("bad.json"), "w") as f:
+            json.dump([{"type": "mouse_move", "x": 1, "time": 0}], f)
+        with self.assertRaises(MacroFormatError):
+            list(iter_macro_chunks(self.path("bad.json")))
+
+
+class MacroLoaderTests(PipelineTestCase):
+    def test_loads_events_and_plan(self):
+        save_macro(self.path("m.ttm"), EventStore.from_dicts(EVENTS))
+        finished = []
+        loader = MacroLoader(self.path("m.ttm"), chunk_events=600, on_done=finished.append).start()
+        plans = list(loader.plans())
+        loader.join()
+        self.assertEqual(finished, [loader])
+        self.assertIsNone(loader.error)
+        self.assertTrue(loader.loaded.is_set())
+        self.assertEqual(loader.events.to_dicts(), EVENTS)
+        expected = _resolved(compile_plan(EventStore.from_dicts(EVENTS)))
+        self.assertEqual(_resolved(loader.plan), expected)
+        self.assertEqual(sum(len(plan) for plan in plans), len(expected))
+
+    def test_error_follows_the_chunks_before_it(self):
+        events = EVENTS[:1000] + [{"type": "mouse_move", "x": 1, "time": 10}]
+        with open(self.path("bad.json"), "w") as f:
+            json.dump(events, f)
+        loader = MacroLoader(self.path("bad.json"), chunk_events=600).start()
+        plans = loader.plans()
+        played = 0
+        with self.assertRaises(MacroFormatError):
+            for plan in plans:
+                played += len(plan)
+        self.assertIsInstance(loader.error, MacroFormatError)
+        # The 256 and 512 event chunks before the bad event were still handed out
+        self.assertEqual(played, len(compile_plan(EventStore.from_dicts(EVENTS[:768]))))
+
+    def test_missing_file(self):
+        loader = MacroLoader(self.path("missing.ttm")).start()
+        with self.assertRaises(FileNotFoundError):
+            list(loader.plans())
+
+
+if __name__ == "__main__":
+    unittest.main()
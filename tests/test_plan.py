@@ -0,0 +1,91 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Playback plans: events compile to the same actions the old loop injected.
+
+Run with: python -m unittest discover -s tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore
+from tinytask.plan import (OP_MOVE, OP_MOUSE_DOWN, OP_MOUSE_UP, OP_SCROLL, OP_KEY_DOWN, OP_KEY_UP,
+                           coalesce_moves, compile_plan, normalize_button, normalize_key)
+
+EVENTS = [
+    {"type": "mouse_move", "x": 10, "y": 20, "time": 0.0},
+    {"type": "mouse_click", "x": 10, "y": 20, "button": "Button.left", "pressed": True, "time": 0.1},
+    {"type": "mouse_click", "x": 10, "y": 20, "button": "Button.left", "pressed": False, "time": 0.2},
+    {"type": "mouse_scroll", "x": 5, "y": 6, "dx": 2, "dy": -3, "time": 0.3},
+    {"type": "key_press", "key": "Key.ctrl_l", "time": 0.4},
+    {"type": "key_press", "key": None, "time": 0.45},
+    {"type": "key_release", "key": "Key.ctrl_l", "time": 0.5},
+]
+
+
+def _resolved(plan):
+    """The plan's steps with name indexes replaced by the names."""
+    return [(t, op, x, y, plan.names[arg] if op not in (OP_MOVE, OP_SCROLL) else arg)
+            for t, op, x, y, arg in plan.steps()]
+
+
+def _moves(*points):
+    return EventStore.from_dicts([{"type": "mouse_move", "x": x, "y": 0, "time": t} for t, x in points])
+
+
+class CompilePlanTests(unittest.TestCase):
+    def test_names_are_normalized(self):
+        self.assertEqual(normalize_button("Button.Right"), "right")
+        self.assertEqual(normalize_key("Key.SHIFT"), "shift")
+        self.assertEqual(normalize_key("a"), "a")
+        self.assertIsNone(normalize_key(None))
+
+    def test_compile(self):
+        plan = compile_plan(EventStore.from_dicts(EVENTS))
+        self.assertEqual(_resolved(plan), [
+            (0.0, OP_MOVE, 10, 20, 0),
+            (0.1, OP_MOUSE_DOWN, 10, 20, "left"),
+            (0.2, OP_MOUSE_UP, 10, 20, "left"),
+            (0.3, OP_SCROLL, 5, 6, -3), # pyautogui only scrolls vertically
+            (0.4, OP_KEY_DOWN, 0, 0, "ctrl_l"),
+            (0.5, OP_KEY_UP, 0, 0, "ctrl_l"),
+        ])
+        self.assertEqual(plan.skipped, 1) # The key without a name
+        self.assertEqual(plan.duration, 0.5)
+
+    def test_empty(self):
+        plan = compile_plan(EventStore())
+        self.assertFalse(plan)
+        self.assertEqual(plan.duration, 0.0)
+
+    def test_extend_remaps_names(self):
+        first = compile_plan(EventStore.from_dicts(EVENTS[4:]))
+        second = compile_plan(EventStore.from_dicts(EVENTS[:4]))
+        first.extend(second)
+        whole = compile_plan(EventStore.from_dicts(EVENTS[4:] + EVENTS[:4]))
+        self.assertEqual(_resolved(first), _resolved(whole))
+        self.assertEqual(first.skipped, 1)
+
+
+class CoalesceMovesTests(unittest.TestCase):
+    def test_runs_collapse_to_their_last_move(self):
+        plan = compile_plan(_moves((0.0, 1), (0.001, 2), (0.002, 3), (0.02, 4), (0.021, 5)))
+        coalesced = coalesce_moves(plan, 0.01)
+        self.assertEqual([(t, x) for t, _, x, _, _ in coalesced.steps()], [(0.002, 3), (0.021, 5)])
+        self.assertEqual(coalesced.coalesced, 3)
+        self.assertEqual(len(plan), 5) # The source plan is left alone
+
+    def test_actions_are_barriers(self):
+        events = [{"type": "mouse_move", "x": 1, "y": 0, "time": 0.0},
+                  {"type": "mouse_move", "x": 2, "y": 0, "time": 0.001},
+                  {"type": "mouse_click", "x": 2, "y": 0, "button": "Button.left", "pressed": True, "time": 0.002},
+                  {"type": "mouse_move", "x": 3, "y": 0, "time": 0.003}]
+        plan = compile_plan(EventStore.from_dicts(events), move_quantum=0.01)
+        self.assertEqual([(op, x) for _, op, x, _, _ in plan.steps()],
+                         [(OP_MOVE, 2), (OP_MOUSE_DOWN, 2), (OP_MOVE, 3)])
+        self.assertEqual(plan.coalesced, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Player lifecycle: one run at a time, stop/join, and is_playing always clearing.
+
+Run with: python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import EventStore
+from tinytask.injectors import RecordingInjector
+from tinytask.macrofile import save_macro
+from tinytask.macrostore import MacroStore
+from tinytask.player import Player
+from tinytask.timewarp import AS_FAST_AS_POSSIBLE, TimeWarp
+
+EVENTS = [
+    {"type": "mouse_move", "x": 1, "y": 2, "time": 0.0},
+    {"type": "mouse_click", "x": 1, "y": 2, "button": "Button.left", "pressed": True, "time": 0.1},
+    {"type": "mouse_click", "x": 1, "y": 2, "button": "Button.left", "pressed": False, "time": 0.2},
+    {"type": "key_press", "key": "a", "time": 0.3},
+    {"type": "key_release", "key": "a", "time": 0.4},
+]
+FAST = TimeWarp(speed=AS_FAST_AS_POSSIBLE)
+TIMEOUT = 5
+
+
+class GatedInjector(RecordingInjector):
+    """Blocks in the first move until `gate` is set, so a test can act mid-run."""
+
+    def __init__(self):
+        RecordingInjector.__init__(self)
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+
+    def move(self, x, y):
+        self.entered.set()
+        self.gate.wait(TIMEOUT)
+        RecordingInjector.move(self, x, y)
+
+
+def _store(events=EVENTS):
+    store = MacroStore()
+    store.set_events(EventStore.from_dicts(events))
+    return store
+
+
+class PlayerTests(unittest.TestCase):
+    def test_run_plays_every_iteration(self):
+        finished = []
+        injector = RecordingInjector()
+        player = Player(injector, on_finished=lambda p: finished.append((p.is_playing, p.error)))
+        stats = player.run(_store(), iterations=3, warp=FAST)
+        self.assertEqual(stats.iterations, 3)
+        self.assertTrue(stats.completed)
+        self.assertEqual(len(injector), len(EVENTS) * 3)
+        self.assertEqual(finished, [(False, None)])
+        self.assertIs(player.stats, stats)
+        self.assertEqual(player.last_telemetry.count, len(EVENTS) * 3)
+
+    def test_overlapping_runs_are_refused_until_stopped(self):
+        injector = GatedInjector()
+        player = Player(injector)
+        store = _store()
+        self.assertTrue(player.start(store, iterations=None, warp=FAST))
+        self.assertTrue(injector.entered.wait(TIMEOUT))
+        self.assertTrue(player.is_playing)
+        self.assertFalse(player.start(store))
+        self.assertIsNone(player.run(store))
+        self.assertTrue(player.stop())
+        self.assertTrue(player.is_playing) # Still inside the injector: the stop only takes effect after it
+        injector.gate.set()
+        player.join(TIMEOUT)
+        self.assertFalse(player.is_playing)
+        self.assertFalse(player.stats.completed)
+        self.assertFalse(player.stop())
+        self.assertTrue(player.start(store, warp=FAST)) # Free again
+        player.join(TIMEOUT)
+        self.assertTrue(player.stats.completed)
+
+    def test_error_ends_the_run(self):
+        class Failing(RecordingInjector):
+            def key_down(self, key):
+                raise RuntimeError("no display")
+
+        injector = Failing()
+        player = Player(injector)
+        self.assertTrue(player.start(_store(), warp=FAST))
+        player.join(TIMEOUT)
+        self.assertFalse(player.is_playing)
+        self.assertIsInstance(player.error, RuntimeError)
+        self.assertIsNone(player.stats)
+        self.assertEqual(injector.args[-1], "left") # The held button was released
+        self.assertIsNotNone(player.last_telemetry)
+
+    def test_bad_store_ends_the_run(self):
+        player = Player(RecordingInjector())
+        self.assertIsNone(player.run(object()))
+        self.assertIsInstance(player.error, AttributeError)
+        self.assertFalse(player.is_playing)
+
+    def test_on_finished_can_start_the_next_run(self):
+        runs = []
+        store = _store()
+
+        def finished(player):
+            runs.append(player.stats.completed)
+            if len(runs) < 3:
+                self.assertTrue(player.start(store, warp=FAST))
+
+        player = Player(RecordingInjector(), on_finished=finished)
+        self.assertTrue(player.start(store, warp=FAST))
+        for _ in range(3):
+            player.join(TIMEOUT)
+        self.assertEqual(runs, [True, True, True])
+
+    def test_plays_a_macro_that_is_still_loading(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "m.json")
+            save_macro(path, EventStore.from_dicts(EVENTS * 200))
+            store = MacroStore()
+            store.load_async(path)
+            injector = RecordingInjector()
+            stats = Player(injector).run(store, iterations=2, warp=FAST)
+        self.assertTrue(stats.completed)
+        self.assertEqual(len(injector), len(EVENTS) * 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Recording logs: what the writer thread streams out can be recovered, even torn.
+
+Run with: python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinytask.events import KEY_PRESS, KEY_RELEASE
+from tinytask.streamlog import StreamingRecorder, read_log_chunks, recover_log
+
+MOUSE = [(0.0, "move", 1, 2), (0.1, "click", 3, 4), (0.3, "scroll", 5, 6), (0.5, "move", 7, 8)]
+KEYS = [(0.05, KEY_PRESS, "a"), (0.2, KEY_RELEASE, "a"), (0.4, KEY_PRESS, None)]
+
+
+def _feed_mouse(log):
+    for timestamp, kind, x, y in MOUSE:
+        if kind == "move":
+            log.append_move(timestamp, x, y)
+        elif kind == "click":
+            log.append_click(timestamp, x, y, "Button.left", True)
+        else:
+            log.append_scroll(timestamp, x, y, 0, -1)
+
+
+def _feed_keys(log):
+    for timestamp, code, key in KEYS:
+        log.append_key(code, timestamp, key)
+
+
+class StreamingRecorderTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "rec.ttlog")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_listener_threads_are_merged_by_time(self):
+        # A clock that never advances holds every row back until close(), so the merge is total
+        log = StreamingRecorder(self.path, clock=lambda: 0.0, poll_interval=0.001)
+        log.start()
+        threads = [threading.Thread(target=_feed_mouse, args=(log,)), threading.Thread(target=_feed_keys, args=(log,))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        log.close()
+        self.assertEqual(len(log), len(MOUSE) + len(KEYS))
+        events = recover_log(self.path).to_dicts()
+        self.assertEqual([event["time"] for event in events], sorted(t for t, *_ in MOUSE + KEYS))
+        self.assertEqual(events[1], {"type": "key_press", "key": "a", "time": 0.05})
+        self.assertEqual(events[2], {"type": "mouse_click", "x": 3, "y": 4, "button": "Button.left",
+                                     "pressed": True, "time": 0.1})
+        self.assertEqual(events[5]["key"], None)
+
+    def test_torn_tail_keeps_earlier_chunks(self):
+        log = StreamingRecorder(self.path, flush_interval=0, poll_interval=0.001)
+        log.start()
+        _feed_mouse(log)
+        deadline = time.monotonic() + 5
+        while log.chunks_written == 0 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        _feed_keys(log)
+        log.close()
+        self.assertGreaterEqual(log.chunks_written, 2)
+        whole = recover_log(self.path).to_dicts()
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 3) # A crash mid-write of the last chunk
+        recovered = recover_log(self.path).to_dicts()
+        self.assertTrue(recovered)
+        self.assertLess(len(recovered), len(whole))
+        self.assertEqual(recovered, whole[:len(recovered)])
+
+    def test_not_a_log(self):
+        with open(self.path, "wb") as f:
+            f.write(b"[]")
+        with self.assertRaises(ValueError):
+            list(read_log_chunks(self.path))
+
+    def test_empty_log(self):
+        log = StreamingRecorder(self.path)
+        log.start()
+        log.close()
+        self.assertEqual(len(recover_log(self.path)), 0)
+
+    def test_failed_writer_drops_events_and_reports_at_close(self):
+        log = StreamingRecorder(self.path, max_queue=8, flush_interval=0, poll_interval=0.001)
+        with mock.patch.object(log, "_write_chunk", side_effect=OSError("disk full")):
+            log.start()
+            log.append_move(0.0, 1, 1)
+            log._thread.join(5) # The writer dies on its first chunk
+            started = time.perf_counter()
+            for i in range(100): # More than the ring holds: must not block the listener
+                log.append_move(i * 0.01, i, i)
+            self.assertLess(time.perf_counter() - started, 1.0)
+            self.assertGreater(log.dropped, 0)
+            with self.assertRaises(OSError) as raised:
+                log.close()
+        self.assertIn("disk full", str(raised.exception))
+        self.assertIn(f"{log.dropped} events dropped", str(raised.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Updater tests against the local fake releases server (no network needed).
+
+Run with: python -m unittest discover -s tests
+"""
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from tinytask import updater
+from tinytask.updater import Release, Updater, UpdateError, file_sha256
+
+from fake_release_server import FakeReleaseServer, make_archive
+
+HAVE_REQUESTS = importlib.util.find_spec("requests") is not None
+
+
+def _gets(server):
+    return [ranges for method, path, ranges in server.requests if method == "GET" and "/download/" in path]
+
+
+@unittest.skipUnless(HAVE_REQUESTS, "the updater needs requests")
+class UpdaterTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Incompressible, so fail_after really cuts the transfer in the middle
+        cls.archive = make_archive({"payload.bin": os.urandom(256 << 10), "README.md": b"fake\n"})
+        cls.server = FakeReleaseServer(cls.archive).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        server = self.server
+        server.archive, server.tag = self.archive, "v9.9.9"
+        server.ranges, server.corrupt, server.fail_after = True, False, None
+        server.requests.clear()
+        self._cache = tempfile.TemporaryDirectory()
+        self.cache_dir = self._cache.name
+        self.updaters = []
+
+    def tearDown(self):
+        for instance in self.updaters:
+            instance.close()
+        self._cache.cleanup()
+
+    def make_updater(self, **kwargs):
+        instance = Updater(self.server.api_url, cache_dir=self.cache_dir, timeout=5, **kwargs)
+        self.updaters.append(instance)
+        return instance
+
+
+class ReleaseCheckTests(UpdaterTestCase):
+    def test_cached_within_ttl(self):
+        checker = self.make_updater()
+        self.assertEqual(checker.latest_release().tag, "v9.9.9")
+        self.assertEqual(checker.last_check, "fetched")
+        self.server.requests.clear()
+        self.assertEqual(checker.latest_release(ttl=3600).tag, "v9.9.9")
+        self.assertEqual(checker.last_check, "cache")
+        self.assertEqual(self.server.requests, [])
+
+    def test_expired_cache_revalidates_with_etag(self):
+        checker = self.make_updater()
+        checker.latest_release()
+        self.server.requests.clear()
+        self.assertEqual(checker.latest_release(ttl=0).tag, "v9.9.9")
+        self.assertEqual(checker.last_check, "not-modified")
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_changed_release_is_fetched_again(self):
+        checker = self.make_updater()
+        checker.latest_release()
+        self.server.tag = "v10.0.0" # New body, so the ETag no longer matches
+        self.assertEqual(checker.latest_release(ttl=0).tag, "v10.0.0")
+        self.assertEqual(checker.last_check, "fetched")
+
+    def test_bad_responses_raise_update_error(self):
+        import requests
+        checker = self.make_updater()
+        for status, body in ((304, b""), (200, b"<html>rate limited</html>")):
+            response = requests.Response()
+            response.status_code, response._content = status, body
+            with mock.patch.object(checker.session, "get", return_value=response):
+                with self.assertRaises(UpdateError):
+                    checker.latest_release(ttl=0) # Nothing cached, so a 304 can't be used
+
+    def test_release_carries_digest(self):
+        release = self.make_updater().latest_release()
+        self.assertEqual(release.sha256, updater.hashlib.sha256(self.archive).hexdigest())
+
+
+class DownloadTests(UpdaterTestCase):
+    def test_download_is_verified_and_cached(self):
+        downloader = self.make_updater()
+        release = downloader.latest_release()
+        path = downloader.download(release)
+        self.assertEqual(file_sha256(path), release.sha256)
+        self.server.requests.clear()
+        self.assertEqual(downloader.download(release), path)
+        self.assertEqual(_gets(self.server), []) # Served from the content-addressed cache
+
+    def test_interrupted_download_resumes_with_range(self):
+        # Small chunks, so the bytes received before the cut reach the part file
+        downloader = self.make_updater(workers=1, chunk_bytes=16 << 10)
+        release = downloader.latest_release()
+        self.server.fail_after = len(self.archive) // 2
+        with self.assertRaises(Exception):
+            downloader.download(release)
+        self.server.requests.clear()
+        path = downloader.download(release)
+        [ranges] = _gets(self.server)
+        self.assertRegex(ranges or "", r"^bytes=[1-9]\d*-$")
+        self.assertEqual(file_sha256(path), release.sha256)
+
+    def test_server_without_ranges_restarts_from_zero(self):
+        downloader = self.make_updater(workers=1, chunk_bytes=16 << 10)
+        release = downloader.latest_release()
+        self.server.ranges, self.server.fail_after = False, len(self.archive) // 2
+        with self.assertRaises(Exception):
+            downloader.download(release)
+        self.server.requests.clear()
+        path = downloader.download(release)
+        self.assertRegex(_gets(self.server)[0] or "", r"^bytes=[1-9]\d*-$") # Asked to resume, got 200
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.archive) # The partial bytes weren't kept twice
+
+    def test_regenerated_archive_is_not_spliced(self):
+        # Like a GitHub zipball: no digest, and the bytes may change between attempts
+        downloader = self.make_updater(workers=1, chunk_bytes=16 << 10)
+        release = Release("v9.9.9", f"{self.server.base_url}/download/v9.9.9.zip")
+        self.server.fail_after = len(self.archive) // 2
+        with self.assertRaises(Exception):
+            downloader.download(release)
+        regenerated = make_archive({"payload.bin": os.urandom(256 << 10), "README.md": b"fake\n"})
+        self.server.archive = regenerated
+        self.server.requests.clear()
+        path = downloader.download(release)
+        self.assertEqual(_gets(self.server), [None]) # The new ETag doesn't match: started over
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), regenerated)
+
+    def test_stale_if_range_restarts_from_zero(self):
+        # The archive changes between the HEAD and the GET: If-Range gets the whole body back
+        downloader = self.make_updater()
+        part_path = os.path.join(self.cache_dir, "part0")
+        with open(part_path, "wb") as f:
+            f.write(b"bytes of an older archive")
+        advanced = []
+        downloader._fetch_segment(f"{self.server.base_url}/download/v9.9.9.zip", part_path, 0, None,
+                                  '"stale"', advanced.append)
+        with open(part_path, "rb") as f:
+            self.assertEqual(f.read(), self.archive)
+        self.assertEqual(sum(advanced), len(self.archive) - len(b"bytes of an older archive"))
+
+    def test_leftover_parts_of_another_plan_are_removed(self):
+        downloader = self.make_updater(workers=1)
+        release = downloader.latest_release()
+        partial = os.path.join(self.cache_dir, "partial")
+        os.makedirs(partial)
+        for i in range(4): # An earlier attempt split into four segments
+            with open(os.path.join(partial, f"{release.sha256}.part{i}"), "wb") as f:
+                f.write(b"x" * 100)
+        path = downloader.download(release)
+        self.assertEqual(file_sha256(path), release.sha256)
+        self.assertEqual(_gets(self.server), [None])
+        self.assertEqual(os.listdir(partial), [])
+
+    def test_corrupt_archive_is_rejected(self):
+        downloader = self.make_updater()
+        release = downloader.latest_release()
+        self.server.corrupt = True
+        with self.assertRaises(UpdateError):
+            downloader.download(release)
+        self.assertEqual(os.listdir(os.path.join(self.cache_dir, "blobs")), [])
+        self.assertIsNone(downloader.cached_archive(release))
+
+    def test_parallel_segments(self):
+        downloader = self.make_updater(workers=4, chunk_bytes=16 << 10)
+        release = downloader.latest_release()
+        with mock.patch.object(updater, "PARALLEL_MIN_BYTES", 1):
+            path = downloader.download(release)
+        self.assertEqual(len(_gets(self.server)), 4)
+        self.assertTrue(all(ranges for ranges in _gets(self.server)))
+        self.assertEqual(file_sha256(path), release.sha256)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Shared engine pieces used by the Recorder, Playback and GUI front-ends.
+
+The names below are re-exported lazily: `from tinytask import EventStore` only
+imports tinytask.events, so front-ends pay at startup for the subsystems they
+actually use (the updater, compression codecs etc. load on first access).
+"""
+import importlib
+
+_EXPORTS = {
+    "events": (
+        "EVENT_TYPES", "KEY_PRESS", "KEY_RELEASE", "MOUSE_CLICK", "MOUSE_MOVE", "MOUSE_SCROLL",
+        "TYPE_CODES", "EventStore", "SymbolTable", "merge_stores",
+    ),
+    "macrofile": (
+        "MacroFormatError", "MacroReader", "MacroWriter", "convert_macro", "load_macro",
+        "save_macro",
+    ),
+    "streamlog": (
+        "StreamingRecorder", "read_log_chunks", "recover_log",
+    ),
+    "scheduler": (
+        "DeadlineScheduler", "LatenessStats",
+    ),
+    "plan": (
+        "PlaybackPlan", "coalesce_moves", "compile_plan", "normalize_button", "normalize_key",
+    ),
+    "injectors": (
+        "HeldInputTracker", "Injector", "NullInjector", "PyAutoGUIInjector", "RecordingInjector",
+    ),
+    "player": (
+        "Player", "play_plan", "play_plans", "playback_tracer",
+    ),
+    "sources": (
+        "EventSource", "PynputSource", "SyntheticSource", "mouse_sweep", "typing",
+    ),
+    "recorder": (
+        "Recorder", "recording_tracer",
+    ),
+    "log": (
+        "TRACE", "get_logger", "setup_logging", "shutdown_logging",
+    ),
+    "simplify": (
+        "MoveSimplifier", "simplify_events",
+    ),
+    "ringbuffer": (
+        "SpscRing",
+    ),
+    "packed": (
+        "iter_packed_blocks", "load_packed", "save_packed",
+    ),
+    "jsonstream": (
+        "iter_json_events", "load_json_events", "validate_event",
+    ),
+    "pipeline": (
+        "MacroLoader", "iter_macro_chunks",
+    ),
+    "macrostore": (
+        "MacroStore", "describe_load_error",
+    ),
+    "timewarp": (
+        "AS_FAST_AS_POSSIBLE", "TimeWarp",
+    ),
+    "looping": (
+        "FOREVER", "LoopStats", "play_loop",
+    ),
+    "telemetry": (
+        "PlaybackTelemetry",
+    ),
+    "uiqueue": (
+        "UiQueue",
+    ),
+    "updater": (
+        "Release", "UpdateChecker", "UpdateError", "Updater",
+    ),
+    "installer": (
+        "UpdatePlan", "apply_update", "plan_update", "recover_interrupted_install",
+        "rollback_update",
+    ),
+}
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULE_OF)
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value # Later lookups skip this hook
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULE_OF))
@@ -0,0 +1,222 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+import heapq
+from array import array
+from operator import itemgetter
+
+# --- Event Type Codes ---
+# Every event type is stored as a single byte instead of a repeated string.
+MOUSE_MOVE = 0
+MOUSE_CLICK = 1
+MOUSE_SCROLL = 2
+KEY_PRESS = 3
+KEY_RELEASE = 4
+
+EVENT_TYPES = ("mouse_move", "mouse_click", "mouse_scroll", "key_press", "key_release")
+TYPE_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+
+
+def row_to_dict(symbols, code, timestamp, x, y, a, b):
+    """Rebuilds the legacy dict form of a (type, time, x, y, a, b) row."""
+    if code == MOUSE_MOVE:
+        return {"type": "mouse_move", "x": x, "y": y, "time": timestamp}
+    if code == MOUSE_CLICK:
+        return {"type": "mouse_click", "x": x, "y": y, "button": symbols.lookup(a),
+                "pressed": bool(b), "time": timestamp}
+    if code == MOUSE_SCROLL:
+        return {"type": "mouse_scroll", "x": x, "y": y, "dx": a, "dy": b, "time": timestamp}
+    return {"type": EVENT_TYPES[code], "key": symbols.lookup(a), "time": timestamp}
+
+
+class SymbolTable:
+    """Interns key and button names so each event only stores a small integer."""
+
+    def __init__(self, symbols=()):
+        self.symbols = []
+        self._ids = {}
+        for symbol in symbols:
+            self.intern(symbol)
+
+    def intern(self, symbol):
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self.symbols)
+            self.symbols.append(symbol)
+            self._ids[symbol] = symbol_id
+        return symbol_id
+
+    def lookup(self, symbol_id):
+        return self.symbols[symbol_id]
+
+    def __len__(self):
+        return len(self.symbols)
+
+
+class EventStore:
+    """Columnar, append-only store for recorded events.
+
+    Each event is one row across six typed columns:
+      types  - event type code (see EVENT_TYPES)
+      times  - seconds since the start of the recording
+      xs, ys - pointer position (0 for key events)
+      a      - button/key symbol id, or dx for scrolls
+      b      - pressed flag for clicks, or dy for scrolls
+    """
+
+    def __init__(self, symbols=None):
+        self.types = array('B')
+        self.times = array('d')
+        self.xs = array('i')
+        self.ys = array('i')
+        self.a = array('i')
+        self.b = array('i')
+        self.symbols = symbols if symbols is not None else SymbolTable()
+
+    # --- Appending (used by the recorder callbacks) ---
+
+    def _append_row(self, code, timestamp, x, y, a, b):
+        self.types.append(code)
+        self.times.append(timestamp)
+        self.xs.append(int(x))
+        self.ys.append(int(y))
+        self.a.append(a)
+        self.b.append(b)
+
+    def append_move(self, timestamp, x, y):
+        self._append_row(MOUSE_MOVE, timestamp, x, y, 0, 0)
+
+    def append_click(self, timestamp, x, y, button, pressed):
+        self._append_row(MOUSE_CLICK, timestamp, x, y, self.symbols.intern(button), 1 if pressed else 0)
+
+    def append_scroll(self, timestamp, x, y, dx, dy):
+        self._append_row(MOUSE_SCROLL, timestamp, x, y, int(dx), int(dy))
+
+    def append_key(self, code, timestamp, key):
+        self._append_row(code, timestamp, 0, 0, self.symbols.intern(key), 0)
+
+    def append(self, event):
+        """Appends an event given in the legacy dict form."""
+        code = TYPE_CODES[event["type"]]
+        timestamp = event["time"]
+        if code == MOUSE_MOVE:
+            self.append_move(timestamp, event["x"], event["y"])
+        elif code == MOUSE_CLICK:
+            self.append_click(timestamp, event["x"], event["y"], event["button"], event["pressed"])
+        elif code == MOUSE_SCROLL:
+            self.append_scroll(timestamp, event["x"], event["y"], event["dx"], event["dy"])
+        else:
+            self.append_key(code, timestamp, event["key"])
+
+    def extend(self, events):
+        for event in events:
+            self.append(event)
+
+    def append_store(self, other):
+        """Appends all rows of another EventStore, re-interning its symbols into this one."""
+        remap = [self.symbols.intern(symbol) for symbol in other.symbols.symbols]
+        a = self.a
+        for code, value in zip(other.types, other.a):
+            a.append(value if code == MOUSE_MOVE or code == MOUSE_SCROLL else remap[value])
+        self.types.extend(other.types)
+        self.times.extend(other.times)
+        self.xs.extend(other.xs)
+        self.ys.extend(other.ys)
+        self.b.extend(other.b)
+
+    def clear(self):
+        for column in (self.types, self.times, self.xs, self.ys, self.a, self.b):
+            del column[:]
+
+    # --- Reading ---
+
+    def __len__(self):
+        return len(self.types)
+
+    def __bool__(self):
+        return len(self.types) > 0
+
+    def last_move_within(self, x, y, tolerance):
+        """True if the last event is a mouse move within `tolerance` px of (x, y)."""
+        return bool(self.types) and self.types[-1] == MOUSE_MOVE and \
+            abs(self.xs[-1] - x) <= tolerance and abs(self.ys[-1] - y) <= tolerance
+
+    def row(self, index):
+        """Returns a (type, time, x, y, a, b) tuple without building a dict."""
+        return (self.types[index], self.times[index], self.xs[index],
+                self.ys[index], self.a[index], self.b[index])
+
+    def rows(self, start=0, stop=None):
+        """Yields (type, time, x, y, a, b) tuples; the cheap path for playback."""
+        if start == 0 and stop is None:
+            return zip(self.types, self.times, self.xs, self.ys, self.a, self.b)
+        return zip(self.types[start:stop], self.times[start:stop], self.xs[start:stop],
+                   self.ys[start:stop], self.a[start:stop], self.b[start:stop])
+
+    def event_at(self, index):
+        """Rebuilds the legacy dict form of a single event."""
+        return row_to_dict(self.symbols, *self.row(index))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            store = EventStore(self.symbols)
+            store.types = self.types[start:stop:step]
+            store.times = self.times[start:stop:step]
+            store.xs = self.xs[start:stop:step]
+            store.ys = self.ys[start:stop:step]
+            store.a = self.a[start:stop:step]
+            store.b = self.b[start:stop:step]
+            return store
+        return self.event_at(index)
+
+    def __iter__(self):
+        symbols = self.symbols
+        for row in self.rows():
+            yield row_to_dict(symbols, *row)
+
+    def to_dicts(self):
+        """Returns the events as a list of dicts, the format used by the JSON macro files."""
+        return list(self)
+
+    @classmethod
+    def from_dicts(cls, events):
+        store = cls()
+        store.extend(events)
+        return store
+
+    def nbytes(self):
+        """Approximate memory used by the column data."""
+        return sum(column.itemsize * len(column)
+                   for column in (self.types, self.times, self.xs, self.ys, self.a, self.b))
+
+    def as_numpy(self):
+        """Returns zero-copy NumPy views of the columns. Requires numpy.
+
+        The store cannot grow while the views are alive.
+        """
+        import numpy as np
+        return {name: np.frombuffer(column, dtype=column.typecode)
+                for name, column in (("types", self.types), ("times", self.times), ("xs", self.xs),
+                                     ("ys", self.ys), ("a", self.a), ("b", self.b))}
+
+
+def merge_stores(*stores):
+    """Merges time-ordered EventStores (e.g. one per listener thread) into one.
+
+    Rows are interleaved by timestamp; ties keep the order the stores were given in.
+    Symbols are re-interned into the merged store's own table.
+    """
+    merged = EventStore()
+    intern = merged.symbols.intern
+
+    def remapped(store):
+        lookup = store.symbols.lookup
+        for row in store.rows():
+            code = row[0]
+            if code != MOUSE_MOVE and code != MOUSE_SCROLL:
+                row = (code, row[1], row[2], row[3], intern(lookup(row[4])), row[5])
+            yield row
+
+    append_row = merged._append_row
+    for row in heapq.merge(*[remapped(store) for store in stores], key=itemgetter(1)):
+        append_row(*row)
+    return merged
@@ -0,0 +1,262 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Input-injection backends used by playback.
+
+PyAutoGUIInjector drives the real mouse and keyboard. NullInjector and
+RecordingInjector need no display, so playback can be run, benchmarked and
+checked for timing accuracy on a headless machine. Faster native backends
+only need to implement the same six methods.
+"""
+import time
+from array import array
+
+from .log import get_logger
+from .plan import OP_MOVE, OP_MOUSE_DOWN, OP_MOUSE_UP, OP_SCROLL, OP_KEY_DOWN, OP_KEY_UP
+
+log = get_logger("injectors")
+
+
+class Injector:
+    """Base class; one method per plan opcode. begin()/end() bracket a playback run.
+
+    begin_release()/end_release() bracket HeldInputTracker.release_all(), which
+    may run after end() (e.g. when a run is cancelled or fails).
+    """
+
+    name = "base"
+
+    def begin(self):
+        pass
+
+    def end(self):
+        pass
+
+    def begin_release(self):
+        pass
+
+    def end_release(self):
+        pass
+
+    def move(self, x, y):
+        raise NotImplementedError
+
+    def mouse_down(self, x, y, button):
+        raise NotImplementedError
+
+    def mouse_up(self, x, y, button):
+        raise NotImplementedError
+
+    def scroll(self, amount, x, y):
+        raise NotImplementedError
+
+    def key_down(self, key):
+        raise NotImplementedError
+
+    def key_up(self, key):
+        raise NotImplementedError
+
+
+class PyAutoGUIInjector(Injector):
+    """Injects real input with pyautogui (imported on first use)."""
+
+    name = "pyautogui"
+
+    def __init__(self, failsafe=True, pause=None):
+        import pyautogui
+        self.pyautogui = pyautogui
+        self.failsafe = failsafe
+        self.pause = pause
+        self._saved = None
+        self._release_failsafe = failsafe
+
+    def begin(self):
+        pyautogui = self.pyautogui
+        self._saved = (pyautogui.FAILSAFE, pyautogui.PAUSE)
+        pyautogui.FAILSAFE = self.failsafe
+        if self.pause is not None:
+            pyautogui.PAUSE = self.pause
+
+    def end(self):
+        if self._saved is not None:
+            self.pyautogui.FAILSAFE, self.pyautogui.PAUSE = self._saved
+            self._saved = None
+
+    def begin_release(self):
+        # With the pointer in a screen corner every call would raise FailSafeException,
+        # and the keys and buttons the macro left down would stay down
+        self._release_failsafe = self.pyautogui.FAILSAFE
+        self.pyautogui.FAILSAFE = False
+
+    def end_release(self):
+        self.pyautogui.FAILSAFE = self._release_failsafe
+
+    # _pause=False everywhere: pyautogui's built-in pause would only add lateness,
+    # the deadline scheduler decides when the next event happens
+
+    def move(self, x, y):
+        self.pyautogui.moveTo(x, y, _pause=False)
+
+    def mouse_down(self, x, y, button):
+        self.pyautogui.mouseDown(x, y, button=button, _pause=False)
+
+    def mouse_up(self, x, y, button):
+        self.pyautogui.mouseUp(x, y, button=button, _pause=False)
+
+    def scroll(self, amount, x, y):
+        self.pyautogui.scroll(amount, x=x, y=y, _pause=False)
+
+    def key_down(self, key):
+        self.pyautogui.keyDown(key, _pause=False)
+
+    def key_up(self, key):
+        self.pyautogui.keyUp(key, _pause=False)
+
+
+class HeldInputTracker(Injector):
+    """Wraps another injector and remembers which buttons and keys are still held down.
+
+    release_all() lifts them again, e.g. between loop iterations or after a
+    cancelled run, so a macro stopped mid-drag or mid-shortcut leaves no input stuck.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.name = inner.name
+        self.buttons = {} # button -> position it went down at
+        self.keys = {} # held keys, in press order
+        # Moves and scrolls don't change what is held: bind them straight through
+        self.move = inner.move
+        self.scroll = inner.scroll
+
+    def begin(self):
+        self.inner.begin()
+
+    def end(self):
+        self.inner.end()
+
+    def mouse_down(self, x, y, button):
+        self.inner.mouse_down(x, y, button)
+        self.buttons[button] = (x, y)
+
+    def mouse_up(self, x, y, button):
+        self.inner.mouse_up(x, y, button)
+        self.buttons.pop(button, None)
+
+    def key_down(self, key):
+        self.inner.key_down(key)
+        self.keys[key] = None
+
+    def key_up(self, key):
+        self.inner.key_up(key)
+        self.keys.pop(key, None)
+
+    def release_all(self):
+        """Releases everything still held (keys in reverse press order); returns how many.
+
+        Each release is tried on its own, so one that fails (and is logged) doesn't
+        leave the rest held; either way nothing is tracked as held afterwards.
+        """
+        if not self.keys and not self.buttons:
+            return 0
+        inner = self.inner
+        released = 0
+        inner.begin_release()
+        try:
+            for key in reversed(list(self.keys)):
+                try:
+                    inner.key_up(key)
+                    released += 1
+                except Exception as e:
+                    log.warning(f"Could not release key {key!r}: {e}")
+            for button, (x, y) in self.buttons.items():
+                try:
+                    inner.mouse_up(x, y, button)
+                    released += 1
+                except Exception as e:
+                    log.warning(f"Could not release mouse button {button!r}: {e}")
+        finally:
+            self.keys.clear()
+            self.buttons.clear()
+            inner.end_release()
+        return released
+
+
+class NullInjector(Injector):
+    """Discards every action and only counts them; measures pure playback overhead."""
+
+    name = "null"
+
+    def __init__(self):
+        self.count = 0
+
+    def move(self, x, y):
+        self.count += 1
+
+    def mouse_down(self, x, y, button):
+        self.count += 1
+
+    def mouse_up(self, x, y, button):
+        self.count += 1
+
+    def scroll(self, amount, x, y):
+        self.count += 1
+
+    def key_down(self, key):
+        self.count += 1
+
+    def key_up(self, key):
+        self.count += 1
+
+
+class RecordingInjector(Injector):
+    """Logs every action with its perf_counter_ns() injection time, in memory.
+
+    `times_ns`, `ops`, `xs` and `ys` are typed columns; `args` holds the
+    button/key name or scroll amount (None for moves).
+    """
+
+    name = "recording"
+
+    def __init__(self, clock=time.perf_counter_ns):
+        self.clock = clock
+        self.times_ns = array('q')
+        self.ops = array('B')
+        self.xs = array('i')
+        self.ys = array('i')
+        self.args = []
+
+    def _log(self, op, x, y, arg):
+        self.times_ns.append(self.clock())
+        self.ops.append(op)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.args.append(arg)
+
+    def move(self, x, y):
+        self._log(OP_MOVE, x, y, None)
+
+    def mouse_down(self, x, y, button):
+        self._log(OP_MOUSE_DOWN, x, y, button)
+
+    def mouse_up(self, x, y, button):
+        self._log(OP_MOUSE_UP, x, y, button)
+
+    def scroll(self, amount, x, y):
+        self._log(OP_SCROLL, x, y, amount)
+
+    def key_down(self, key):
+        self._log(OP_KEY_DOWN, 0, 0, key)
+
+    def key_up(self, key):
+        self._log(OP_KEY_UP, 0, 0, key)
+
+    def __len__(self):
+        return len(self.ops)
+
+    def actions(self):
+        """Yields (time_ns, op, x, y, arg) for every injected action."""
+        return zip(self.times_ns, self.ops, self.xs, self.ys, self.args)
+
+    def clear(self):
+        for column in (self.times_ns, self.ops, self.xs, self.ys):
+            del column[:]
+        self.args = []
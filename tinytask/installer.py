@@ -0,0 +1,304 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Differential in-place install of a downloaded release archive.
+
+Only files that differ from the installed copy are touched:
+
+  plan    compare each archive member to the installed file: size first, then
+          the CRC-32 already stored in the zip's central directory against the
+          local file's, so unchanged members are never decompressed (the
+          archive as a whole was SHA-256 verified by tinytask/updater.py)
+  stage   stream just the changed members out of the zip into a staging
+          directory inside the install (same filesystem, so renames are atomic)
+  swap    move each old file into a backup directory and rename the staged
+          file into place, recording every step in a journal; files the new
+          release no longer ships are moved into the backup the same way
+  commit  drop the journal; the backup is kept so the update can be undone
+
+If anything fails during the swap, the files already swapped are restored
+from the backup. A journal left behind by a crash is rolled back by
+recover_interrupted_install() on the next start.
+
+Which files a release dropped is worked out from INSTALLED, the list of
+files the previous update installed (swapped in with the rest). Installs
+that predate it fall back to what the old installer replaced wholesale:
+everything under the directories the archive ships. Other local files
+(e.g. saved macros) are left alone.
+"""
+import json
+import os
+import shutil
+import sys
+import zlib
+
+from .log import get_logger
+from .updater import UpdateError
+
+log = get_logger("installer")
+
+STAGING_DIR = ".tinytask_update_staging"
+BACKUP_DIR = ".tinytask_update_backup"
+JOURNAL = ".tinytask_update_journal.json"
+INSTALLED = ".tinytask_installed.json" # Files the last update installed, "/"-separated
+_COPY_CHUNK = 1 << 20
+
+
+def _file_crc32(path):
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_COPY_CHUNK), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _member_path(name, top_level):
+    """Archive member name -> path relative to the install, or None for directories and odd entries."""
+    if top_level:
+        if not name.startswith(top_level + "/"):
+            return None
+        name = name[len(top_level) + 1:]
+    if not name or name.endswith("/"):
+        return None
+    parts = name.split("/")
+    if name.startswith("/") or ".." in parts or ":" in parts[0]:
+        raise UpdateError(f"Refusing unsafe path in update archive: {name!r}")
+    return os.path.join(*parts)
+
+
+class UpdatePlan:
+    """What installing an archive would change."""
+
+    def __init__(self, archive_path, target_dir):
+        self.archive_path = archive_path
+        self.target_dir = target_dir
+        self.changed = [] # (relative path, ZipInfo) of new or modified files
+        self.removed = [] # relative paths of installed files the archive no longer has
+        self.shipped = [] # every file in the archive, "/"-separated, for INSTALLED
+        self.unchanged = 0
+        self.bytes_to_write = 0
+
+    def __len__(self):
+        return len(self.changed) + len(self.removed)
+
+    def describe(self):
+        removed = f", {len(self.removed)} to remove" if self.removed else ""
+        return (f"{len(self.changed)} file(s) to update ({self.bytes_to_write / 1e3:,.0f} KB){removed}, "
+                f"{self.unchanged} unchanged")
+
+
+def _installed_files(target_dir, shipped):
+    """Files the current install got from the last update ("/"-separated)."""
+    try:
+        with open(os.path.join(target_dir, INSTALLED)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    # Older installs: everything under the directories the archive ships, as the old
+    # installer's rmtree replaced them (bytecode caches and our own folders excepted)
+    found = []
+    for folder in sorted({name.split("/")[0] for name in shipped if "/" in name}):
+        for root, dirs, files in os.walk(os.path.join(target_dir, folder)):
+            dirs[:] = [d for d in dirs if d != "__pycache__" and not d.startswith(".tinytask_")]
+            relative_root = os.path.relpath(root, target_dir).replace(os.sep, "/")
+            found.extend(f"{relative_root}/{name}" for name in files)
+    return found
+
+
+def plan_update(archive_path, target_dir, skip=()):
+    """Compares an archive (GitHub zipball layout: one top-level folder) with the installed files.
+
+    skip: relative paths never to overwrite
+    """
+    import zipfile # Kept off the startup path, where only recover_interrupted_install() runs
+    plan = UpdatePlan(archive_path, target_dir)
+    with zipfile.ZipFile(archive_path) as archive:
+        infos = archive.infolist()
+        names = [info.filename for info in infos]
+        # Zipballs wrap everything in "<repo>-<commit>/"; plain archives don't
+        first = names[0].split("/")[0] if names else ""
+        top_level = first if names and all(name.startswith(first + "/") for name in names) else ""
+        for info in infos:
+            relative = _member_path(info.filename, top_level)
+            if relative is None or relative in skip:
+                continue
+            if (info.external_attr >> 16) & 0o170000 == 0o120000:
+                continue # Symlink entries aren't installed
+            plan.shipped.append(relative.replace(os.sep, "/"))
+            local = os.path.join(target_dir, relative)
+            if (os.path.isfile(local) and os.path.getsize(local) == info.file_size
+                    and _file_crc32(local) == info.CRC):
+                plan.unchanged += 1
+                continue
+            plan.changed.append((relative, info))
+            plan.bytes_to_write += info.file_size
+    shipped = set(plan.shipped)
+    for name in _installed_files(target_dir, plan.shipped):
+        relative = os.path.join(*name.split("/"))
+        if (name not in shipped and relative not in skip and not name.startswith(".tinytask_")
+                and os.path.isfile(os.path.join(target_dir, relative))):
+            _member_path(name, "") # The list is on disk: hold it to the archive's path rules
+            plan.removed.append(relative)
+    return plan
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _fsync_dir(path):
+    """Makes renames in `path` durable (POSIX; Windows can't open directories for this)."""
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_journal(target_dir, entries):
+    path = os.path.join(target_dir, JOURNAL)
+    with open(path + ".tmp", "w") as f:
+        json.dump(entries, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+    _fsync_dir(target_dir) # The rename itself must survive a crash too
+
+
+def _file_count(entries):
+    # Journal entries minus the INSTALLED list, which isn't one of the app's files
+    return sum(1 for relative, _ in entries if relative != INSTALLED)
+
+
+def _restore(target_dir, entries):
+    """Undoes swapped entries, newest first. Entries are [relative path, had an old version]."""
+    backup_root = os.path.join(target_dir, BACKUP_DIR)
+    for relative, had_old in reversed(entries):
+        target = os.path.join(target_dir, relative)
+        if had_old:
+            backup = os.path.join(backup_root, relative)
+            if os.path.exists(backup): # Otherwise the old file was never moved
+                os.replace(backup, target)
+        elif os.path.exists(target):
+            os.remove(target)
+
+
+def apply_update(plan, progress=None):
+    """Stages the changed files and swaps them in; returns the number of files replaced or removed.
+
+    progress: optional callable(done_steps, total_steps)
+    """
+    target_dir = plan.target_dir
+    staging_root = os.path.join(target_dir, STAGING_DIR)
+    backup_root = os.path.join(target_dir, BACKUP_DIR)
+    total = len(plan)
+    if not total:
+        return 0
+    # The new INSTALLED list is swapped in like any other file, so it rolls back with them
+    swaps = [relative for relative, _ in plan.changed] + [INSTALLED] + plan.removed
+    removed = set(plan.removed)
+    steps = len(plan.changed) + len(swaps)
+    shutil.rmtree(staging_root, ignore_errors=True)
+
+    # Stage: stream only the changed members, nothing else is extracted
+    import zipfile
+    try:
+        with zipfile.ZipFile(plan.archive_path) as archive:
+            for index, (relative, info) in enumerate(plan.changed):
+                staged = os.path.join(staging_root, relative)
+                os.makedirs(os.path.dirname(staged), exist_ok=True)
+                with archive.open(info) as source, open(staged, "wb") as out:
+                    shutil.copyfileobj(source, out, _COPY_CHUNK)
+                mode = (info.external_attr >> 16) & 0o777
+                if mode:
+                    os.chmod(staged, mode)
+                if progress is not None:
+                    progress(index + 1, steps)
+        os.makedirs(staging_root, exist_ok=True) # A release that only removes files stages nothing else
+        with open(os.path.join(staging_root, INSTALLED), "w") as f:
+            json.dump(sorted(plan.shipped), f, indent=0)
+    except BaseException:
+        shutil.rmtree(staging_root, ignore_errors=True)
+        raise
+
+    # Swap: the previous backup is replaced by this update's
+    shutil.rmtree(backup_root, ignore_errors=True)
+    swapped = []
+    try:
+        for index, relative in enumerate(swaps):
+            target = os.path.join(target_dir, relative)
+            had_old = os.path.exists(target)
+            swapped.append([relative, had_old])
+            _write_journal(target_dir, swapped) # Journal first, so a crash can always be undone
+            if had_old:
+                backup = os.path.join(backup_root, relative)
+                os.makedirs(os.path.dirname(backup), exist_ok=True)
+                os.replace(target, backup)
+            elif relative not in removed:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+            if relative not in removed: # A removed file only goes into the backup
+                os.replace(os.path.join(staging_root, relative), target)
+            if progress is not None:
+                progress(len(plan.changed) + index + 1, steps)
+    except BaseException:
+        log.error(f"Update failed after {len(swapped)} of {len(swaps)} swaps; rolling back.")
+        _restore(target_dir, swapped)
+        shutil.rmtree(backup_root, ignore_errors=True)
+        _remove_quietly(os.path.join(target_dir, JOURNAL))
+        _remove_quietly(os.path.join(target_dir, JOURNAL + ".tmp"))
+        raise
+    finally:
+        shutil.rmtree(staging_root, ignore_errors=True)
+
+    # Commit: the journal becomes the backup's manifest, for rollback_update()
+    os.replace(os.path.join(target_dir, JOURNAL), os.path.join(backup_root, "manifest.json"))
+    _fsync_dir(target_dir)
+    log.info(f"Installed update: {plan.describe()}")
+    return total
+
+
+def rollback_update(target_dir):
+    """Restores the files replaced by the last installed update; returns how many were restored."""
+    backup_root = os.path.join(target_dir, BACKUP_DIR)
+    manifest = os.path.join(backup_root, "manifest.json")
+    if not os.path.exists(manifest):
+        raise UpdateError("No installed update to roll back.")
+    with open(manifest) as f:
+        entries = json.load(f)
+    _restore(target_dir, entries)
+    shutil.rmtree(backup_root, ignore_errors=True)
+    return _file_count(entries)
+
+
+def recover_interrupted_install(target_dir):
+    """Rolls back a swap that was cut short (e.g. by a crash); returns the files restored."""
+    journal = os.path.join(target_dir, JOURNAL)
+    if not os.path.exists(journal):
+        return 0
+    with open(journal) as f:
+        entries = json.load(f)
+    _restore(target_dir, entries)
+    os.remove(journal)
+    _remove_quietly(journal + ".tmp")
+    shutil.rmtree(os.path.join(target_dir, BACKUP_DIR), ignore_errors=True)
+    shutil.rmtree(os.path.join(target_dir, STAGING_DIR), ignore_errors=True)
+    restored = _file_count(entries)
+    log.warning(f"Rolled back an interrupted update ({restored} file(s) restored).")
+    return restored
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "rollback":
+        print(f"Restored {rollback_update(sys.argv[2])} file(s).")
+    elif len(sys.argv) == 4 and sys.argv[1] in ("plan", "apply"):
+        update_plan = plan_update(sys.argv[2], sys.argv[3])
+        print(update_plan.describe())
+        if sys.argv[1] == "apply":
+            apply_update(update_plan)
+    else:
+        print("Usage: python -m tinytask.installer plan|apply <archive.zip> <install dir>\n"
+              "       python -m tinytask.installer rollback <install dir>")
+        sys.exit(2)
@@ -0,0 +1,163 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Incremental reader for legacy JSON macros.
+
+The file is read in fixed-size chunks and the top-level array is decoded
+one element at a time with the json module's scanner, so each event is
+validated and handed out as soon as it has been read: no full parse tree,
+and no second validation pass before playback can begin.
+"""
+import json
+import re
+
+from .events import TYPE_CODES, MOUSE_MOVE, MOUSE_CLICK, MOUSE_SCROLL
+from .macrofile import MacroFormatError
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# What can follow the decoder's error position when the element was only cut off by the
+# end of the buffer: nothing, part of a number, literal or \u escape, or an open string
+_CUT_OFF = re.compile(r'[-+.\w]*|"(?:[^"\\]|\\.)*\\?', re.S)
+# Fields each event type needs besides "type" and "time"
+_REQUIRED_FIELDS = {
+    MOUSE_MOVE: ("x", "y"),
+    MOUSE_CLICK: ("x", "y", "button", "pressed"),
+    MOUSE_SCROLL: ("x", "y", "dx", "dy"),
+}
+_KEY_FIELDS = ("key",)
+# Coordinates and scroll amounts are stored in array('i') columns
+_INT32_MIN, _INT32_MAX = -(1 << 31), (1 << 31) - 1
+
+
+def _is_coordinate(value):
+    kind = type(value)
+    # bool is rejected; NaN and infinities fail the range check
+    return (kind is int or kind is float) and _INT32_MIN <= value <= _INT32_MAX
+
+
+def _is_name(value):
+    return value is None or type(value) is str
+
+
+def _is_flag(value):
+    return value is True or value is False
+
+
+_FIELD_CHECKS = {"x": _is_coordinate, "y": _is_coordinate, "dx": _is_coordinate, "dy": _is_coordinate,
+                 "button": _is_name, "key": _is_name, "pressed": _is_flag}
+
+
+def validate_event(event, index=None):
+    """Raises MacroFormatError unless `event` is a well-formed legacy event dict."""
+    where = f"Event {index}" if index is not None else "Event"
+    if type(event) is not dict:
+        raise MacroFormatError(f"{where} is not an object.")
+    code = TYPE_CODES.get(event.get("type"))
+    if code is None:
+        raise MacroFormatError(f"{where} has an unknown or missing type: {event.get('type')!r}.")
+    timestamp_type = type(event.get("time"))
+    if timestamp_type is not float and timestamp_type is not int: # bool is rejected too
+        raise MacroFormatError(f"{where} has an invalid or missing time.")
+    for field in _REQUIRED_FIELDS.get(code, _KEY_FIELDS):
+        if field not in event:
+            raise MacroFormatError(f"{where} ({event['type']}) is missing '{field}'.")
+        if not _FIELD_CHECKS[field](event[field]):
+            raise MacroFormatError(f"{where} ({event['type']}) has an invalid '{field}': {event[field]!r}.")
+    return code
+
+
+def iter_json_events(f, chunk_size=CHUNK_SIZE):
+    """Yields validated event dicts from an open text file holding a JSON array.
+
+    Decode errors carry the position in the file, like json.load()'s.
+    """
+    scan_once = json.JSONDecoder().scan_once
+    skip_whitespace = _WHITESPACE.match
+    buf = f.read(chunk_size)
+    pos = 0
+    eof = not buf
+    base = newlines = line_start = 0 # Offset of buf in the file; lines and last line start before it
+
+    def advance(text):
+        # Drops buf[:pos] (already decoded) and appends the next chunk of the file
+        nonlocal buf, pos, eof, base, newlines, line_start
+        last = buf.rfind("\n", 0, pos)
+        if last >= 0:
+            newlines += buf.count("\n", 0, pos)
+            line_start = base + last + 1
+        base += pos
+        buf, pos = buf[pos:] + text, 0
+        eof = not text
+
+    def error(message, at):
+        # A JSONDecodeError for buf[at], positioned in the whole file
+        e = json.JSONDecodeError(message, buf, at)
+        last = buf.rfind("\n", 0, at)
+        e.pos = base + at
+        e.lineno = newlines + buf.count("\n", 0, at) + 1
+        e.colno = at - last if last >= 0 else e.pos - line_start + 1
+        e.args = (f"{message}: line {e.lineno} column {e.colno} (char {e.pos})",)
+        return e
+
+    def end_of_array():
+        # Only whitespace may follow the closing bracket, as with json.load()
+        nonlocal pos
+        pos += 1
+        if next_char():
+            raise error("Extra data", pos)
+
+    def next_char():
+        # Skips whitespace (reading more as needed); returns '' at end of file
+        nonlocal pos
+        while True:
+            pos = skip_whitespace(buf, pos).end()
+            if pos < len(buf) or eof:
+                return buf[pos:pos + 1]
+            pos = len(buf)
+            advance(f.read(chunk_size))
+
+    first = next_char()
+    if first != "[":
+        if not first:
+            raise error("Expecting value", pos)
+        raise MacroFormatError("Expected a JSON list of events.")
+    pos += 1
+    if next_char() == "]":
+        end_of_array()
+        return
+    index = 0
+    while True:
+        try:
+            event, pos = scan_once(buf, pos)
+        except StopIteration as e:
+            failed_at, message = e.value, "Expecting value"
+        except json.JSONDecodeError as e:
+            failed_at, message = e.pos, e.msg
+        else:
+            validate_event(event, index)
+            yield event
+            index += 1
+            separator = next_char()
+            if separator == ",":
+                pos += 1
+                next_char() # scan_once() does not skip leading whitespace itself
+            elif separator == "]":
+                end_of_array()
+                return
+            else:
+                raise error("Expecting ',' delimiter", pos)
+            continue
+        # Only an element cut off at the end of the chunk is retried with more data;
+        # anything else is malformed and fails now instead of after the rest of the file
+        if eof or not _CUT_OFF.fullmatch(buf, failed_at):
+            raise error(message, failed_at)
+        advance(f.read(chunk_size))
+
+
+def load_json_events(path, store):
+    """Appends every event of a JSON macro file to `store` as it is parsed; returns the store."""
+    append = store.append
+    with open(path, "r") as f:
+        for event in iter_json_events(f):
+            append(event)
+    return store
@@ -0,0 +1,61 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Non-blocking console logging for the recorder and playback threads.
+
+Log calls only put a record on an in-memory queue; a QueueListener thread
+does the actual terminal I/O. Listener callbacks and the timed playback
+loop therefore never wait on stdout. Per-event tracing ([REC]/[PLAY] lines)
+uses the TRACE level and is off by default: enable it with
+setup_logging(trace=True) or TINYTASK_TRACE=1.
+"""
+import atexit
+import logging
+import os
+import queue
+import sys
+
+TRACE = 5
+logging.addLevelName(TRACE, "TRACE")
+
+ROOT_LOGGER = "tinytask"
+
+_listener = None
+_handler = None
+
+
+def get_logger(name=None):
+    return logging.getLogger(ROOT_LOGGER if not name else f"{ROOT_LOGGER}.{name}")
+
+
+def setup_logging(level=logging.INFO, trace=None, stream=None):
+    """Routes the 'tinytask' loggers through a queue drained on a background thread.
+
+    Safe to call more than once; later calls only change the level.
+    """
+    global _listener, _handler
+    if trace is None:
+        trace = os.environ.get("TINYTASK_TRACE", "") not in ("", "0")
+    root = get_logger()
+    root.setLevel(TRACE if trace else level)
+    if _listener is not None:
+        return root
+
+    import logging.handlers # Pulls in socket and pickle; only needed once logging is set up
+    console = logging.StreamHandler(stream if stream is not None else sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    log_queue = queue.SimpleQueue() # Unbounded, so put() never blocks
+    _listener = logging.handlers.QueueListener(log_queue, console, respect_handler_level=True)
+    _listener.start()
+    _handler = logging.handlers.QueueHandler(log_queue)
+    root.addHandler(_handler)
+    root.propagate = False
+    atexit.register(shutdown_logging) # Flush whatever is still queued on exit
+    return root
+
+
+def shutdown_logging():
+    """Drains the queue and stops the background logging thread."""
+    global _listener, _handler
+    if _listener is not None:
+        get_logger().removeHandler(_handler)
+        _listener.stop()
+        _listener = _handler = None
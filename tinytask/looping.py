@@ -0,0 +1,108 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Repeat playback: N iterations, until a time limit, or forever.
+
+The compiled plan (or a MacroLoader's retained chunks) is replayed as-is
+every iteration, with nothing reloaded or re-parsed. Each iteration gets a
+fresh scheduler epoch, and anything the macro left held down is released
+before the next one starts. Per-iteration wall time, drift and injection
+counts go into LoopStats.
+"""
+import time
+from array import array
+
+from .injectors import HeldInputTracker
+from .player import play_plans
+from .scheduler import DeadlineScheduler, LatenessStats
+from .timewarp import TimeWarp
+
+FOREVER = None
+
+
+class LoopStats:
+    """Per-iteration metrics, one entry per finished (or cancelled) iteration.
+
+    wall_s    - wall-clock time the iteration took
+    drift_s   - wall time minus the (warped) macro duration; 0 when not paced
+    actions   - actions scheduled in the iteration
+    timing    - lateness over all iterations (empty at "as fast as possible")
+    completed - False if the loop was cancelled
+    """
+
+    def __init__(self):
+        self.wall_s = array('d')
+        self.drift_s = array('d')
+        self.actions = array('q')
+        self.recorded_s = 0.0 # recorded macro time covered, for the speed-up figure
+        self.released = 0 # held keys/buttons released between iterations
+        self.timing = LatenessStats()
+        self.completed = True
+
+    def add(self, wall_s, drift_s, actions, recorded_s=0.0, lateness=None):
+        self.wall_s.append(wall_s)
+        self.drift_s.append(drift_s)
+        self.actions.append(actions)
+        self.recorded_s += recorded_s
+        if lateness is not None:
+            self.timing.merge(lateness)
+
+    @property
+    def iterations(self):
+        return len(self.wall_s)
+
+    def summary(self):
+        if not self.iterations:
+            return "no iterations played"
+        total_s = max(sum(self.wall_s), 1e-9)
+        actions = sum(self.actions)
+        text = (f"{self.iterations} iteration(s), {actions} actions in {total_s:.2f} s "
+                f"({actions / total_s:,.0f} actions/s, {self.recorded_s / total_s:.1f}x recorded speed), "
+                f"mean {total_s / self.iterations:.3f} s/iteration")
+        if self.timing.count:
+            text += f", max drift {max(self.drift_s) * 1e3:.1f} ms"
+        return text
+
+
+def play_loop(source, injector, iterations=1, max_seconds=None, warp=None, realtime=True,
+              is_cancelled=None, trace=None, on_iteration=None, telemetry=None):
+    """Plays `source` repeatedly; returns LoopStats.
+
+    source:       a PlaybackPlan, or anything with plans(is_cancelled) such as a MacroLoader
+    iterations:   number of runs, or FOREVER
+    max_seconds:  no new iteration starts after this much time (the current one finishes)
+    warp:         TimeWarp applied to every iteration (default: recorded speed)
+    realtime:     False plays without waiting for deadlines
+    on_iteration: optional callable(index, stats) called after each iteration
+    telemetry:    optional PlaybackTelemetry collecting per-event timing over all iterations
+    """
+    stats = LoopStats()
+    held = HeldInputTracker(injector)
+    warp = warp if warp is not None else TimeWarp()
+    loop_started = time.perf_counter()
+    index = 0
+    try:
+        while iterations is FOREVER or index < iterations:
+            if max_seconds is not None and time.perf_counter() - loop_started >= max_seconds:
+                break
+            if is_cancelled is not None and is_cancelled():
+                stats.completed = False
+                break
+            plans = source.plans(is_cancelled) if hasattr(source, "plans") else (source,)
+            warp.reset()
+            scheduler = DeadlineScheduler() if realtime and not warp.as_fast_as_possible else None
+            started = time.perf_counter()
+            finished = play_plans(map(warp.apply, plans), held, scheduler, is_cancelled, trace, telemetry)
+            stats.released += held.release_all()
+            wall_s = time.perf_counter() - started
+            if scheduler is not None:
+                stats.add(wall_s, wall_s - warp.duration, warp.steps, warp.source_duration, scheduler.stats)
+            else:
+                stats.add(wall_s, 0.0, warp.steps, warp.source_duration)
+            if on_iteration is not None:
+                on_iteration(index, stats)
+            index += 1
+            if not finished:
+                stats.completed = False
+                break
+    finally:
+        stats.released += held.release_all() # Never leave keys or buttons stuck, even on errors
+    return stats
@@ -0,0 +1,338 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Binary macro files (.ttm) plus the legacy JSON format.
+
+Compressed containers (.ttz) live in tinytask/packed.py.
+
+Layout of a .ttm file (all little-endian):
+  header        32 bytes, see HEADER
+  records       event_count fixed-width records, see RECORD
+  string table  u32 count, then per symbol a u16 length and UTF-8 bytes
+                (length 0xFFFF marks a key without a character, i.e. None)
+
+A record is (type, time, x, y, a, b), the same row layout as EventStore.
+
+save_macro() writes every format to a temporary file next to the target and
+renames it into place, so an interrupted save never leaves a half-written macro.
+"""
+import json
+import mmap
+import os
+import stat
+import struct
+import sys
+from contextlib import contextmanager
+
+from .events import EventStore, SymbolTable, TYPE_CODES, MOUSE_MOVE, MOUSE_CLICK, MOUSE_SCROLL, row_to_dict
+
+MAGIC = b"TTMACRO\0"
+FORMAT_VERSION = 1
+BINARY_EXTENSION = ".ttm"
+JSON_EXTENSION = ".json"
+
+# magic, version, header size, record size, reserved, event count, string table offset
+HEADER = struct.Struct("<8sHHHHQQ")
+# type, (padding), time, x, y, a, b
+RECORD = struct.Struct("<B3xdiiii")
+
+_NONE_SYMBOL = 0xFFFF
+SAVE_CHUNK_EVENTS = 4096 # Events written between progress callbacks
+
+
+class MacroFormatError(ValueError):
+    """Raised when a macro file is truncated, corrupt or of an unknown version."""
+
+
+# --- Writing ---
+
+class MacroWriter:
+    """Streams events to a .ttm file; the header is patched in on close()."""
+
+    def __init__(self, path):
+        self.path = path
+        self.symbols = SymbolTable()
+        self.count = 0
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, HEADER.size, RECORD.size, 0, 0, 0))
+
+    def write_row(self, code, timestamp, x, y, a, b):
+        """Writes one row whose symbol ids refer to self.symbols."""
+        self._file.write(RECORD.pack(code, timestamp, x, y, a, b))
+        self.count += 1
+
+    def write_event(self, event):
+        """Writes one event given in the legacy dict form."""
+        code = TYPE_CODES[event["type"]]
+        if code == MOUSE_MOVE:
+            self.write_row(code, event["time"], int(event["x"]), int(event["y"]), 0, 0)
+        elif code == MOUSE_CLICK:
+            self.write_row(code, event["time"], int(event["x"]), int(event["y"]),
+                           self.symbols.intern(event["button"]), 1 if event["pressed"] else 0)
+        elif code == MOUSE_SCROLL:
+            self.write_row(code, event["time"], int(event["x"]), int(event["y"]),
+                           int(event["dx"]), int(event["dy"]))
+        else:
+            self.write_row(code, event["time"], 0, 0, self.symbols.intern(event["key"]), 0)
+
+    def write_store(self, store, progress=None):
+        """Writes every row of an EventStore (or anything with rows() and symbols).
+
+        progress: optional callable(done, total) called after each chunk of rows
+        """
+        remap = [self.symbols.intern(symbol) for symbol in store.symbols.symbols]
+        identity = remap == list(range(len(remap)))
+        pack = RECORD.pack
+        total = len(store)
+        chunk = []
+        done = 0
+        for code, timestamp, x, y, a, b in store.rows():
+            if not identity and code != MOUSE_MOVE and code != MOUSE_SCROLL: # clicks and keys carry a symbol id
+                a = remap[a]
+            chunk.append(pack(code, timestamp, x, y, a, b))
+            if len(chunk) >= SAVE_CHUNK_EVENTS:
+                self._file.write(b"".join(chunk))
+                done += len(chunk)
+                chunk = []
+                if progress is not None:
+                    progress(done, total)
+        self._file.write(b"".join(chunk))
+        self.count += total
+        if progress is not None:
+            progress(total, total)
+
+    def close(self):
+        if self._file.closed:
+            return
+        strings_offset = self._file.tell()
+        parts = [struct.pack("<I", len(self.symbols))]
+        for symbol in self.symbols.symbols:
+            if symbol is None:
+                parts.append(struct.pack("<H", _NONE_SYMBOL))
+            else:
+                encoded = symbol.encode("utf-8")
+                parts.append(struct.pack("<H", len(encoded)))
+                parts.append(encoded)
+        self._file.write(b"".join(parts))
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, HEADER.size, RECORD.size, 0,
+                                     self.count, strings_offset))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# --- Reading ---
+
+class MacroReader:
+    """Memory-mapped view of a .ttm file.
+
+    Only the header and string table are parsed on open; records are decoded
+    as they are iterated, so playback can start straight away. Exposes the
+    same read API as EventStore (rows, row, symbols, len, iteration).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise MacroFormatError(f"'{path}' is too small to be a macro file.")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, header_size, record_size, _, count, strings_offset = HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC:
+                raise MacroFormatError(f"'{path}' is not a TinyTask macro file.")
+            if version > FORMAT_VERSION:
+                raise MacroFormatError(f"'{path}' uses format version {version}; this build reads up to {FORMAT_VERSION}.")
+            if record_size != RECORD.size or header_size + count * record_size > strings_offset or strings_offset > size:
+                raise MacroFormatError(f"'{path}' is truncated or corrupt.")
+            self.count = count
+            self._start = header_size
+            self.symbols = self._read_symbols(strings_offset)
+        except BaseException:
+            self._mmap.close() # A rejected file must not stay mapped (on Windows that also keeps it locked)
+            raise
+
+    def _read_symbols(self, offset):
+        data = self._mmap
+        try:
+            (count,) = struct.unpack_from("<I", data, offset)
+            offset += 4
+            symbols = SymbolTable()
+            for _ in range(count):
+                (length,) = struct.unpack_from("<H", data, offset)
+                offset += 2
+                if length == _NONE_SYMBOL:
+                    symbols.intern(None)
+                    continue
+                if offset + length > len(data): # Slicing the mmap would quietly return less
+                    raise struct.error(f"symbol of {length} bytes runs past the end of the file")
+                symbols.intern(bytes(data[offset:offset + length]).decode("utf-8"))
+                offset += length
+        except (struct.error, UnicodeDecodeError) as e:
+            raise MacroFormatError(f"'{self.path}' has a corrupt string table: {e}")
+        return symbols
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def row(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("event index out of range")
+        return RECORD.unpack_from(self._mmap, self._start + index * RECORD.size)
+
+    def rows(self, start=0, stop=None):
+        stop = self.count if stop is None else min(stop, self.count)
+        begin = self._start + start * RECORD.size
+        end = self._start + stop * RECORD.size
+        return RECORD.iter_unpack(memoryview(self._mmap)[begin:end])
+
+    def event_at(self, index):
+        return row_to_dict(self.symbols, *self.row(index))
+
+    def __getitem__(self, index):
+        return self.event_at(index)
+
+    def __iter__(self):
+        symbols = self.symbols
+        for row in self.rows():
+            yield row_to_dict(symbols, *row)
+
+    def to_dicts(self):
+        return list(self)
+
+    def to_store(self):
+        """Copies the whole file into an in-memory EventStore."""
+        store = EventStore(SymbolTable(self.symbols.symbols))
+        for row in self.rows():
+            store._append_row(*row)
+        return store
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# --- Format dispatch and conversion ---
+
+def is_binary_macro(path):
+    return path.lower().endswith(BINARY_EXTENSION)
+
+
+def is_packed_macro(path):
+    return path.lower().endswith(".ttz")
+
+
+@contextmanager
+def atomic_path(path):
+    """Yields a temporary path next to `path`; it replaces `path` only if the block succeeds."""
+    import tempfile # Only needed when saving; keeps it (and random, shutil...) off the startup path
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    os.close(fd)
+    try:
+        yield tmp_path
+        with open(tmp_path, "rb+") as f:
+            os.fsync(f.fileno()) # Data on disk before the rename makes it visible
+        # mkstemp creates the file private; keep the old file's mode or use the usual default
+        mode = stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_json(f, events, progress):
+    """Writes the same text as json.dump(events.to_dicts(), f, indent=4), a chunk of events at a time."""
+    total = len(events)
+    if not total:
+        f.write("[]")
+        return
+    symbols = events.symbols
+    f.write("[\n")
+    for start in range(0, total, SAVE_CHUNK_EVENTS):
+        stop = min(start + SAVE_CHUNK_EVENTS, total)
+        text = json.dumps([row_to_dict(symbols, *row) for row in events.rows(start, stop)], indent=4)
+        if start:
+            f.write(",\n")
+        f.write(text[2:-2]) # Drop the chunk's own "[\n" and "\n]"
+        if progress is not None:
+            progress(stop, total)
+    f.write("\n]")
+
+
+def save_macro(path, events, progress=None):
+    """Saves an EventStore (or MacroReader) as .ttm, compressed .ttz or legacy JSON, picked by extension.
+
+    progress: optional callable(done, total) called as events are written
+    """
+    with atomic_path(path) as tmp_path:
+        if is_packed_macro(path):
+            from .packed import save_packed
+            save_packed(tmp_path, events, progress=progress)
+        elif is_binary_macro(path):
+            with MacroWriter(tmp_path) as writer:
+                writer.write_store(events, progress)
+        else:
+            with open(tmp_path, "w") as f:
+                _write_json(f, events, progress)
+
+
+def load_macro(path):
+    """Loads a macro file. .ttm files are memory-mapped; JSON is parsed into an EventStore.
+
+    Compressed .ttz containers are decompressed block by block. Recording logs
+    (.ttlog), including ones cut short by a crash, are recovered.
+    """
+    if is_binary_macro(path):
+        return MacroReader(path)
+    if is_packed_macro(path):
+        from .packed import load_packed
+        return load_packed(path)
+    if path.lower().endswith(".ttlog"):
+        from .streamlog import recover_log
+        return recover_log(path)
+    # Legacy JSON is parsed incrementally, validating each event as it is read
+    from .jsonstream import load_json_events
+    try:
+        return load_json_events(path, EventStore())
+    except json.JSONDecodeError:
+        raise
+    except (KeyError, TypeError, ValueError) as e: # MacroFormatError is a ValueError too
+        raise MacroFormatError(f"Invalid event format in '{path}': {e}")
+
+
+def convert_macro(src, dst):
+    """Converts between JSON, .ttm and .ttz macro files, based on the file extensions."""
+    events = load_macro(src)
+    try:
+        save_macro(dst, events)
+    finally:
+        if isinstance(events, MacroReader):
+            events.close()
+    return len(events)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m tinytask.macrofile <source.json|.ttm|.ttz> <destination.json|.ttm|.ttz>")
+        sys.exit(2)
+    converted = convert_macro(sys.argv[1], sys.argv[2])
+    print(f"Converted {converted} events from '{sys.argv[1]}' to '{sys.argv[2]}'.")
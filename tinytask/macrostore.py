@@ -0,0 +1,133 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""The macro a front-end is working with: its events, their compiled plan,
+and a background load in progress (if any).
+
+Recording, loading and saving all go through one MacroStore, and a Player
+plays whatever it currently holds, so the CLI and the GUI only decide what
+to show. Each instance is independent; nothing here is module-level state.
+"""
+import json
+import threading
+
+from .events import EventStore
+from .macrofile import MacroFormatError, MacroReader, load_macro, save_macro
+from .pipeline import MacroLoader
+from .plan import compile_plan
+
+
+def _release(events):
+    # A memory-mapped .ttm holds an mmap (and its file) open until closed
+    if isinstance(events, MacroReader):
+        events.close()
+
+
+def describe_load_error(path, error):
+    """One-line message for a failed load_macro()/MacroLoader."""
+    if isinstance(error, MacroFormatError):
+        return f"Error: {error}"
+    if isinstance(error, FileNotFoundError):
+        return f"Error: File '{path}' not found. Please record a macro first."
+    if isinstance(error, json.JSONDecodeError):
+        return f"Error: Invalid JSON format in '{path}'."
+    return f"An unexpected error occurred while loading '{path}': {error}"
+
+
+class MacroStore:
+    """Holds one macro and keeps its PlaybackPlan in step with its events.
+
+    move_quantum: moves closer together than this are merged when compiling (see coalesce_moves)
+
+    Events that get replaced are closed if they are a memory-mapped MacroReader,
+    once no save() is still writing them out.
+    """
+
+    __slots__ = ("events", "plan", "path", "loader", "move_quantum", "_saving", "_lock")
+
+    def __init__(self, move_quantum=None):
+        self.events = EventStore()
+        self.plan = None # Compiled once per recording/load, outside the timed playback loop
+        self.path = None # File the events were loaded from, if any
+        self.loader = None # MacroLoader while a load is in progress
+        self.move_quantum = move_quantum
+        self._saving = [] # Events save() is writing out right now
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.events)
+
+    @property
+    def is_loading(self):
+        return self.loader is not None
+
+    @property
+    def playable(self):
+        """True if there is something to play (a load in progress can be played as it arrives)."""
+        return bool(self.events) or self.loader is not None
+
+    @property
+    def source(self):
+        """What play_loop() should play: the loader while loading, otherwise the compiled plan."""
+        loader = self.loader
+        return loader if loader is not None else self.plan
+
+    def expected_steps(self, iterations=1):
+        """Steps a run of `iterations` will inject, or 0 while the length isn't known yet."""
+        if self.loader is not None or self.plan is None:
+            return 0
+        return len(self.plan) * (iterations or 1)
+
+    def _replace(self, events, plan, path):
+        with self._lock:
+            old = self.events
+            self.events, self.plan, self.path = events, plan, path
+            if old is events or old in self._saving:
+                return # save() closes it when it's done
+        _release(old)
+
+    def set_events(self, events, path=None):
+        """Replaces the macro (e.g. with a fresh recording) and compiles its plan."""
+        plan = compile_plan(events, self.move_quantum)
+        self._replace(events, plan, path)
+        return plan
+
+    def load(self, path):
+        """Loads a macro file of any format; raises what load_macro() raises."""
+        events = load_macro(path)
+        try:
+            return self.set_events(events, path)
+        except BaseException:
+            _release(events)
+            raise
+
+    def load_async(self, path, on_done=None):
+        """Loads on a background thread; playback can start before it finishes.
+
+        on_done(loader) runs on the loader thread once the store has been updated
+        (check loader.error). Returns the loader, or the one already running.
+        """
+        if self.loader is not None:
+            return self.loader
+        def finished(loader):
+            if loader.error is None:
+                self._replace(loader.events, loader.plan, loader.path)
+            self.loader = None
+            if on_done is not None:
+                on_done(loader)
+        # Published before the thread starts, so a load that finishes at once can't be left marked as running
+        loader = self.loader = MacroLoader(path, on_done=finished, move_quantum=self.move_quantum)
+        return loader.start()
+
+    def save(self, path, progress=None):
+        """Writes the current events (format by extension); the file is replaced atomically."""
+        with self._lock:
+            events = self.events # A recording finishing meanwhile replaces self.events, not this one
+            self._saving.append(events)
+        try:
+            save_macro(path, events, progress=progress)
+            return len(events)
+        finally:
+            with self._lock:
+                self._saving.remove(events)
+                retired = events is not self.events and events not in self._saving
+            if retired:
+                _release(events)
@@ -0,0 +1,231 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Compressed macro container (.ttz) for storing and shipping macros.
+
+Events are cut into blocks of `block_events` rows. Each block is encoded
+column by column (type bytes, then time, x, y, a and b columns) with
+timestamps as microsecond deltas and everything else as zigzag varints
+(x/y as deltas from the previous mouse event; key events store no x/y).
+The block is then compressed on its own with zlib or lzma, and carries
+its own symbol table, so a reader can decode and play blocks one at a time.
+Timestamps are kept at microsecond resolution.
+
+Layout (all little-endian):
+  header  PACK_HEADER (magic, version, codec, block size)
+  blocks  BLOCK_HEADER (compressed length, raw length, event count, CRC32 of
+          the compressed bytes), then the compressed block
+"""
+import lzma
+import struct
+import zlib
+from array import array
+
+from .events import EventStore, SymbolTable, MOUSE_MOVE, MOUSE_CLICK, MOUSE_SCROLL
+from .macrofile import MacroFormatError
+
+PACKED_EXTENSION = ".ttz"
+PACK_MAGIC = b"TTPACK\0\0"
+PACK_VERSION = 1
+# magic, version, codec id, reserved, events per block
+PACK_HEADER = struct.Struct("<8sHBBI")
+# compressed length, raw length, event count, CRC32 of the compressed bytes
+BLOCK_HEADER = struct.Struct("<IIII")
+
+CODECS = {
+    "none": (0, lambda data, level: data, lambda data: data),
+    "zlib": (1, lambda data, level: zlib.compress(data, 6 if level is None else level), zlib.decompress),
+    "lzma": (2, lambda data, level: lzma.compress(data, preset=6 if level is None else level), lzma.decompress),
+}
+_DECOMPRESSORS = {codec_id: decompress for codec_id, _, decompress in CODECS.values()}
+
+DEFAULT_CODEC = "zlib"
+DEFAULT_BLOCK_EVENTS = 8192
+
+
+# --- Varints ---
+
+def _put_varint(out, value):
+    """Appends a signed int as a zigzag LEB128 varint."""
+    value = value << 1 if value >= 0 else (-value << 1) - 1
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varints(data, pos, count):
+    """Decodes `count` zigzag varints starting at `pos`; returns (values, new pos)."""
+    values = []
+    append = values.append
+    for _ in range(count):
+        byte = data[pos]
+        pos += 1
+        if byte < 0x80: # Fast path: most deltas fit in one byte
+            value = byte
+        else:
+            value = byte & 0x7F
+            shift = 7
+            while True:
+                byte = data[pos]
+                pos += 1
+                value |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+        append(value >> 1 if not value & 1 else -((value + 1) >> 1))
+    return values, pos
+
+
+def _is_mouse(code):
+    return code == MOUSE_MOVE or code == MOUSE_CLICK or code == MOUSE_SCROLL
+
+
+# --- Block encoding ---
+
+def _encode_block(rows, lookup):
+    """Encodes (type, time, x, y, a, b) rows whose symbol ids resolve through `lookup`."""
+    local = SymbolTable()
+    types = bytearray()
+    times, xs, ys, a_col, b_col = bytearray(), bytearray(), bytearray(), bytearray(), bytearray()
+    prev_us = prev_x = prev_y = 0
+    for code, timestamp, x, y, a, b in rows:
+        types.append(code)
+        micros = round(timestamp * 1_000_000)
+        _put_varint(times, micros - prev_us)
+        prev_us = micros
+        if _is_mouse(code):
+            _put_varint(xs, x - prev_x)
+            _put_varint(ys, y - prev_y)
+            prev_x, prev_y = x, y
+        if code != MOUSE_MOVE and code != MOUSE_SCROLL:
+            a = local.intern(lookup(a))
+        _put_varint(a_col, a)
+        _put_varint(b_col, b)
+
+    out = bytearray()
+    _put_varint(out, len(local))
+    for symbol in local.symbols:
+        if symbol is None:
+            _put_varint(out, -1)
+        else:
+            encoded = symbol.encode("utf-8")
+            _put_varint(out, len(encoded))
+            out += encoded
+    out += types
+    for column in (times, xs, ys, a_col, b_col):
+        _put_varint(out, len(column))
+        out += column
+    return bytes(out)
+
+
+def _decode_block(data, count):
+    """Rebuilds one block as an EventStore with its own symbol table."""
+    (symbol_count,), pos = _read_varints(data, 0, 1)
+    symbols = SymbolTable()
+    for _ in range(symbol_count):
+        (size,), pos = _read_varints(data, pos, 1)
+        if size < 0:
+            symbols.intern(None)
+        else:
+            symbols.intern(bytes(data[pos:pos + size]).decode("utf-8"))
+            pos += size
+    types = array('B', data[pos:pos + count])
+    pos += count
+    mouse_count = sum(1 for code in types if _is_mouse(code))
+
+    columns = []
+    for expected in (count, mouse_count, mouse_count, count, count):
+        (size,), pos = _read_varints(data, pos, 1)
+        values, end = _read_varints(data, pos, expected)
+        if end != pos + size:
+            raise ValueError("column length mismatch")
+        columns.append(values)
+        pos = end
+    time_deltas, dxs, dys, a_col, b_col = columns
+
+    store = EventStore(symbols)
+    store.types = types
+    store.a = array('i', a_col)
+    store.b = array('i', b_col)
+    micros = 0
+    times = store.times
+    for delta in time_deltas:
+        micros += delta
+        times.append(micros / 1_000_000)
+    x = y = 0
+    mouse = iter(zip(dxs, dys))
+    xs, ys = store.xs, store.ys
+    for code in types:
+        if _is_mouse(code):
+            dx, dy = next(mouse)
+            x += dx
+            y += dy
+            xs.append(x)
+            ys.append(y)
+        else:
+            xs.append(0)
+            ys.append(0)
+    return store
+
+
+# --- Files ---
+
+def save_packed(path, events, codec=DEFAULT_CODEC, block_events=DEFAULT_BLOCK_EVENTS, level=None, progress=None):
+    """Writes an EventStore (or MacroReader) to a compressed .ttz container.
+
+    progress: optional callable(done, total) called after each block
+    """
+    if codec not in CODECS:
+        raise MacroFormatError(f"Unknown codec '{codec}' (expected one of {', '.join(CODECS)}).")
+    codec_id, compress, _ = CODECS[codec]
+    lookup = events.symbols.lookup
+    total = len(events)
+    with open(path, "wb") as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, codec_id, 0, block_events))
+        for start in range(0, total, block_events):
+            stop = min(start + block_events, total)
+            raw = _encode_block(events.rows(start, stop), lookup)
+            packed = compress(raw, level)
+            f.write(BLOCK_HEADER.pack(len(packed), len(raw), stop - start, zlib.crc32(packed)))
+            f.write(packed)
+            if progress is not None:
+                progress(stop, total)
+
+
+def iter_packed_blocks(path):
+    """Yields one EventStore per block, decompressing each block only when it is reached."""
+    with open(path, "rb") as f:
+        header = f.read(PACK_HEADER.size)
+        if len(header) < PACK_HEADER.size:
+            raise MacroFormatError(f"'{path}' is too short to be a compressed macro.")
+        magic, version, codec_id, _, _ = PACK_HEADER.unpack(header)
+        if magic != PACK_MAGIC:
+            raise MacroFormatError(f"'{path}' is not a TinyTask compressed macro.")
+        if version != PACK_VERSION or codec_id not in _DECOMPRESSORS:
+            raise MacroFormatError(f"'{path}' uses an unsupported format (version {version}, codec {codec_id}).")
+        decompress = _DECOMPRESSORS[codec_id]
+        while True:
+            block_header = f.read(BLOCK_HEADER.size)
+            if not block_header:
+                return
+            if len(block_header) < BLOCK_HEADER.size:
+                raise MacroFormatError(f"'{path}' is truncated.")
+            packed_size, raw_size, count, checksum = BLOCK_HEADER.unpack(block_header)
+            packed = f.read(packed_size)
+            if len(packed) < packed_size or zlib.crc32(packed) != checksum:
+                raise MacroFormatError(f"'{path}' has a truncated or corrupt block.")
+            try:
+                raw = decompress(packed)
+                if len(raw) != raw_size:
+                    raise ValueError("unexpected block size")
+                yield _decode_block(memoryview(raw), count)
+            except (ValueError, IndexError, StopIteration, zlib.error, lzma.LZMAError) as e:
+                raise MacroFormatError(f"'{path}' has a corrupt block: {e}")
+
+
+def load_packed(path):
+    """Reads a whole .ttz container into a single EventStore."""
+    store = EventStore()
+    for block in iter_packed_blocks(path):
+        # Block symbol ids are local to the block: append_store maps them onto the merged table
+        store.append_store(block)
+    return store
@@ -0,0 +1,152 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Background macro loading that playback can consume while it is still running.
+
+A MacroLoader thread decodes the file in chunks (see iter_macro_chunks) and
+compiles each chunk into its own PlaybackPlan. play_plans(loader.plans(), ...)
+starts as soon as the first, deliberately small, chunk is ready, so the
+time to the first action does not depend on the size of the file.
+"""
+import json
+import threading
+
+from .events import EventStore
+from .macrofile import MacroFormatError, MacroReader, is_binary_macro, is_packed_macro
+from .plan import PlaybackPlan, compile_plan
+
+FIRST_CHUNK_EVENTS = 256
+DEFAULT_CHUNK_EVENTS = 8192
+
+
+def _chunk_sizes(chunk_events):
+    # Start small so playback can begin quickly, then grow to amortize per-chunk work
+    size = min(FIRST_CHUNK_EVENTS, chunk_events)
+    while True:
+        yield size
+        size = min(size * 2, chunk_events)
+
+
+def iter_macro_chunks(path, chunk_events=DEFAULT_CHUNK_EVENTS):
+    """Yields the events of any macro file as consecutive EventStores, decoding lazily."""
+    if is_packed_macro(path):
+        from .packed import iter_packed_blocks
+        yield from iter_packed_blocks(path)
+    elif is_binary_macro(path):
+        reader = MacroReader(path)
+        try:
+            start, total = 0, len(reader)
+            for size in _chunk_sizes(chunk_events):
+                if start >= total:
+                    break
+                chunk = EventStore(reader.symbols)
+                for row in reader.rows(start, start + size):
+                    chunk._append_row(*row)
+                start += size
+                yield chunk
+        finally:
+            reader.close()
+    elif path.lower().endswith(".ttlog"):
+        from .streamlog import read_log_chunks
+        for symbols, rows in read_log_chunks(path):
+            chunk = EventStore(symbols)
+            for row in rows:
+                chunk._append_row(*row)
+            yield chunk
+    else:
+        from .jsonstream import iter_json_events
+        sizes = _chunk_sizes(chunk_events)
+        size = next(sizes)
+        chunk = EventStore()
+        try:
+            with open(path, "r") as f:
+                for event in iter_json_events(f):
+                    chunk.append(event)
+                    if len(chunk) >= size:
+                        yield chunk
+                        chunk, size = EventStore(), next(sizes)
+        except json.JSONDecodeError:
+            raise
+        except (KeyError, TypeError, ValueError) as e: # Same as load_macro(): MacroFormatError is a ValueError too
+            raise MacroFormatError(f"Invalid event format in '{path}': {e}")
+        if chunk:
+            yield chunk
+
+
+class MacroLoader:
+    """Loads a macro file on a background thread, one compiled chunk at a time.
+
+    plans() hands the chunks to a consumer as they arrive, even if it attaches
+    mid-load. Once `loaded` is set, `events` holds the whole macro and `plan`
+    the whole compiled plan; `error` holds whatever stopped the load, if anything.
+    on_done, if given, is called from the loader thread when it finishes;
+    move_quantum is passed on to compile_plan().
+    """
+
+    def __init__(self, path, chunk_events=DEFAULT_CHUNK_EVENTS, on_done=None, move_quantum=None):
+        self.path = path
+        self.chunk_events = chunk_events
+        self.move_quantum = move_quantum
+        self.on_done = on_done
+        self.events = EventStore()
+        self.error = None
+        self.loaded = threading.Event()
+        self._chunks = []
+        self._plan = None
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="tinytask-macro-loader")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            for chunk in iter_macro_chunks(self.path, self.chunk_events):
+                plan = compile_plan(chunk, self.move_quantum)
+                self.events.append_store(chunk)
+                with self._cond:
+                    self._chunks.append(plan)
+                    self._cond.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            with self._cond:
+                self.loaded.set()
+                self._cond.notify_all()
+            if self.on_done is not None:
+                self.on_done(self)
+
+    def plans(self, is_cancelled=None, poll_interval=0.05):
+        """Yields compiled chunks in order, waiting for the loader as needed.
+
+        Stops early if is_cancelled() turns true while waiting; re-raises the
+        loader's error once every chunk decoded before it has been handed out.
+        """
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self._chunks) and not self.loaded.is_set():
+                    if is_cancelled is not None and is_cancelled():
+                        return
+                    self._cond.wait(poll_interval)
+                if index >= len(self._chunks):
+                    if self.error is not None:
+                        raise self.error
+                    return
+                plan = self._chunks[index]
+            index += 1
+            yield plan
+
+    @property
+    def plan(self):
+        """The whole PlaybackPlan; only valid once loading has finished."""
+        if self._plan is None:
+            self._plan = PlaybackPlan()
+            for chunk in self._chunks:
+                self._plan.extend(chunk)
+        return self._plan
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
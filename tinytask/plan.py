@@ -0,0 +1,167 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Compiles recorded events into a flat playback plan.
+
+All the per-event string work that used to happen inside the timed playback
+loop (event type comparisons, "Button.left" -> "left", "Key.ctrl_l" ->
+"ctrl_l", int() of scroll amounts) is done once here. Names are normalized
+per unique symbol, not per event, and the plan is stored column-wise like
+the EventStore it is compiled from.
+"""
+from array import array
+
+from .events import MOUSE_MOVE, MOUSE_CLICK, MOUSE_SCROLL, KEY_PRESS, KEY_RELEASE
+
+# --- Action Opcodes ---
+OP_MOVE = 0
+OP_MOUSE_DOWN = 1
+OP_MOUSE_UP = 2
+OP_SCROLL = 3
+OP_KEY_DOWN = 4
+OP_KEY_UP = 5
+
+OP_NAMES = ("move", "mouse_down", "mouse_up", "scroll", "key_down", "key_up")
+# Opcodes whose arg is an index into PlaybackPlan.names
+_NAMED_OPS = frozenset((OP_MOUSE_DOWN, OP_MOUSE_UP, OP_KEY_DOWN, OP_KEY_UP))
+
+
+def normalize_button(name):
+    """'Button.left' (pynput) -> 'left' (pyautogui)."""
+    return name.replace("Button.", "").lower()
+
+
+def normalize_key(name):
+    """'Key.ctrl_l' (pynput) -> 'ctrl_l' (pyautogui); characters pass through."""
+    if name is None:
+        return None
+    if name.startswith('Key.'):
+        return name.split('Key.')[1].lower()
+    return name
+
+
+class PlaybackPlan:
+    """Column-wise list of pre-resolved actions.
+
+    Each step is (time, opcode, x, y, arg): arg is the scroll amount for
+    OP_SCROLL and an index into `names` for button and key opcodes.
+    """
+
+    def __init__(self):
+        self.times = array('d')
+        self.ops = array('B')
+        self.xs = array('i')
+        self.ys = array('i')
+        self.args = array('i')
+        self.names = []
+        self.skipped = 0 # events that can't be replayed (e.g. keys without a character)
+        self.coalesced = 0 # moves merged away by coalesce_moves()
+
+    def __len__(self):
+        return len(self.ops)
+
+    def __bool__(self):
+        return len(self.ops) > 0
+
+    def steps(self, start=0):
+        if start:
+            return zip(self.times[start:], self.ops[start:], self.xs[start:], self.ys[start:], self.args[start:])
+        return zip(self.times, self.ops, self.xs, self.ys, self.args)
+
+    def extend(self, other):
+        """Appends another plan's steps (e.g. the next chunk of a macro that is still loading)."""
+        offset = len(self.names)
+        self.names.extend(other.names)
+        args = self.args
+        for op, arg in zip(other.ops, other.args):
+            args.append(arg + offset if op in _NAMED_OPS else arg)
+        self.times.extend(other.times)
+        self.ops.extend(other.ops)
+        self.xs.extend(other.xs)
+        self.ys.extend(other.ys)
+        self.skipped += other.skipped
+        self.coalesced += other.coalesced
+
+    @property
+    def duration(self):
+        return self.times[-1] if self.times else 0.0
+
+
+def compile_plan(events, move_quantum=None):
+    """Builds a PlaybackPlan from an EventStore or MacroReader.
+
+    With move_quantum (seconds), runs of moves are coalesced, see coalesce_moves().
+    """
+    plan = PlaybackPlan()
+    # Normalize every distinct symbol once; the plan refers to them by index
+    plan.names = [normalize_key(symbol) if symbol is None or not symbol.startswith("Button.")
+                  else normalize_button(symbol) for symbol in events.symbols.symbols]
+    times, ops, xs, ys, args = plan.times, plan.ops, plan.xs, plan.ys, plan.args
+    names = plan.names
+    for code, timestamp, x, y, a, b in events.rows():
+        if code == MOUSE_MOVE:
+            op, arg = OP_MOVE, 0
+        elif code == MOUSE_CLICK:
+            op, arg = (OP_MOUSE_DOWN if b else OP_MOUSE_UP), a
+        elif code == MOUSE_SCROLL:
+            op, arg = OP_SCROLL, b # vertical amount; pyautogui.scroll only takes dy
+        elif names[a] is None:
+            plan.skipped += 1
+            continue
+        elif code == KEY_PRESS:
+            op, arg = OP_KEY_DOWN, a
+        elif code == KEY_RELEASE:
+            op, arg = OP_KEY_UP, a
+        else:
+            plan.skipped += 1
+            continue
+        times.append(timestamp)
+        ops.append(op)
+        xs.append(x)
+        ys.append(y)
+        args.append(arg)
+    if move_quantum:
+        return coalesce_moves(plan, move_quantum)
+    return plan
+
+
+def coalesce_moves(plan, quantum):
+    """Returns a copy of `plan` in which moves closer together than `quantum` seconds
+    collapse into one move to their final position.
+
+    A run starts at its first move; the merged move keeps the deadline of the
+    last move it replaces. Clicks, keys and scrolls end the run, so they are
+    never reordered against moves. plan.coalesced counts the dropped moves.
+    """
+    out = PlaybackPlan()
+    out.names = plan.names
+    out.skipped = plan.skipped
+    out.coalesced = plan.coalesced
+    times, ops, xs, ys, args = out.times, out.ops, out.xs, out.ys, out.args
+
+    def emit(timestamp, op, x, y, arg):
+        times.append(timestamp)
+        ops.append(op)
+        xs.append(x)
+        ys.append(y)
+        args.append(arg)
+
+    pending = None # Last move of the open run
+    run_start = 0.0
+    for step in plan.steps():
+        timestamp = step[0]
+        if step[1] == OP_MOVE:
+            if pending is not None:
+                if timestamp - run_start < quantum:
+                    pending = step
+                    out.coalesced += 1
+                    continue
+                emit(*pending)
+            pending = step
+            run_start = timestamp
+            continue
+        if pending is not None: # Barrier: the cursor must be in place before the action
+            emit(*pending)
+            pending = None
+        emit(*step)
+    if pending is not None:
+        emit(*pending)
+    return out
@@ -0,0 +1,230 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""The timed playback loop, and the Player that Playback.py and the GUI drive it through."""
+import threading
+import time
+
+from .log import TRACE
+from .plan import OP_MOVE, OP_MOUSE_DOWN, OP_MOUSE_UP, OP_SCROLL, OP_KEY_DOWN, OP_KEY_UP
+
+
+def play_plan(plan, injector, scheduler=None, is_cancelled=None, trace=None, telemetry=None):
+    """Plays a compiled PlaybackPlan through an injector.
+
+    scheduler:    a DeadlineScheduler; None plays as fast as possible
+    is_cancelled: callable polled before and while waiting for each event
+    trace:        optional callable(op, x, y, arg) called after each non-move action
+    telemetry:    optional PlaybackTelemetry, sampled after every injection
+
+    Returns True if the whole plan was played, False if it was cancelled.
+    """
+    return play_plans((plan,), injector, scheduler, is_cancelled, trace, telemetry)
+
+
+def play_plans(plans, injector, scheduler=None, is_cancelled=None, trace=None, telemetry=None):
+    """Plays consecutive PlaybackPlan chunks on one timeline, as they become available.
+
+    `plans` may be a generator that blocks until the next chunk has been
+    loaded (see tinytask/pipeline.py). The scheduler's clock starts with the
+    first chunk, so loading it does not count as lateness.
+    """
+    injector.begin()
+    try:
+        started = False
+        for plan in plans:
+            if not started:
+                epoch_ns = scheduler.start() if scheduler is not None else time.perf_counter_ns()
+                if telemetry is not None:
+                    telemetry.start(epoch_ns)
+                started = True
+            if not _play_steps(plan, injector, scheduler, is_cancelled, trace, telemetry):
+                return False
+        return not (is_cancelled is not None and is_cancelled())
+    finally:
+        injector.end()
+
+
+def _play_steps(plan, injector, scheduler, is_cancelled, trace, telemetry):
+    names = plan.names
+    # Hoist the bound methods out of the loop
+    move, mouse_down, mouse_up = injector.move, injector.mouse_down, injector.mouse_up
+    scroll, key_down, key_up = injector.scroll, injector.key_down, injector.key_up
+    wait_until = scheduler.wait_until if scheduler is not None else None
+    record = telemetry.record if telemetry is not None else None
+    clock = scheduler.clock if scheduler is not None else time.perf_counter_ns
+
+    for event_time, op, x, y, arg in plan.steps():
+        if is_cancelled is not None and is_cancelled():
+            return False
+        if wait_until is not None and wait_until(event_time, is_cancelled) is None:
+            return False
+
+        # Moves first, they're by far the most common
+        if op == OP_MOVE:
+            move(x, y)
+            if record is not None:
+                record(event_time, op, clock())
+            continue
+        if op == OP_MOUSE_DOWN:
+            arg = names[arg]
+            mouse_down(x, y, arg)
+        elif op == OP_MOUSE_UP:
+            arg = names[arg]
+            mouse_up(x, y, arg)
+        elif op == OP_SCROLL:
+            scroll(arg, x, y)
+        elif op == OP_KEY_DOWN:
+            arg = names[arg]
+            key_down(arg)
+        elif op == OP_KEY_UP:
+            arg = names[arg]
+            key_up(arg)
+        if record is not None:
+            record(event_time, op, clock())
+        if trace is not None:
+            trace(op, x, y, arg)
+    return True
+
+
+def playback_tracer(logger):
+    """A play_plan() trace callable that logs each non-move action at TRACE level ([PLAY] lines)."""
+    def trace(op, x, y, arg):
+        if op == OP_MOUSE_DOWN:
+            logger.log(TRACE, f"[PLAY] Mouse Down: ({x}, {y}) {arg}")
+        elif op == OP_MOUSE_UP:
+            logger.log(TRACE, f"[PLAY] Mouse Up: ({x}, {y}) {arg}")
+        elif op == OP_SCROLL:
+            logger.log(TRACE, f"[PLAY] Mouse Scroll: ({x}, {y}) dy={arg}")
+        elif op == OP_KEY_DOWN:
+            logger.log(TRACE, f"[PLAY] Key Down: {arg}")
+        elif op == OP_KEY_UP:
+            logger.log(TRACE, f"[PLAY] Key Up: {arg}")
+    return trace
+
+
+class Player:
+    """Plays a MacroStore through an injector, one run at a time, on a worker thread.
+
+    injector:     input backend (tinytask/injectors.py); by default a PyAutoGUIInjector
+                  with `failsafe` and `pause`, created on the first run
+    trace:        optional callable(op, x, y, arg), see playback_tracer()
+    on_iteration: optional callable(player, index, stats) after each iteration
+    on_finished:  optional callable(player) when a run ends; `stats`, `error` and
+                  `telemetry` describe the run
+
+    Every run collects per-event timing (see tinytask/telemetry.py);
+    last_telemetry keeps the most recent run that injected anything. All state
+    is per instance, so independent players can run side by side.
+
+    Each run gets its own cancel Event, and is_playing stays true until the run
+    has actually returned (not just been asked to stop), so a new run can never
+    overlap one that is still waiting on a deadline or injecting.
+    """
+
+    __slots__ = ("injector", "failsafe", "pause", "trace", "on_iteration", "on_finished",
+                 "iterations", "warp", "stats", "error", "telemetry", "last_telemetry",
+                 "_playing", "_cancel", "_thread", "_lock")
+
+    def __init__(self, injector=None, failsafe=True, pause=None, trace=None, on_iteration=None, on_finished=None):
+        self.injector = injector
+        self.failsafe = failsafe
+        self.pause = pause
+        self.trace = trace
+        self.on_iteration = on_iteration
+        self.on_finished = on_finished
+        self.iterations = 1
+        self.warp = None
+        self.stats = None # LoopStats of the last run
+        self.error = None # Exception that ended the last run, if any
+        self.telemetry = None
+        self.last_telemetry = None
+        self._playing = False
+        self._cancel = None # threading.Event of the current run
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_playing(self):
+        return self._playing
+
+    def start(self, store, iterations=1, max_seconds=None, warp=None):
+        """Plays `store` on a worker thread; returns False if a run is already active.
+
+        iterations: number of runs, or FOREVER; max_seconds and warp as for play_loop()
+        """
+        cancel = self._begin()
+        if cancel is None:
+            return False
+        thread = threading.Thread(target=self._run, args=(store, iterations, max_seconds, warp, cancel),
+                                  name="tinytask-player")
+        thread.daemon = True
+        # Published only once started, so join() never sees a thread that can't be joined yet
+        with self._lock:
+            thread.start()
+            self._thread = thread
+        return True
+
+    def run(self, store, iterations=1, max_seconds=None, warp=None):
+        """Plays `store` on the calling thread; returns the LoopStats (None if it failed or one is active)."""
+        cancel = self._begin()
+        if cancel is None:
+            return None
+        return self._run(store, iterations, max_seconds, warp, cancel)
+
+    def _begin(self):
+        """Claims the player for a new run; returns its cancel Event, or None if a run is active."""
+        while True:
+            with self._lock:
+                if self._playing:
+                    return None
+                previous = self._thread
+                if previous is None or not previous.is_alive() or previous is threading.current_thread():
+                    self._playing = True
+                    self._cancel = threading.Event()
+                    return self._cancel
+            previous.join() # The last run has returned and is only finishing its on_finished callback
+
+    def _run(self, store, iterations, max_seconds, warp, cancel):
+        self.iterations, self.warp = iterations, warp
+        self.stats = self.error = self.telemetry = None
+        on_iteration = self.on_iteration
+        # Everything that can fail is inside the try, so is_playing always turns false again
+        try:
+            from .looping import play_loop
+            from .telemetry import PlaybackTelemetry
+            # Size the timing buffer for one iteration; repeats grow it by doubling (up to max_events)
+            expected = store.expected_steps()
+            self.telemetry = PlaybackTelemetry(capacity=expected) if expected else PlaybackTelemetry()
+            if self.injector is None:
+                from .injectors import PyAutoGUIInjector # Imports pyautogui on the first run, not at startup
+                self.injector = PyAutoGUIInjector(failsafe=self.failsafe, pause=self.pause)
+            # A macro that is still loading is played chunk by chunk as the loader decodes it;
+            # repeats reuse the compiled chunks without reloading anything
+            self.stats = play_loop(store.source, self.injector, iterations=iterations, max_seconds=max_seconds,
+                                   warp=warp, is_cancelled=cancel.is_set, trace=self.trace,
+                                   on_iteration=(lambda index, stats: on_iteration(self, index, stats))
+                                   if on_iteration is not None else None,
+                                   telemetry=self.telemetry)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._playing = False
+            if self.telemetry is not None and self.telemetry.count:
+                self.last_telemetry = self.telemetry
+            if self.on_finished is not None:
+                self.on_finished(self)
+        return self.stats
+
+    def stop(self):
+        """Asks the current run to stop; returns False if nothing was playing.
+
+        The run ends at its next cancellation check; is_playing turns false once it has.
+        """
+        with self._lock:
+            if not self._playing:
+                return False
+            self._cancel.set()
+            return True
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,169 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""The recording path: input callbacks that append to an event sink."""
+import time
+
+from .events import EventStore, merge_stores, MOUSE_CLICK, MOUSE_SCROLL, KEY_PRESS, KEY_RELEASE
+from .log import TRACE
+from .sources import PynputSource
+from .streamlog import StreamingRecorder, recover_log
+
+
+class Recorder:
+    """Records input from an EventSource into an EventStore (or a streaming log).
+
+    Mouse and keyboard callbacks run on different listener threads, so each
+    writes to its own sink (the mouse one also backs the jitter filter) and
+    the two streams are merged by timestamp in stop(). A StreamingRecorder
+    keeps one ring per listener internally and merges them as it writes.
+
+    trace:       optional callable(event_type, timestamp, x, y, detail, flag) called for
+                 every recorded event except mouse moves
+    stop_key:    key that ends the recording when released (e.g. pynput's Key.esc)
+    on_stop_key: called from the listener thread when stop_key is released
+    simplifier:  optional MoveSimplifier (tinytask/simplify.py) that thins mouse moves
+                 while recording; replaces the jitter_px filter. Only the mouse
+                 thread touches it (and stop(), after the listeners are joined).
+
+    All state lives on the instance (in slots), so several recorders can run
+    at once.
+    """
+
+    __slots__ = ("events", "_mouse_events", "_key_events", "is_recording", "start_time", "source",
+                 "trace", "stop_key", "on_stop_key", "jitter_px", "simplifier", "stream_error")
+
+    def __init__(self, trace=None, stop_key=None, on_stop_key=None, jitter_px=1, simplifier=None):
+        self.events = EventStore()
+        self._mouse_events = self._key_events = self.events
+        self.is_recording = False
+        self.start_time = 0.0
+        self.source = None
+        self.trace = trace
+        self.stop_key = stop_key
+        self.on_stop_key = on_stop_key
+        self.jitter_px = jitter_px
+        self.simplifier = simplifier
+        self.stream_error = None # Why the last streamed recording's log writer stopped, if it failed
+
+    def start(self, source=None, stream_path=None):
+        """Starts capturing from `source` (real input by default).
+
+        With stream_path, events are streamed to an append-only .ttlog file while
+        recording instead of being held in memory (see tinytask/streamlog.py).
+        """
+        self.stream_error = None
+        if stream_path:
+            self.events = StreamingRecorder(stream_path, clock=self._clock)
+            self.events.start()
+            self._mouse_events = self._key_events = self.events
+        else:
+            self.events = EventStore() # Clear previous recordings
+            # One single-writer buffer per listener thread; merged in stop()
+            self._mouse_events = EventStore()
+            self._key_events = EventStore()
+        if self.simplifier is not None:
+            self.simplifier.reset()
+        self.source = source if source is not None else PynputSource()
+        # Monotonic, so wall-clock changes can't skew timing
+        self.start_time = time.perf_counter()
+        self.is_recording = True
+        self.source.start(self)
+
+    def stop(self):
+        """Stops capturing and returns the recorded events as an EventStore."""
+        self.is_recording = False
+        if self.source is not None:
+            self.source.stop()
+            self.source.join() # Wait for the listener threads to finish
+        self._flush_moves()
+        if isinstance(self.events, StreamingRecorder):
+            # Flush the log, then read it back (compactly) so it can be saved as usual
+            log_path = self.events.path
+            try:
+                self.events.close()
+            except OSError as e:
+                self.stream_error = e # Keep whatever reached the disk before the writer failed
+            self.events = recover_log(log_path)
+        elif self._mouse_events is not self.events:
+            self.events = merge_stores(self._mouse_events, self._key_events)
+            self._mouse_events = self._key_events = self.events
+        return self.events
+
+    def _clock(self):
+        return time.perf_counter() - self.start_time
+
+    def _flush_moves(self):
+        """Writes out the move the simplifier is holding back, before any other mouse event."""
+        if self.simplifier is not None:
+            for t, x, y in self.simplifier.flush():
+                self._mouse_events.append_move(t, x, y)
+
+    # --- Event Handlers (called from the source's threads) ---
+
+    def on_mouse_click(self, x, y, button, pressed):
+        if self.is_recording:
+            self._flush_moves()
+            timestamp = time.perf_counter() - self.start_time
+            # Store whether the button was pressed down or released up
+            button = str(button) # Convert button object to string (e.g., "Button.left")
+            self._mouse_events.append_click(timestamp, x, y, button, pressed)
+            if self.trace is not None:
+                self.trace(MOUSE_CLICK, timestamp, x, y, button, pressed)
+
+    def on_mouse_move(self, x, y):
+        if self.is_recording:
+            if self.simplifier is not None:
+                timestamp = time.perf_counter() - self.start_time
+                for t, px, py in self.simplifier.push(timestamp, x, y):
+                    self._mouse_events.append_move(t, px, py)
+                return
+            # Only record if the mouse has moved a significant distance
+            # or if it's the first move event after a non-move event.
+            # This reduces redundant data for small jitters.
+            if not self._mouse_events.last_move_within(x, y, self.jitter_px):
+                self._mouse_events.append_move(time.perf_counter() - self.start_time, x, y)
+
+    def on_mouse_scroll(self, x, y, dx, dy):
+        if self.is_recording:
+            self._flush_moves()
+            timestamp = time.perf_counter() - self.start_time
+            self._mouse_events.append_scroll(timestamp, x, y, dx, dy)
+            if self.trace is not None:
+                self.trace(MOUSE_SCROLL, timestamp, x, y, dx, dy)
+
+    def _on_key(self, code, key):
+        timestamp = time.perf_counter() - self.start_time
+        try:
+            # Handle alphanumeric keys (e.g., 'a', '1')
+            char = key.char
+        except AttributeError:
+            # Handle special keys (e.g., Key.space, Key.ctrl_l)
+            char = str(key)
+        self._key_events.append_key(code, timestamp, char)
+        if self.trace is not None:
+            self.trace(code, timestamp, 0, 0, char, None)
+
+    def on_key_press(self, key):
+        if self.is_recording:
+            self._on_key(KEY_PRESS, key)
+
+    def on_key_release(self, key):
+        if self.is_recording:
+            self._on_key(KEY_RELEASE, key)
+            if self.stop_key is not None and key == self.stop_key:
+                if self.on_stop_key is not None:
+                    self.on_stop_key()
+                return False # Stop the keyboard listener
+
+
+def recording_tracer(logger):
+    """A Recorder trace callable that logs each event at TRACE level ([REC] lines)."""
+    def trace(event_type, timestamp, x, y, detail, flag):
+        if event_type == MOUSE_CLICK:
+            logger.log(TRACE, f"[REC] Click: ({x}, {y}) {detail} {'Pressed' if flag else 'Released'} @ {timestamp:.3f}s")
+        elif event_type == MOUSE_SCROLL:
+            logger.log(TRACE, f"[REC] Scroll: ({x}, {y}) dx={detail}, dy={flag} @ {timestamp:.3f}s")
+        elif event_type == KEY_PRESS:
+            logger.log(TRACE, f"[REC] Key Press: {detail} @ {timestamp:.3f}s")
+        elif event_type == KEY_RELEASE:
+            logger.log(TRACE, f"[REC] Key Release: {detail} @ {timestamp:.3f}s")
+    return trace
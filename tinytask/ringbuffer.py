@@ -0,0 +1,45 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Single-producer/single-consumer ring buffer for handing events between threads.
+
+Each listener thread owns one ring and is its only writer; one consumer
+drains it. The producer only ever moves `_tail` and the consumer only ever
+moves `_head`, and each index is published after the slot it covers has
+been written or read, so no lock is needed (a single attribute store is
+atomic in CPython).
+"""
+
+
+class SpscRing:
+    """Fixed-capacity FIFO; push() never blocks and returns False when full."""
+
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._head = 0 # Next slot to read (consumer only)
+        self._tail = 0 # Next slot to write (producer only)
+
+    # --- Producer side ---
+
+    def push(self, item):
+        tail = self._tail
+        if tail - self._head >= self.capacity:
+            return False
+        self._slots[tail % self.capacity] = item
+        self._tail = tail + 1 # Publish only after the slot holds the item
+        return True
+
+    # --- Consumer side ---
+
+    def drain(self, out):
+        """Moves every published item onto the list `out`; returns how many were moved."""
+        head, tail = self._head, self._tail
+        slots, capacity = self._slots, self.capacity
+        for index in range(head, tail):
+            slot = index % capacity
+            out.append(slots[slot])
+            slots[slot] = None
+        self._head = tail # Hand the slots back to the producer
+        return tail - head
+
+    def __len__(self):
+        return self._tail - self._head
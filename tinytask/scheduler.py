@@ -0,0 +1,88 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Drift-free playback timing.
+
+Every event is scheduled against an absolute deadline measured from a single
+playback epoch on time.perf_counter_ns(), so sleep overshoot and the time
+spent injecting events never accumulate across the macro. Waiting is hybrid:
+time.sleep() for the bulk of the gap, then a short busy-spin for the final
+stretch to land within a fraction of a millisecond of the deadline.
+"""
+import time
+
+# Gaps shorter than this are spun instead of slept (sleep overshoot is typically 0.1-1 ms)
+DEFAULT_SPIN_NS = 1_500_000
+# Long gaps are slept in slices so a stop request is noticed promptly
+MAX_SLEEP_SLICE_S = 0.05
+
+
+class LatenessStats:
+    """Running per-event lateness statistics, in nanoseconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.late_count = 0 # events more than 1 ms late
+
+    def record(self, lateness_ns):
+        self.count += 1
+        self.total_ns += lateness_ns
+        if lateness_ns > self.max_ns:
+            self.max_ns = lateness_ns
+        if lateness_ns > 1_000_000:
+            self.late_count += 1
+
+    def merge(self, other):
+        """Adds another run's statistics to these (e.g. across loop iterations)."""
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.late_count += other.late_count
+        if other.max_ns > self.max_ns:
+            self.max_ns = other.max_ns
+
+    @property
+    def mean_ns(self):
+        return self.total_ns / self.count if self.count else 0.0
+
+    def summary(self):
+        return (f"{self.count} events, mean lateness {self.mean_ns / 1e6:.3f} ms, "
+                f"max {self.max_ns / 1e6:.3f} ms, {self.late_count} over 1 ms")
+
+
+class DeadlineScheduler:
+    """Waits for absolute deadlines relative to a playback epoch."""
+
+    def __init__(self, spin_ns=DEFAULT_SPIN_NS, clock=time.perf_counter_ns, sleep=time.sleep):
+        self.spin_ns = spin_ns
+        self.clock = clock
+        self.sleep = sleep
+        self.epoch_ns = 0
+        self.stats = LatenessStats()
+
+    def start(self):
+        """Pins the playback epoch to now and resets the statistics."""
+        self.epoch_ns = self.clock()
+        self.stats = LatenessStats()
+        return self.epoch_ns
+
+    def wait_until(self, offset_s, is_cancelled=None):
+        """Blocks until epoch + offset_s and returns how late we woke up (ns).
+
+        Returns None if is_cancelled() became true while waiting.
+        """
+        deadline = self.epoch_ns + int(offset_s * 1e9)
+        clock = self.clock
+        now = clock()
+        while deadline - now > self.spin_ns:
+            if is_cancelled is not None and is_cancelled():
+                return None
+            self.sleep(min((deadline - now - self.spin_ns) / 1e9, MAX_SLEEP_SLICE_S))
+            now = clock()
+        while now < deadline:
+            now = clock()
+        lateness = now - deadline
+        self.stats.record(lateness)
+        return lateness
+
+    def elapsed_s(self):
+        return (self.clock() - self.epoch_ns) / 1e9
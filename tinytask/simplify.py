@@ -0,0 +1,140 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Mouse path simplification, at capture time or as an offline pass.
+
+MoveSimplifier is an opening-window variant of Ramer-Douglas-Peucker that
+works on a stream: it keeps extending the current segment while every
+skipped point stays within `tolerance_px` of where linear interpolation
+between the kept points puts the cursor at that point's timestamp
+(synchronized Euclidean distance, so both path and timing are bounded).
+Kept points are never more than `max_gap_s` apart, so the cursor is still
+updated regularly during slow drags.
+
+Usage: python -m tinytask.simplify <in> <out> [tolerance_px] [max_gap_s]
+"""
+import math
+import sys
+
+from .events import EventStore, SymbolTable, MOUSE_MOVE
+
+DEFAULT_TOLERANCE_PX = 2.0
+DEFAULT_MAX_GAP_S = 0.05
+DEFAULT_MAX_WINDOW = 64
+
+
+def _sync_error(anchor, end, point):
+    """Distance between `point` and the anchor->end segment interpolated at point's time."""
+    ta, ax, ay = anchor
+    te, ex, ey = end
+    tp, px, py = point
+    if te > ta:
+        f = (tp - ta) / (te - ta)
+        ax += f * (ex - ax)
+        ay += f * (ey - ay)
+    return math.hypot(px - ax, py - ay)
+
+
+class MoveSimplifier:
+    """Streaming simplifier for (time, x, y) mouse moves.
+
+    push() returns the points that are now final (usually none or one);
+    flush() must be called before any non-move event and at the end of
+    the recording so the held-back point is not lost.
+    """
+
+    def __init__(self, tolerance_px=DEFAULT_TOLERANCE_PX, max_gap_s=DEFAULT_MAX_GAP_S, max_window=DEFAULT_MAX_WINDOW):
+        self.tolerance_px = tolerance_px
+        self.max_gap_s = max_gap_s
+        self.max_window = max_window
+        self.reset()
+
+    def reset(self):
+        self.points_in = 0
+        self.points_out = 0
+        self.max_error_px = 0.0
+        self._anchor = None
+        self._candidate = None
+        self._skipped = []
+
+    def _fits(self, end):
+        anchor, tolerance = self._anchor, self.tolerance_px
+        if _sync_error(anchor, end, self._candidate) > tolerance:
+            return False
+        for point in self._skipped:
+            if _sync_error(anchor, end, point) > tolerance:
+                return False
+        return True
+
+    def _commit(self):
+        """Makes the candidate the new anchor and returns it."""
+        kept = self._candidate
+        for point in self._skipped:
+            error = _sync_error(self._anchor, kept, point)
+            if error > self.max_error_px:
+                self.max_error_px = error
+        self._anchor = kept
+        self._candidate = None
+        self._skipped = []
+        self.points_out += 1
+        return kept
+
+    def push(self, t, x, y):
+        point = (t, x, y)
+        self.points_in += 1
+        if self._anchor is None:
+            self._anchor = point
+            self.points_out += 1
+            return [point]
+        if self._candidate is None:
+            self._candidate = point
+            return []
+        if t - self._anchor[0] > self.max_gap_s or len(self._skipped) >= self.max_window or not self._fits(point):
+            kept = self._commit()
+            self._candidate = point
+            return [kept]
+        self._skipped.append(self._candidate)
+        self._candidate = point
+        return []
+
+    def flush(self):
+        if self._candidate is None:
+            return []
+        return [self._commit()]
+
+    @property
+    def ratio(self):
+        return self.points_in / self.points_out if self.points_out else 1.0
+
+    def report(self):
+        return (f"moves {self.points_in} -> {self.points_out} ({self.ratio:.1f}x), "
+                f"max positional error {self.max_error_px:.2f} px")
+
+
+def simplify_events(events, tolerance_px=DEFAULT_TOLERANCE_PX, max_gap_s=DEFAULT_MAX_GAP_S):
+    """Offline pass over an EventStore/MacroReader; returns (EventStore, MoveSimplifier)."""
+    simplifier = MoveSimplifier(tolerance_px, max_gap_s)
+    result = EventStore(SymbolTable(events.symbols.symbols))
+    append_move, append_row = result.append_move, result._append_row
+    for row in events.rows():
+        if row[0] == MOUSE_MOVE:
+            for t, x, y in simplifier.push(row[1], row[2], row[3]):
+                append_move(t, x, y)
+        else:
+            for t, x, y in simplifier.flush():
+                append_move(t, x, y)
+            append_row(*row)
+    for t, x, y in simplifier.flush():
+        append_move(t, x, y)
+    return result, simplifier
+
+
+if __name__ == "__main__":
+    from .macrofile import load_macro, save_macro
+    if len(sys.argv) < 3:
+        print("Usage: python -m tinytask.simplify <in> <out> [tolerance_px] [max_gap_s]")
+        sys.exit(2)
+    tolerance = float(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_TOLERANCE_PX
+    max_gap = float(sys.argv[4]) if len(sys.argv) > 4 else DEFAULT_MAX_GAP_S
+    source = load_macro(sys.argv[1])
+    simplified, simplifier = simplify_events(source, tolerance, max_gap)
+    save_macro(sys.argv[2], simplified)
+    print(f"{len(source)} -> {len(simplified)} events; {simplifier.report()}")
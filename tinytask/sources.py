@@ -0,0 +1,168 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Capture sources that feed input events into a Recorder.
+
+PynputSource listens to the real mouse and keyboard. SyntheticSource
+replays generated or previously captured events through the very same
+recorder callbacks, so recording throughput and memory can be stress-tested
+without a display or real hardware.
+"""
+import math
+import threading
+import time
+
+
+class EventSource:
+    """Base class. start() wires the source to a Recorder's on_* callbacks."""
+
+    def start(self, recorder):
+        raise NotImplementedError
+
+    def stop(self):
+        raise NotImplementedError
+
+    def join(self, timeout=None):
+        pass
+
+    def is_alive(self):
+        return False
+
+
+class PynputSource(EventSource):
+    """Real input, captured by pynput mouse and keyboard listeners."""
+
+    def __init__(self):
+        self.mouse_listener = None
+        self.keyboard_listener = None
+
+    def start(self, recorder):
+        from pynput import mouse, keyboard
+        self.mouse_listener = mouse.Listener(
+            on_click=recorder.on_mouse_click,
+            on_move=recorder.on_mouse_move,
+            on_scroll=recorder.on_mouse_scroll
+        )
+        self.keyboard_listener = keyboard.Listener(
+            on_press=recorder.on_key_press,
+            on_release=recorder.on_key_release
+        )
+        # start() runs each listener in its own thread
+        self.mouse_listener.start()
+        self.keyboard_listener.start()
+
+    def _listeners(self):
+        return [l for l in (self.mouse_listener, self.keyboard_listener) if l is not None]
+
+    def stop(self):
+        for listener in self._listeners():
+            if listener.is_alive():
+                listener.stop()
+
+    def join(self, timeout=None):
+        current = threading.current_thread()
+        for listener in self._listeners():
+            # A stop hotkey handled inside a listener callback must not join its own thread
+            if listener is not current and listener.is_alive():
+                listener.join(timeout)
+
+    def is_alive(self):
+        return any(listener.is_alive() for listener in self._listeners())
+
+
+# --- Synthetic input ---
+
+class SyntheticKey:
+    """Stands in for a pynput key: has .char for characters, str() like 'Key.esc' otherwise."""
+
+    def __init__(self, name):
+        self._name = name
+        if name is None or not name.startswith("Key."):
+            self.char = name
+
+    def __str__(self):
+        return str(self._name)
+
+
+class SyntheticButton:
+    """Stands in for a pynput mouse button; str() gives e.g. 'Button.left'."""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __str__(self):
+        return self._name
+
+
+class SyntheticSource(EventSource):
+    """Feeds legacy-format event dicts to the recorder from a background thread.
+
+    With realtime=True each event is delivered at its "time" offset (scaled by
+    speed); otherwise events are pushed as fast as the recorder accepts them.
+    """
+
+    def __init__(self, events, realtime=True, speed=1.0):
+        self.events = events
+        self.realtime = realtime
+        self.speed = speed
+        self.delivered = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, recorder):
+        self._thread = threading.Thread(target=self._run, args=(recorder,), name="tinytask-synthetic-source")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self, recorder):
+        started = time.perf_counter()
+        for event in self.events:
+            if self._stop.is_set():
+                break
+            if self.realtime:
+                delay = started + event["time"] / self.speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            kind = event["type"]
+            if kind == "mouse_move":
+                result = recorder.on_mouse_move(event["x"], event["y"])
+            elif kind == "mouse_click":
+                result = recorder.on_mouse_click(event["x"], event["y"], SyntheticButton(event["button"]), event["pressed"])
+            elif kind == "mouse_scroll":
+                result = recorder.on_mouse_scroll(event["x"], event["y"], event["dx"], event["dy"])
+            else:
+                key = SyntheticKey(event["key"])
+                if kind == "key_press":
+                    result = recorder.on_key_press(key)
+                else:
+                    result = recorder.on_key_release(key)
+            self.delivered += 1
+            if result is False: # Same convention as pynput: a callback returning False stops the source
+                break
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout=None):
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+
+def mouse_sweep(hz=1000, seconds=10.0, radius=300, center=(800, 500)):
+    """Generates high-rate mouse moves tracing circles, e.g. a 1000 Hz mouse."""
+    cx, cy = center
+    for i in range(int(hz * seconds)):
+        t = i / hz
+        angle = t * 2 * math.pi / 2.0 # one lap every 2 s
+        yield {"type": "mouse_move", "x": int(cx + radius * math.cos(angle)),
+               "y": int(cy + radius * math.sin(angle)), "time": t}
+
+
+def typing(text, interval=0.05, start=0.0):
+    """Generates key press/release pairs for a string."""
+    t = start
+    for char in text:
+        yield {"type": "key_press", "key": char, "time": t}
+        yield {"type": "key_release", "key": char, "time": t + interval / 2}
+        t += interval
@@ -0,0 +1,279 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Append-only recording log (.ttlog) written while the recording is running.
+
+The pynput callbacks push events into per-listener ring buffers and a
+background writer thread merges them by timestamp into self-contained
+chunks, fsync-ing periodically.
+Memory stays flat during capture, and if the app dies mid-recording every
+chunk that made it to disk can be recovered with recover_log().
+
+Layout (all little-endian):
+  file header  LOG_MAGIC
+  chunk        CHUNK_HEADER (magic, payload length, CRC32 of payload), then payload:
+                 u16 new symbol count, per symbol a u16 length and UTF-8 bytes
+                 (0xFFFF for None), u32 row count, then macrofile.RECORD rows
+"""
+import heapq
+import math
+import os
+import struct
+import threading
+import time
+import zlib
+from operator import itemgetter
+
+from .events import EventStore, SymbolTable, MOUSE_MOVE, MOUSE_CLICK, MOUSE_SCROLL
+from .macrofile import RECORD
+from .ringbuffer import SpscRing
+
+LOG_EXTENSION = ".ttlog"
+LOG_MAGIC = b"TTLOG\0\0\1"
+CHUNK_MAGIC = b"CHNK"
+CHUNK_HEADER = struct.Struct("<4sII")
+
+_NONE_SYMBOL = 0xFFFF
+
+
+def _count_until(rows, watermark):
+    """Number of leading rows stamped at or before `watermark`; each list is already in time order.
+
+    (bisect's key= argument would do this, but needs Python 3.10; macOS ships 3.9.)
+    """
+    if not rows or rows[-1][1] <= watermark:
+        return len(rows)
+    lo, hi = 0, len(rows)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if rows[mid][1] <= watermark:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _take_merged(mouse_rows, key_rows, watermark):
+    """Removes the rows stamped at or before `watermark` from both lists, merged by time."""
+    by_time = itemgetter(1)
+    m = _count_until(mouse_rows, watermark)
+    k = _count_until(key_rows, watermark)
+    ready = list(heapq.merge(mouse_rows[:m], key_rows[:k], key=by_time))
+    del mouse_rows[:m]
+    del key_rows[:k]
+    return ready
+
+
+def _encode_chunk(new_symbols, rows):
+    parts = [struct.pack("<H", len(new_symbols))]
+    for symbol in new_symbols:
+        if symbol is None:
+            parts.append(struct.pack("<H", _NONE_SYMBOL))
+        else:
+            encoded = symbol.encode("utf-8")
+            parts.append(struct.pack("<H", len(encoded)))
+            parts.append(encoded)
+    parts.append(struct.pack("<I", len(rows)))
+    pack = RECORD.pack
+    parts.extend(pack(*row) for row in rows)
+    payload = b"".join(parts)
+    return CHUNK_HEADER.pack(CHUNK_MAGIC, len(payload), zlib.crc32(payload)) + payload
+
+
+class StreamingRecorder:
+    """Event sink that streams recorded events to an append-only .ttlog file.
+
+    Offers the same append API as EventStore, so the recorder callbacks can
+    write to either. Call start() before recording and close() afterwards.
+
+    The mouse listener (append_move/click/scroll) and the keyboard listener
+    (append_key) each push into their own SpscRing, so the two threads never
+    contend. The writer merges both streams by timestamp; rows newer than
+    clock() - reorder_window are held back in case the other thread still
+    has an older event in flight. Without a clock, each drained batch is
+    merged on its own.
+
+    If the writer fails (disk full, I/O error), producers stop waiting for
+    it: further events are counted in `dropped` instead of blocking the
+    listener threads, and close() raises the writer's error.
+    """
+
+    def __init__(self, path, max_queue=65536, chunk_events=4096, flush_interval=0.25, fsync_interval=2.0,
+                 clock=None, reorder_window=0.05, poll_interval=0.01):
+        self.path = path
+        self.chunk_events = chunk_events
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.clock = clock
+        self.reorder_window = reorder_window
+        self.poll_interval = poll_interval
+        self.chunks_written = 0
+        self.error = None
+        self.dropped = 0 # events discarded because the writer had stopped
+        self._mouse_ring = SpscRing(max_queue)
+        self._key_ring = SpscRing(max_queue)
+        self._mouse_count = 0
+        self._key_count = 0
+        self._closing = threading.Event()
+        self._thread = None
+        # Last pushed move, for the recorder's jitter filter (mouse stream only)
+        self._last_was_move = False
+        self._last_x = 0
+        self._last_y = 0
+
+    # --- Producer side (listener callbacks) ---
+
+    def _push(self, ring, row):
+        """Queues a row for the writer; returns False if it had to be dropped."""
+        while not ring.push(row):
+            # Writer is behind: back-pressure instead of growing without limit,
+            # unless it has stopped, in which case waiting would block the listener forever
+            thread = self._thread
+            if self.error is not None or thread is None or not thread.is_alive():
+                self.dropped += 1
+                return False
+            time.sleep(0.001)
+        return True
+
+    def append_move(self, timestamp, x, y):
+        x, y = int(x), int(y)
+        self._last_was_move, self._last_x, self._last_y = True, x, y
+        if self._push(self._mouse_ring, (MOUSE_MOVE, timestamp, x, y, 0, 0)):
+            self._mouse_count += 1
+
+    def append_click(self, timestamp, x, y, button, pressed):
+        self._last_was_move = False
+        if self._push(self._mouse_ring, (MOUSE_CLICK, timestamp, int(x), int(y), button, 1 if pressed else 0)):
+            self._mouse_count += 1
+
+    def append_scroll(self, timestamp, x, y, dx, dy):
+        self._last_was_move = False
+        if self._push(self._mouse_ring, (MOUSE_SCROLL, timestamp, int(x), int(y), int(dx), int(dy))):
+            self._mouse_count += 1
+
+    def append_key(self, code, timestamp, key):
+        if self._push(self._key_ring, (code, timestamp, 0, 0, key, 0)):
+            self._key_count += 1
+
+    def last_move_within(self, x, y, tolerance):
+        return self._last_was_move and \
+            abs(self._last_x - x) <= tolerance and abs(self._last_y - y) <= tolerance
+
+    @property
+    def count(self):
+        return self._mouse_count + self._key_count
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    # --- Writer thread ---
+
+    def start(self):
+        self._file = open(self.path, "wb")
+        self._file.write(LOG_MAGIC)
+        self._thread = threading.Thread(target=self._writer_loop, name="tinytask-log-writer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _writer_loop(self):
+        symbols = SymbolTable()
+        mouse_rows, key_rows = [], []
+        pending = []
+        new_symbols = []
+        last_flush = last_fsync = time.monotonic()
+        try:
+            while True:
+                closing = self._closing.is_set() # Read before draining, so the last drain sees everything
+                self._mouse_ring.drain(mouse_rows)
+                self._key_ring.drain(key_rows)
+                if closing or self.clock is None:
+                    watermark = math.inf
+                else:
+                    watermark = self.clock() - self.reorder_window
+                for row in _take_merged(mouse_rows, key_rows, watermark):
+                    code, timestamp, x, y, a, b = row
+                    if code != MOUSE_MOVE and code != MOUSE_SCROLL:
+                        known = len(symbols)
+                        a = symbols.intern(a)
+                        if a == known:
+                            new_symbols.append(symbols.lookup(a))
+                    pending.append((code, timestamp, x, y, a, b))
+                now = time.monotonic()
+                if pending and (closing or len(pending) >= self.chunk_events or now - last_flush >= self.flush_interval):
+                    self._write_chunk(new_symbols, pending)
+                    pending, new_symbols = [], []
+                    last_flush = now
+                if closing:
+                    break
+                if now - last_fsync >= self.fsync_interval:
+                    os.fsync(self._file.fileno())
+                    last_fsync = now
+                time.sleep(self.poll_interval)
+            os.fsync(self._file.fileno())
+        except Exception as e:
+            self.error = e
+        finally:
+            self._file.close()
+
+    def _write_chunk(self, new_symbols, rows):
+        self._file.write(_encode_chunk(new_symbols, rows))
+        self._file.flush()
+        self.chunks_written += 1
+
+    def close(self):
+        """Flushes everything still queued, fsyncs and closes the log.
+
+        Raises the writer's error if it failed; the chunks written before it are recoverable.
+        """
+        if self._thread is None:
+            return
+        self._closing.set()
+        self._thread.join()
+        self._thread = None
+        if self.error is not None:
+            raise OSError(f"Recording log '{self.path}' stopped after {self.chunks_written} chunk(s) "
+                          f"({self.dropped} events dropped): {self.error}") from self.error
+
+
+# --- Recovery ---
+
+def read_log_chunks(path):
+    """Yields (symbols, rows) for every intact chunk; stops at the first torn one."""
+    symbols = SymbolTable()
+    with open(path, "rb") as f:
+        if f.read(len(LOG_MAGIC)) != LOG_MAGIC:
+            raise ValueError(f"'{path}' is not a TinyTask recording log.")
+        while True:
+            header = f.read(CHUNK_HEADER.size)
+            if len(header) < CHUNK_HEADER.size:
+                return
+            magic, length, checksum = CHUNK_HEADER.unpack(header)
+            payload = f.read(length)
+            if magic != CHUNK_MAGIC or len(payload) < length or zlib.crc32(payload) != checksum:
+                return # Torn or partially written chunk: everything before it is still good
+            (symbol_count,) = struct.unpack_from("<H", payload, 0)
+            offset = 2
+            for _ in range(symbol_count):
+                (size,) = struct.unpack_from("<H", payload, offset)
+                offset += 2
+                if size == _NONE_SYMBOL:
+                    symbols.intern(None)
+                else:
+                    symbols.intern(payload[offset:offset + size].decode("utf-8"))
+                    offset += size
+            (row_count,) = struct.unpack_from("<I", payload, offset)
+            offset += 4
+            rows = RECORD.iter_unpack(payload[offset:offset + row_count * RECORD.size])
+            yield symbols, rows
+
+
+def recover_log(path):
+    """Rebuilds an EventStore from every intact chunk of a (possibly partial) .ttlog file."""
+    store = None
+    for symbols, rows in read_log_chunks(path):
+        if store is None:
+            store = EventStore(symbols)
+        for row in rows:
+            store._append_row(*row)
+    return store if store is not None else EventStore()
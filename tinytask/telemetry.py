@@ -0,0 +1,121 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Per-event playback timing: intended versus actual injection time.
+
+The player calls record() right after each injection returns, so the
+recorded lateness covers both the scheduler's wake-up error and the time
+the injection itself took. Samples go into preallocated typed arrays (sized
+for one pass over the macro, grown by doubling when a loop repeats it or a
+streamed macro turns out longer, and capped at max_events), so recording
+costs one clock read and three array stores per event.
+"""
+import json
+from array import array
+
+from .plan import OP_NAMES
+
+DEFAULT_CAPACITY = 1 << 16
+DEFAULT_MAX_EVENTS = 5_000_000
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class PlaybackTelemetry:
+    """Timing samples for one playback run (all iterations of a loop)."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, max_events=DEFAULT_MAX_EVENTS):
+        capacity = max(1, min(capacity, max_events))
+        self.max_events = max_events
+        self.intended_ns = array('q', bytes(8 * capacity))
+        self.actual_ns = array('q', bytes(8 * capacity))
+        self.ops = array('B', bytes(capacity))
+        self.count = 0
+        self.dropped = 0 # samples beyond max_events
+        self.epoch_ns = 0
+
+    def start(self, epoch_ns):
+        """Sets the epoch later samples are measured from (once per iteration)."""
+        self.epoch_ns = epoch_ns
+
+    def _grow(self):
+        extra = min(len(self.ops), self.max_events - len(self.ops))
+        self.intended_ns.extend(array('q', bytes(8 * extra)))
+        self.actual_ns.extend(array('q', bytes(8 * extra)))
+        self.ops.extend(array('B', bytes(extra)))
+
+    def record(self, intended_s, op, actual_ns):
+        """Stores one sample: deadline (s from epoch), opcode and perf_counter_ns() after injection."""
+        i = self.count
+        if i == len(self.ops):
+            if i >= self.max_events:
+                self.dropped += 1
+                return
+            self._grow()
+        self.intended_ns[i] = int(intended_s * 1e9)
+        self.actual_ns[i] = actual_ns - self.epoch_ns
+        self.ops[i] = op
+        self.count = i + 1
+
+    def lateness_ns(self):
+        n = self.count
+        return [actual - intended for actual, intended in zip(self.actual_ns[:n], self.intended_ns[:n])]
+
+    # --- Reporting ---
+
+    def report(self, slowest=3):
+        """Summary dict: lateness percentiles (ms), end drift and the slowest event types."""
+        lateness = self.lateness_ns()
+        ordered = sorted(lateness)
+        by_op = {}
+        for op, late in zip(self.ops, lateness):
+            total, worst, count = by_op.get(op, (0, 0, 0))
+            by_op[op] = (total + late, max(worst, late), count + 1)
+        per_type = sorted(({"type": OP_NAMES[op], "count": count, "mean_ms": total / count / 1e6,
+                            "max_ms": worst / 1e6} for op, (total, worst, count) in by_op.items()),
+                          key=lambda entry: entry["mean_ms"], reverse=True)
+        return {
+            "events": self.count,
+            "dropped": self.dropped,
+            "p50_ms": _percentile(ordered, 0.50) / 1e6,
+            "p95_ms": _percentile(ordered, 0.95) / 1e6,
+            "p99_ms": _percentile(ordered, 0.99) / 1e6,
+            "max_ms": (ordered[-1] if ordered else 0) / 1e6,
+            "mean_ms": (sum(ordered) / len(ordered) if ordered else 0) / 1e6,
+            # How far behind schedule the last action landed (deadlines are absolute, so this stays flat)
+            "drift_ms": (lateness[-1] if lateness else 0) / 1e6,
+            "slowest_types": per_type[:slowest],
+        }
+
+    def summary(self):
+        r = self.report()
+        slowest = ", ".join(f"{entry['type']} {entry['mean_ms']:.2f}" for entry in r["slowest_types"])
+        return (f"lateness p50 {r['p50_ms']:.2f} / p95 {r['p95_ms']:.2f} / p99 {r['p99_ms']:.2f} / "
+                f"max {r['max_ms']:.2f} ms, drift {r['drift_ms']:.2f} ms; slowest (mean ms): {slowest}")
+
+    def to_csv(self, path):
+        import csv
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["index", "type", "intended_ms", "actual_ms", "lateness_ms"])
+            for i in range(self.count):
+                intended, actual = self.intended_ns[i], self.actual_ns[i]
+                writer.writerow([i, OP_NAMES[self.ops[i]], f"{intended / 1e6:.3f}", f"{actual / 1e6:.3f}",
+                                 f"{(actual - intended) / 1e6:.3f}"])
+
+    def to_json(self, path):
+        n = self.count
+        with open(path, "w") as f:
+            json.dump({"summary": self.report(),
+                       "events": {"type": [OP_NAMES[op] for op in self.ops[:n]],
+                                  "intended_ns": self.intended_ns[:n].tolist(),
+                                  "actual_ns": self.actual_ns[:n].tolist()}}, f)
+
+    def export(self, path):
+        """Writes CSV or JSON, picked by the file extension."""
+        if path.lower().endswith(".csv"):
+            self.to_csv(path)
+        else:
+            self.to_json(path)
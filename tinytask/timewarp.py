@@ -0,0 +1,90 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Playback speed control: speed multipliers, idle-gap caps and typing-preserving warps.
+
+A TimeWarp rewrites the deadlines of a PlaybackPlan gap by gap:
+
+  speed            every gap is divided by it; math.inf means "as fast as possible"
+  max_gap          no gap in the output is longer than this many seconds
+  keep_key_timing  gaps that end in a key event keep their recorded length, so
+                   typing rhythm is preserved while mouse travel is compressed
+
+Only the times column is rewritten; the other columns are shared with the
+source plan. apply() can be called on consecutive chunks of one macro
+(see tinytask/pipeline.py), the warp carries its position across calls.
+"""
+import math
+
+from .plan import PlaybackPlan, OP_KEY_DOWN, OP_KEY_UP
+
+AS_FAST_AS_POSSIBLE = math.inf
+
+
+class TimeWarp:
+    def __init__(self, speed=1.0, max_gap=None, keep_key_timing=False):
+        if not speed > 0:
+            raise ValueError("speed must be positive")
+        self.speed = speed
+        self.max_gap = max_gap
+        self.keep_key_timing = keep_key_timing
+        self.reset()
+
+    def reset(self):
+        """Starts a new timeline (e.g. for the next playback run)."""
+        self.steps = 0
+        self.source_duration = 0.0 # recorded time covered so far
+        self.duration = 0.0 # warped time covered so far
+        self._last_source = 0.0
+
+    @property
+    def as_fast_as_possible(self):
+        return self.speed == AS_FAST_AS_POSSIBLE and not self.keep_key_timing
+
+    @property
+    def is_identity(self):
+        return self.speed == 1.0 and self.max_gap is None
+
+    def apply(self, plan):
+        """Returns `plan` with warped deadlines (the plan itself if nothing changes)."""
+        self.steps += len(plan)
+        if not plan:
+            return plan
+        if self.is_identity:
+            self._last_source = self.source_duration = self.duration = plan.times[-1]
+            return plan
+
+        out = PlaybackPlan()
+        out.ops, out.xs, out.ys, out.args, out.names = plan.ops, plan.xs, plan.ys, plan.args, plan.names
+        out.skipped, out.coalesced = plan.skipped, plan.coalesced
+        times = out.times
+        scale = 0.0 if self.speed == AS_FAST_AS_POSSIBLE else 1.0 / self.speed
+        max_gap, keep_keys = self.max_gap, self.keep_key_timing
+        last_source, now = self._last_source, self.duration
+        for source_time, op in zip(plan.times, plan.ops):
+            gap = source_time - last_source
+            last_source = source_time
+            if not (keep_keys and (op == OP_KEY_DOWN or op == OP_KEY_UP)):
+                gap *= scale
+            if max_gap is not None and gap > max_gap:
+                gap = max_gap
+            now += gap
+            times.append(now)
+        self._last_source = self.source_duration = last_source
+        self.duration = now
+        return out
+
+    def describe(self):
+        if self.speed == AS_FAST_AS_POSSIBLE:
+            parts = ["max speed"]
+        else:
+            parts = [f"{self.speed:g}x"]
+        if self.max_gap is not None:
+            parts.append(f"pauses capped at {self.max_gap:g} s")
+        if self.keep_key_timing:
+            parts.append("typing at recorded speed")
+        return ", ".join(parts)
+
+    def summary(self, elapsed_s):
+        """One-line throughput report for a finished run that took elapsed_s seconds."""
+        elapsed_s = max(elapsed_s, 1e-9)
+        return (f"{self.steps} actions in {elapsed_s:.2f} s ({self.steps / elapsed_s:,.0f} actions/s), "
+                f"{self.source_duration / elapsed_s:.1f}x recorded speed")
@@ -0,0 +1,62 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Marshals UI work from worker threads onto the GUI thread.
+
+Tk widgets may only be touched from the thread running mainloop(). Worker
+threads (playback, loading, saving, updates) post() callables here instead,
+and the GUI thread runs them from a root.after() poll via pump(). Posting
+never waits on the GUI: it appends under a lock that is only ever held for a
+few list operations.
+
+Commands posted with a key are coalesced: a newer command with the same key
+replaces the pending one in place (so a burst of status messages costs one
+widget update, and a stale message is never shown after a newer one).
+"""
+import threading
+from collections import deque
+
+from .log import get_logger
+
+log = get_logger("ui")
+
+
+class UiQueue:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = deque() # [key, func, args] entries in posting order
+        self._keyed = {} # key -> pending entry
+        self.posted = 0
+        self.coalesced = 0 # commands replaced by a newer one before they ran
+
+    def post(self, func, *args, key=None):
+        """Queues func(*args) for the GUI thread; safe to call from any thread."""
+        with self._lock:
+            self.posted += 1
+            if key is not None:
+                entry = self._keyed.get(key)
+                if entry is not None:
+                    entry[1], entry[2] = func, args # Keep its place, run the newest version
+                    self.coalesced += 1
+                    return
+                entry = [key, func, args]
+                self._keyed[key] = entry
+            else:
+                entry = [None, func, args]
+            self._pending.append(entry)
+
+    def pump(self):
+        """Runs everything queued so far (GUI thread only); returns how many commands ran."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, deque()
+            self._keyed.clear()
+        # Commands posted while these run (or while a dialog below is open) wait for the next pump
+        for _, func, args in pending:
+            try:
+                func(*args)
+            except Exception:
+                log.exception(f"UI command {getattr(func, '__name__', func)!r} failed")
+        return len(pending)
+
+    def __len__(self):
+        return len(self._pending)
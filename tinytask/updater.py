@@ -0,0 +1,412 @@
+# (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
+"""Release lookup and download engine for the in-app updater.
+
+  - one pooled requests.Session (imported on first use) for the API call and
+    every download request
+  - downloads stream in DEFAULT_CHUNK_BYTES pieces into a partial file and
+    resume with HTTP Range requests after an interruption, guarded by
+    If-Range so parts of two different archives are never spliced together
+    (without a validator the download starts over); large archives from
+    servers that accept ranges are fetched as parallel segments
+  - archives are checked against the release's SHA-256 digest (from the
+    uploaded .zip asset's "digest", or a "SHA-256: <hex>" line in the release
+    notes) and kept in a content-addressed cache, so a release is only ever
+    downloaded once
+
+Release checks are cached too: the last API response is kept on disk with
+its ETag, answered from there while younger than the TTL, and revalidated
+with If-None-Match afterwards (a 304 costs no body and no rate limit).
+UpdateChecker runs checks on a background thread, on demand or on a timer.
+
+Cache layout (cache_dir):
+  blobs/<sha256>.zip     verified archives
+  partial/<key>.part<i>  unfinished download segments
+  partial/<key>.part.json  the validator and segment plan those segments belong to
+  index.json             download URL -> sha256, for releases without a published digest
+  release.json           last releases API response, its ETag and when it was checked
+"""
+import hashlib
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+
+from .log import get_logger
+
+log = get_logger("updater")
+
+DEFAULT_CHUNK_BYTES = 1 << 20 # Read size per iteration of a download stream
+PARALLEL_MIN_BYTES = 8 << 20 # Smaller archives are fetched over a single connection
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 30
+DEFAULT_CHECK_TTL = 6 * 3600 # Seconds a cached release check is trusted without asking the server
+USER_AGENT = "TinyTaskForMac-updater"
+
+_DIGEST_IN_NOTES = re.compile(r"sha-?256[:\s]+([0-9a-f]{64})", re.IGNORECASE)
+
+
+class UpdateError(Exception):
+    """Raised when a release can't be found, downloaded or verified."""
+
+
+def default_cache_dir():
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/TinyTaskForMac")
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "tinytask")
+
+
+def file_sha256(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_bytes), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Release:
+    """One release as reported by the releases API."""
+
+    def __init__(self, tag, url, sha256=None, size=None):
+        self.tag = tag
+        self.url = url
+        self.sha256 = sha256.lower() if sha256 else None
+        self.size = size
+
+    @classmethod
+    def from_api(cls, data):
+        """Builds a Release from a GitHub 'latest release' JSON document.
+
+        Prefers an uploaded .zip asset that carries a digest; falls back to the
+        source zipball, with the digest taken from the release notes if present.
+        """
+        try:
+            for asset in data.get("assets") or ():
+                digest = asset.get("digest") or ""
+                if asset.get("name", "").endswith(".zip") and digest.startswith("sha256:"):
+                    return cls(data["tag_name"], asset["browser_download_url"], digest[7:], asset.get("size"))
+            match = _DIGEST_IN_NOTES.search(data.get("body") or "")
+            return cls(data["tag_name"], data["zipball_url"], match.group(1) if match else None)
+        except (KeyError, TypeError) as e:
+            raise UpdateError(f"Unexpected releases API response (missing {e}).")
+
+    def __repr__(self):
+        return f"Release({self.tag!r}, {self.url!r}, sha256={self.sha256!r})"
+
+
+class Updater:
+    """Finds and downloads releases; safe to keep for the lifetime of the app."""
+
+    def __init__(self, api_url, cache_dir=None, chunk_bytes=DEFAULT_CHUNK_BYTES, workers=DEFAULT_WORKERS,
+                 timeout=DEFAULT_TIMEOUT, session=None):
+        self.api_url = api_url
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.chunk_bytes = chunk_bytes
+        self.workers = workers
+        self.timeout = timeout
+        self._session = session
+        self._index_lock = threading.Lock()
+        self.last_check = None # "cache", "not-modified" or "fetched", for status messages
+
+    @property
+    def session(self):
+        """The shared, connection-pooling HTTP session (created on first use)."""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(self.workers, 2))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            self._session = session
+        return self._session
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    # --- Releases API ---
+
+    def _load_release_cache(self):
+        try:
+            with open(self._path("release.json")) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cached if cached.get("url") == self.api_url else None
+
+    def _save_release_cache(self, cached):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._path("release.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(cached, f)
+        os.replace(tmp_path, self._path("release.json"))
+
+    def latest_release(self, ttl=DEFAULT_CHECK_TTL):
+        """The latest release, from the on-disk cache if it was checked less than `ttl` seconds ago.
+
+        Older cache entries are revalidated with If-None-Match; ttl=0 always asks the server.
+        """
+        cached = self._load_release_cache()
+        now = time.time()
+        if cached is not None and 0 <= now - cached.get("checked_at", 0) < ttl:
+            self.last_check = "cache"
+            return Release.from_api(cached["data"])
+        headers = {"Accept": "application/vnd.github+json"}
+        if cached is not None and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        response = self.session.get(self.api_url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            if cached is None: # Nothing to revalidate (e.g. a caching proxy answered for someone else)
+                raise UpdateError("Releases API answered 304 Not Modified, but no release is cached.")
+            self.last_check = "not-modified"
+            cached["checked_at"] = now
+        else:
+            response.raise_for_status()
+            try:
+                data = response.json()
+            except ValueError:
+                raise UpdateError("Releases API response is not valid JSON.")
+            self.last_check = "fetched"
+            cached = {"url": self.api_url, "etag": response.headers.get("ETag"), "checked_at": now, "data": data}
+        release = Release.from_api(cached["data"]) # Validate before caching
+        self._save_release_cache(cached)
+        return release
+
+    # --- Cache ---
+
+    def _path(self, *parts):
+        return os.path.join(self.cache_dir, *parts)
+
+    def _load_index(self):
+        try:
+            with open(self._path("index.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _remember(self, url, sha256):
+        with self._index_lock:
+            index = self._load_index()
+            index[url] = sha256
+            tmp_path = self._path("index.json.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(index, f, indent=1)
+            os.replace(tmp_path, self._path("index.json"))
+
+    def cached_archive(self, release):
+        """Path of the verified archive for `release` if it's in the cache, else None."""
+        sha256 = release.sha256 or self._load_index().get(release.url)
+        if not sha256:
+            return None
+        path = self._path("blobs", f"{sha256}.zip")
+        if not os.path.exists(path):
+            return None
+        if file_sha256(path, self.chunk_bytes) != sha256: # Damaged on disk; fetch it again
+            log.warning(f"Discarding corrupt cached archive {path}")
+            os.remove(path)
+            return None
+        return path
+
+    def prune(self, keep=2):
+        """Deletes all but the `keep` most recently downloaded archives; returns how many went."""
+        blobs = self._path("blobs")
+        if not os.path.isdir(blobs):
+            return 0
+        paths = sorted((os.path.join(blobs, name) for name in os.listdir(blobs)), key=os.path.getmtime, reverse=True)
+        for path in paths[keep:]:
+            os.remove(path)
+        return len(paths[keep:])
+
+    # --- Download ---
+
+    def download(self, release, progress=None):
+        """Returns the path of the verified archive for `release`, downloading only what's missing.
+
+        progress: optional callable(done_bytes, total_bytes or None), called from worker threads
+        """
+        cached = self.cached_archive(release)
+        if cached is not None:
+            log.info(f"Update {release.tag} found in cache: {cached}")
+            return cached
+        os.makedirs(self._path("blobs"), exist_ok=True)
+        os.makedirs(self._path("partial"), exist_ok=True)
+        key = release.sha256 or hashlib.sha1(release.url.encode("utf-8")).hexdigest()
+        part_prefix = self._path("partial", f"{key}.part")
+
+        segments, validator = self._plan_segments(release)
+        self._prepare_parts(part_prefix, {"validator": validator, "segments": segments})
+        total = segments[-1][1] + 1 if segments[-1][1] is not None else None
+        lock = threading.Lock()
+        done = [sum(self._part_size(f"{part_prefix}{i}") for i in range(len(segments)))]
+        def advance(count):
+            with lock:
+                done[0] += count
+                if progress is not None:
+                    progress(done[0], total)
+
+        if len(segments) == 1:
+            self._fetch_segment(release.url, f"{part_prefix}0", 0, segments[0][1], validator, advance)
+        else:
+            from concurrent.futures import ThreadPoolExecutor # Only large archives need it
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(self._fetch_segment, release.url, f"{part_prefix}{i}", start, end,
+                                       validator, advance)
+                           for i, (start, end) in enumerate(segments)]
+                for future in futures:
+                    future.result()
+        return self._finish(release, part_prefix, len(segments))
+
+    def _plan_segments(self, release):
+        """([(start, end)] byte ranges (end inclusive, None = to the end of the file), validator).
+
+        The validator (a strong ETag, else Last-Modified) identifies this version of
+        the archive for If-Range; None if the server offers neither.
+        """
+        size, ranges, validator = release.size, False, None
+        try:
+            response = self.session.head(release.url, allow_redirects=True, timeout=self.timeout)
+            if response.ok:
+                length = response.headers.get("Content-Length")
+                size = int(length) if length and length.isdigit() else size
+                ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+                etag = response.headers.get("ETag")
+                # Weak ETags can't be used with If-Range
+                validator = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified")
+        except Exception as e: # A HEAD failure only costs the parallel download and resuming
+            log.debug(f"HEAD {release.url} failed: {e}")
+        if not size or not ranges or size < PARALLEL_MIN_BYTES or self.workers < 2:
+            return [(0, None)], validator
+        count = min(self.workers, -(-size // self.chunk_bytes))
+        step = -(-size // count)
+        return [(start, min(start + step, size) - 1) for start in range(0, size, step)], validator
+
+    def _prepare_parts(self, part_prefix, state):
+        """Keeps the parts of an earlier attempt only if they belong to the same archive and segment plan."""
+        state_path = f"{part_prefix}.json"
+        try:
+            with open(state_path) as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = None
+        state = json.loads(json.dumps(state)) # Segments as lists, as they come back from the file
+        if previous == state and state["validator"]:
+            return
+        folder, name = os.path.split(part_prefix)
+        for leftover in os.listdir(folder):
+            if leftover.startswith(name):
+                os.remove(os.path.join(folder, leftover))
+        if state["validator"]: # Without one there is nothing to resume against
+            with open(state_path, "w") as f:
+                json.dump(state, f)
+
+    @staticmethod
+    def _part_size(path):
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    def _fetch_segment(self, url, part_path, start, end, validator, advance):
+        """Fills part_path with bytes start..end, resuming from whatever it already holds.
+
+        Ranges carry If-Range: validator, so a changed archive comes back whole (200).
+        """
+        have = self._part_size(part_path)
+        if end is not None and have >= end - start + 1:
+            return
+        headers = {}
+        if have or start or end is not None:
+            headers["Range"] = f"bytes={start + have}-{'' if end is None else end}"
+            if validator:
+                headers["If-Range"] = validator
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 416 and end is None and have:
+                return # Nothing past what we already have: the earlier attempt got it all
+            response.raise_for_status()
+            mode = "ab"
+            if headers and response.status_code != 206:
+                if start or end is not None:
+                    raise UpdateError(f"Server ignored the range request for {url}, "
+                                      "or the archive changed during the download.")
+                log.info("Server sent the whole archive (it changed, or can't resume); downloading from the start.")
+                advance(-have)
+                mode = "wb"
+            elif have:
+                log.info(f"Resuming download at byte {start + have:,}.")
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(self.chunk_bytes):
+                    f.write(chunk)
+                    advance(len(chunk))
+
+    def _finish(self, release, part_prefix, count):
+        """Joins and verifies the segments, then moves the archive into the cache."""
+        joined = f"{part_prefix}.joined"
+        digest = hashlib.sha256()
+        with open(joined, "wb") as out:
+            for i in range(count):
+                with open(f"{part_prefix}{i}", "rb") as f:
+                    for chunk in iter(lambda: f.read(self.chunk_bytes), b""):
+                        digest.update(chunk)
+                        out.write(chunk)
+        sha256 = digest.hexdigest()
+        for i in range(count):
+            os.remove(f"{part_prefix}{i}")
+        if os.path.exists(f"{part_prefix}.json"):
+            os.remove(f"{part_prefix}.json")
+        if release.sha256 and sha256 != release.sha256:
+            os.remove(joined)
+            raise UpdateError(f"Downloaded archive for {release.tag} failed verification "
+                              f"(SHA-256 {sha256}, expected {release.sha256}).")
+        if not release.sha256:
+            log.warning(f"Release {release.tag} publishes no SHA-256 digest; archive is {sha256}.")
+        path = self._path("blobs", f"{sha256}.zip")
+        os.replace(joined, path)
+        self._remember(release.url, sha256)
+        return path
+
+
+class UpdateChecker:
+    """Runs release checks on a background thread, on request and optionally every `interval` seconds.
+
+    on_result(release, error, manual) is called from the checker thread after
+    each check; `manual` tells requested checks apart from scheduled ones.
+    """
+
+    def __init__(self, updater, on_result, interval=None, ttl=DEFAULT_CHECK_TTL):
+        self.updater = updater
+        self.on_result = on_result
+        self.interval = interval
+        self.ttl = ttl
+        self._requests = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="update-checker", daemon=True)
+        self._thread.start()
+        return self
+
+    def check_now(self, manual=True):
+        """Queues a check; returns immediately."""
+        self._requests.put(manual)
+
+    def stop(self):
+        self._requests.put(None)
+
+    def _run(self):
+        while True:
+            try:
+                manual = self._requests.get(timeout=self.interval)
+            except queue.Empty:
+                manual = False # Scheduled check
+            if manual is None:
+                return
+            try:
+                release, error = self.updater.latest_release(self.ttl), None
+            except Exception as e:
+                release, error = None, e
+            try:
+                self.on_result(release, error, manual)
+            except Exception:
+                log.exception("Update check callback failed")
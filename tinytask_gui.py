@@ -1,31 +1,59 @@
 # (c) EXB Studios - An Amajei Global Inc. Company, 2025. All rights reserved. See /Copyright/ for more info.
 import time
-from pynput import mouse, keyboard
-import json
 import threading
-import pyautogui
 import tkinter as tk
-from tkinter import filedialog, messagebox
-import requests # <-- New import!
-import os       # <-- New import!
-import zipfile  # <-- New import!
-import shutil   # <-- New import!
+from tkinter import filedialog, messagebox, ttk
+import os
+# pynput, pyautogui, requests, zipfile and the updater are imported where they are
+# first used, so none of them delays the window (see benchmarks/bench_startup.py)
+from tinytask.recorder import Recorder
+from tinytask.player import Player
+from tinytask.macrostore import MacroStore, describe_load_error
+from tinytask.looping import FOREVER
+from tinytask.timewarp import TimeWarp, AS_FAST_AS_POSSIBLE
+from tinytask.uiqueue import UiQueue
+from tinytask.log import get_logger, setup_logging
 
 # --- Versioning for Updater ---
 CURRENT_VERSION = "v1.0.0"
 
 GITHUB_REPO_OWNER = "EXBStudios"
 GITHUB_REPO_NAME = "TinyTaskForMac"
-GITHUB_RELEASES_API_URL = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/releases/latest"
+# TINYTASK_RELEASES_URL points the updater elsewhere, e.g. at benchmarks/fake_release_server.py
+GITHUB_RELEASES_API_URL = (os.environ.get("TINYTASK_RELEASES_URL")
+                           or f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/releases/latest")
+
+# Macro file types offered by the save/load dialogs
+MACRO_FILETYPES = [("JSON files", "*.json"), ("TinyTask binary macros", "*.ttm"),
+                   ("Compressed macros", "*.ttz")]
+LOAD_FILETYPES = MACRO_FILETYPES + [("Recording logs", "*.ttlog")]
+
+log = get_logger("gui")
 
 # --- Global Variables ---
-recorded_events = []
-is_recording = False
-recording_start_time = 0
-is_playing = False
+save_thread = None # Worker thread while a macro is being written to disk
+# Worker threads never touch Tk directly: they post UI commands here and the
+# main loop runs them every UI_POLL_MS (see tinytask/uiqueue.py)
+ui = UiQueue()
+UI_POLL_MS = 30
+# Pooled session, resumable downloads and a verified on-disk cache (see tinytask/updater.py);
+# created on first use by get_updater()
+updater = None
+# Release checks run on their own thread and are answered from the on-disk cache
+# for UPDATE_CHECK_TTL_S; after that they revalidate with an ETag
+UPDATE_CHECK_TTL_S = 6 * 3600
+UPDATE_CHECK_INTERVAL_S = 3600 # Background re-check while the app is open
+UPDATE_CHECK_DELAY_MS = 2000 # The startup check waits until the window is up
+update_checker = None # UpdateChecker, started once the window is up
+MOVE_QUANTUM_S = 1 / 120 # Moves within one 120 Hz frame are merged into one injection
+
+# Playback speed options (see tinytask/timewarp.py)
+SPEED_CHOICES = {"0.5x": 0.5, "1x": 1.0, "2x": 2.0, "5x": 5.0, "10x": 10.0, "Max": AS_FAST_AS_POSSIBLE}
+MAX_IDLE_GAP_S = 1.0 # Longest pause kept when "Cap pauses" is ticked
 
 # Tkinter GUI elements
 status_label = None
+save_progress = None
 record_button = None
 stop_record_button = None
 play_button = None
@@ -33,101 +61,39 @@ stop_play_button = None
 save_button = None
 load_button = None
 update_button = None # <-- New button
+timing_button = None
 
-# --- Event Handlers (from previous steps, unchanged logic) ---
-
-def on_mouse_click(x, y, button, pressed):
-    global recorded_events, is_recording, recording_start_time
-    if is_recording:
-        event_type = "mouse_click"
-        timestamp = time.time() - recording_start_time
-        recorded_events.append({
-            "type": event_type,
-            "x": x,
-            "y": y,
-            "button": str(button),
-            "pressed": pressed,
-            "time": timestamp
-        })
-
-def on_mouse_move(x, y):
-    global recorded_events, is_recording, recording_start_time
-    if is_recording:
-        event_type = "mouse_move"
-        timestamp = time.time() - recording_start_time
-        if not recorded_events or \
-           recorded_events[-1]["type"] != event_type or \
-           abs(recorded_events[-1]["x"] - x) > 1 or \
-           abs(recorded_events[-1]["y"] - y) > 1:
-            recorded_events.append({
-                "type": event_type,
-                "x": x,
-                "y": y,
-                "time": timestamp
-            })
-
-def on_mouse_scroll(x, y, dx, dy):
-    global recorded_events, is_recording, recording_start_time
-    if is_recording:
-        event_type = "mouse_scroll"
-        timestamp = time.time() - recording_start_time
-        recorded_events.append({
-            "type": event_type,
-            "x": x,
-            "y": y,
-            "dx": dx,
-            "dy": dy,
-            "time": timestamp
-        })
-
-def on_key_press(key):
-    global recorded_events, is_recording, recording_start_time
-    if is_recording:
-        event_type = "key_press"
-        timestamp = time.time() - recording_start_time
-        try:
-            char = key.char
-        except AttributeError:
-            char = str(key)
-        recorded_events.append({
-            "type": event_type,
-            "key": char,
-            "time": timestamp
-        })
-
-def on_key_release(key):
-    global recorded_events, is_recording, recording_start_time
-    if is_recording:
-        event_type = "key_release"
-        timestamp = time.time() - recording_start_time
-        try:
-            char = key.char
-        except AttributeError:
-            char = str(key)
-        recorded_events.append({
-            "type": event_type,
-            "key": char,
-            "time": timestamp
-        })
+# --- Core objects (tinytask/recorder.py, player.py, macrostore.py) ---
+# The GUI only drives these and shows their results; the engine itself is shared
+# with Recorder.py and Playback.py
 
-# --- Listener Management (from previous steps, unchanged logic) ---
+recorder = Recorder()
+macro = MacroStore(MOVE_QUANTUM_S) # The recorded or loaded macro, its compiled plan, and any load in progress
 
-mouse_listener = None
-keyboard_listener = None
+# --- Listener Management (from previous steps, unchanged logic) ---
 
 def update_status(message):
+    """Shows a status message; safe from any thread (only the newest pending message is drawn)."""
+    ui.post(_show_status, message, key="status")
+    log.info(f"Status: {message}") # Keep console output for debugging (queued, never blocks)
+
+def _show_status(message):
     if status_label:
         status_label.config(text=f"Status: {message}")
-    print(f"Status: {message}") # Keep console output for debugging
+
+def _poll_ui(root):
+    root.after(UI_POLL_MS, _poll_ui, root) # Re-arm first, so a modal dialog run below can't stall the queue
+    ui.pump()
 
 def enable_buttons():
     record_button.config(state=tk.NORMAL)
     stop_record_button.config(state=tk.DISABLED)
     play_button.config(state=tk.NORMAL)
     stop_play_button.config(state=tk.DISABLED)
-    save_button.config(state=tk.NORMAL)
+    save_button.config(state=tk.NORMAL if save_thread is None else tk.DISABLED) # One save at a time
     load_button.config(state=tk.NORMAL)
     update_button.config(state=tk.NORMAL) # Enable update button
+    timing_button.config(state=tk.NORMAL if player.last_telemetry is not None else tk.DISABLED)
 
 def disable_for_recording():
     record_button.config(state=tk.DISABLED)
@@ -137,6 +103,7 @@ def disable_for_recording():
     save_button.config(state=tk.DISABLED)
     load_button.config(state=tk.DISABLED)
     update_button.config(state=tk.DISABLED) # Disable update during recording/playback
+    timing_button.config(state=tk.DISABLED)
 
 def disable_for_playback():
     record_button.config(state=tk.DISABLED)
@@ -146,184 +113,191 @@ def disable_for_playback():
     save_button.config(state=tk.DISABLED)
     load_button.config(state=tk.DISABLED)
     update_button.config(state=tk.DISABLED) # Disable update during recording/playback
+    timing_button.config(state=tk.DISABLED)
 
 def start_recording():
-    global is_recording, recorded_events, recording_start_time, mouse_listener, keyboard_listener
-
-    if is_recording:
+    if recorder.is_recording:
         update_status("Already recording.")
         return
-    if is_playing:
+    if player.is_playing:
         update_status("Cannot start recording while playback is active. Stop playback first.")
         return
 
-    recorded_events = []
-    is_recording = True
-    recording_start_time = time.time()
     update_status("Recording... Perform actions, then click 'Stop Recording'.")
     disable_for_recording()
-
-    mouse_listener = mouse.Listener(
-        on_click=on_mouse_click,
-        on_move=on_mouse_move,
-        on_scroll=on_mouse_scroll
-    )
-    keyboard_listener = keyboard.Listener(
-        on_press=on_key_press,
-        on_release=on_key_release
-    )
-    mouse_listener.start()
-    keyboard_listener.start()
+    recorder.start()
 
 def stop_recording():
-    global is_recording, mouse_listener, keyboard_listener
-
-    if not is_recording:
+    if not recorder.is_recording:
         update_status("Not currently recording.")
         return
 
-    is_recording = False
+    macro.set_events(recorder.stop()) # Also compiles the playback plan
     update_status("Stopped recording.")
     enable_buttons()
 
-    if mouse_listener and mouse_listener.is_alive():
-        mouse_listener.stop()
-        mouse_listener.join()
-    if keyboard_listener and keyboard_listener.is_alive():
-        keyboard_listener.stop()
-        keyboard_listener.join()
-    
     save_recorded_events_gui()
 
 def save_recorded_events_gui():
-    if not recorded_events:
+    global save_thread
+
+    if not macro:
         messagebox.showinfo("Info", "No macro recorded to save.")
         return
+    if save_thread is not None:
+        update_status("A save is already in progress.")
+        return
 
     filepath = filedialog.asksaveasfilename(defaultextension=".json",
-                                            filetypes=[("JSON files", "*.json")],
+                                            filetypes=MACRO_FILETYPES,
                                             initialfile="my_macro.json")
     if filepath:
-        try:
-            with open(filepath, 'w') as f:
-                json.dump(recorded_events, f, indent=4)
-            update_status(f"Saved {len(recorded_events)} events to '{filepath}'.")
-            messagebox.showinfo("Success", f"Macro saved successfully to:\n{filepath}")
-        except Exception as e:
-            update_status(f"Error saving macro: {e}")
-            messagebox.showerror("Error", f"Failed to save macro: {e}")
+        # Serialize and write on a worker thread so the window keeps repainting;
+        # the events aren't modified once recorded, so playback can run meanwhile
+        update_status(f"Saving {len(macro)} events to '{filepath}'...")
+        save_button.config(state=tk.DISABLED)
+        save_thread = threading.Thread(target=_execute_save, args=(filepath,))
+        save_thread.daemon = True
+        save_thread.start()
     else:
         update_status("Save operation cancelled.")
 
+def _execute_save(filepath):
+    global save_thread
+    last_percent = [-1]
+    def on_progress(done, total):
+        percent = done * 100 // max(total, 1)
+        if percent != last_percent[0]: # Only post when the figure changes
+            last_percent[0] = percent
+            ui.post(save_progress.config, {"value": percent}, key="save_progress")
+    try:
+        saved = macro.save(filepath, progress=on_progress) # Written to a temp file, then renamed into place
+        update_status(f"Saved {saved} events to '{filepath}'.")
+        ui.post(messagebox.showinfo, "Success", f"Macro saved successfully to:\n{filepath}")
+    except Exception as e:
+        update_status(f"Error saving macro: {e}")
+        ui.post(messagebox.showerror, "Error", f"Failed to save macro: {e}")
+    finally:
+        save_thread = None
+        ui.post(_on_save_finished)
+
+def _on_save_finished():
+    save_progress.config(value=0)
+    if not recorder.is_recording and not player.is_playing:
+        save_button.config(state=tk.NORMAL)
+
 def load_recorded_events_gui():
-    global recorded_events
+    if macro.is_loading:
+        update_status("A macro is already loading.")
+        return
 
     filepath = filedialog.askopenfilename(defaultextension=".json",
-                                          filetypes=[("JSON files", "*.json")])
+                                          filetypes=LOAD_FILETYPES)
     if filepath:
-        try:
-            with open(filepath, 'r') as f:
-                loaded_events = json.load(f)
-                if all(isinstance(e, dict) and "type" in e and "time" in e for e in loaded_events):
-                    recorded_events = loaded_events
-                    update_status(f"Loaded {len(recorded_events)} events from '{filepath}'.")
-                    messagebox.showinfo("Success", f"Macro loaded successfully from:\n{filepath}")
-                else:
-                    raise ValueError("Invalid macro file format.")
-        except FileNotFoundError:
-            update_status(f"Error: File not found: '{filepath}'.")
-            messagebox.showerror("Error", f"File not found:\n{filepath}")
-        except json.JSONDecodeError:
-            update_status(f"Error: Invalid JSON format in '{filepath}'.")
-            messagebox.showerror("Error", f"Invalid macro file format:\n{filepath}")
-        except Exception as e:
-            update_status(f"An unexpected error occurred loading macro: {e}")
-            messagebox.showerror("Error", f"An unexpected error occurred:\n{e}")
+        # Decode on a background thread; Play can start before the whole file is read
+        update_status(f"Loading '{filepath}'...")
+        macro.load_async(filepath, on_done=_on_macro_loaded)
     else:
         update_status("Load operation cancelled.")
 
+def _on_macro_loaded(loader):
+    """Called from the loader thread once the whole file has been read (or failed)."""
+    filepath, error = loader.path, loader.error
+    if error is None:
+        update_status(f"Loaded {len(macro)} events from '{filepath}' "
+                      f"({macro.plan.coalesced} moves coalesced).")
+        if not player.is_playing:
+            ui.post(messagebox.showinfo, "Success", f"Macro loaded successfully from:\n{filepath}")
+    else:
+        message = describe_load_error(filepath, error)
+        update_status(message)
+        ui.post(messagebox.showerror, "Error", f"Could not load macro:\n{filepath}\n\n{message}")
+
 # --- Playback Functionality (from previous steps, unchanged logic) ---
 
 def play_recorded_macro():
-    global is_playing, recorded_events
-
-    if not recorded_events:
+    if not macro.playable:
         update_status("No events loaded to play. Load a macro first!")
         messagebox.showinfo("Info", "No macro loaded. Please load one first.")
         return
 
-    if is_playing:
+    if player.is_playing:
         update_status("Playback is already active.")
         return
     
-    if is_recording:
+    if recorder.is_recording:
         update_status("Cannot start playback while recording is active. Stop recording first.")
         return
 
-    is_playing = True
-    update_status("Playing macro... Click 'Stop Playback' or press F9 to stop.")
-    disable_for_playback()
-
-    playback_thread = threading.Thread(target=_execute_playback)
-    playback_thread.daemon = True
-    playback_thread.start()
-
-def _execute_playback():
-    global is_playing
-
-    pyautogui.PAUSE = 0.001
-    pyautogui.FAILSAFE = True
-
-    last_event_time = 0
     try:
-        for event in recorded_events:
-            if not is_playing:
-                update_status("Playback interrupted.")
-                break
-
-            time_to_wait = event["time"] - last_event_time
-            if time_to_wait > 0:
-                time.sleep(time_to_wait)
-
-            if event["type"] == "mouse_click":
-                button_name = event["button"].replace("Button.", "").lower()
-                if event["pressed"]:
-                    pyautogui.mouseDown(event["x"], event["y"], button=button_name, _pause=False)
-                else:
-                    pyautogui.mouseUp(event["x"], event["y"], button=button_name, _pause=False)
-            elif event["type"] == "mouse_move":
-                pyautogui.moveTo(event["x"], event["y"], _pause=False)
-            elif event["type"] == "mouse_scroll":
-                scroll_amount = int(event["dy"])
-                pyautogui.scroll(scroll_amount, x=event["x"], y=event["y"], _pause=False)
-            elif event["type"] == "key_press":
-                key_to_press = event["key"]
-                if key_to_press.startswith('Key.'):
-                    key_to_press = key_to_press.split('Key.')[1].lower()
-                pyautogui.keyDown(key_to_press, _pause=False)
-            elif event["type"] == "key_release":
-                key_to_release = event["key"]
-                if key_to_release.startswith('Key.'):
-                    key_to_release = key_to_release.split('Key.')[1].lower()
-                pyautogui.keyUp(key_to_release, _pause=False)
-            
-            last_event_time = event["time"]
-
-    except pyautogui.FailSafeException:
+        repeat = int(repeat_var.get() or 1) # 0 repeats until stopped
+    except ValueError:
+        update_status("Repeat count must be a whole number (0 = loop until stopped).")
+        return
+    warp = TimeWarp(speed=SPEED_CHOICES[speed_var.get()],
+                    max_gap=MAX_IDLE_GAP_S if cap_pauses_var.get() else None,
+                    keep_key_timing=keep_key_timing_var.get())
+
+    update_status(f"Playing macro ({warp.describe()})... Click 'Stop Playback' or press F9 to stop.")
+    disable_for_playback()
+    # A macro that is still loading is played chunk by chunk as the loader decodes it
+    player.start(macro, iterations=repeat or FOREVER, warp=warp)
+
+def _on_iteration(player, index, stats):
+    """Called on the player thread after each iteration."""
+    if player.iterations != 1:
+        update_status(f"Iteration {index + 1} done in {stats.wall_s[-1]:.2f} s "
+                      f"(drift {stats.drift_s[-1] * 1e3:.1f} ms). F9 to stop.")
+
+def _on_playback_finished(player):
+    """Called on the player thread when a run ends."""
+    stats, telemetry, error = player.stats, player.telemetry, player.error
+    # Matched by name: the injector that raised has imported pyautogui, but the GUI doesn't need to
+    if type(error).__name__ == "FailSafeException":
         update_status("Playback stopped by Failsafe (mouse moved to top-left corner).")
-        messagebox.showinfo("Playback Stopped", "Macro playback was stopped by moving mouse to top-left corner (Failsafe).")
-    except Exception as e:
-        update_status(f"An error occurred during playback: {e}")
-        messagebox.showerror("Playback Error", f"An error occurred during playback: {e}")
-    finally:
-        is_playing = False
-        update_status("Playback finished.")
-        enable_buttons()
+        ui.post(messagebox.showinfo, "Playback Stopped", "Macro playback was stopped by moving mouse to top-left corner (Failsafe).")
+    elif error is not None:
+        update_status(f"An error occurred during playback: {error}")
+        ui.post(messagebox.showerror, "Playback Error", f"An error occurred during playback: {error}")
+    else:
+        if not stats.completed:
+            update_status("Playback interrupted.")
+        timing = f" Timing: {telemetry.summary()}" if telemetry.count and stats.timing.count else ""
+        update_status(f"Playback finished: {stats.summary()}.{timing}")
+    ui.post(enable_buttons)
+
+# Plays through pyautogui (created, and imported, on the first run) with its failsafe on;
+# the last run's per-event timing is kept for the Timing Report (see tinytask/telemetry.py)
+player = Player(failsafe=True, pause=0.001, on_iteration=_on_iteration, on_finished=_on_playback_finished)
+
+def show_timing_report():
+    """Shows the last run's timing report and offers to export it."""
+    last_telemetry = player.last_telemetry
+    if last_telemetry is None:
+        update_status("No playback timing recorded yet.")
+        return
+    report = last_telemetry.report()
+    lines = [f"Events: {report['events']:,}" + (f" ({report['dropped']:,} not recorded)" if report["dropped"] else ""),
+             f"Lateness p50 / p95 / p99: {report['p50_ms']:.2f} / {report['p95_ms']:.2f} / {report['p99_ms']:.2f} ms",
+             f"Max lateness: {report['max_ms']:.2f} ms",
+             f"Drift at end: {report['drift_ms']:.2f} ms",
+             "Slowest event types (mean / max ms):"]
+    lines += [f"  {entry['type']}: {entry['mean_ms']:.2f} / {entry['max_ms']:.2f} ({entry['count']:,})"
+              for entry in report["slowest_types"]]
+    if not messagebox.askyesno("Playback Timing", "\n".join(lines) + "\n\nExport per-event timing?"):
+        return
+    filepath = filedialog.asksaveasfilename(defaultextension=".csv",
+                                            filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json")])
+    if filepath:
+        try:
+            last_telemetry.export(filepath)
+            update_status(f"Exported timing for {last_telemetry.count:,} events to '{filepath}'.")
+        except OSError as e:
+            update_status(f"Error exporting timing: {e}")
+            messagebox.showerror("Export Error", f"Could not export timing: {e}")
 
 def stop_playback():
-    global is_playing
-    if is_playing:
-        is_playing = False
+    if player.stop():
         update_status("Playback stop requested.")
     else:
         update_status("No playback is currently active.")
@@ -333,12 +307,12 @@ stop_playback_listener = None
 
 def setup_playback_stop_listener():
     global stop_playback_listener
+    from pynput import keyboard # Runs on the hotkey thread, off the startup path
     def on_f9_release(key):
-        if is_playing and key == keyboard.Key.f9:
-            print("F9 hotkey detected. Requesting playback stop.")
-            if hasattr(setup_playback_stop_listener, 'root_instance'):
-                setup_playback_stop_listener.root_instance.after(0, stop_playback)
-            return False # Keep the listener active
+        if player.is_playing and key == keyboard.Key.f9:
+            log.info("F9 hotkey detected. Requesting playback stop.")
+            ui.post(stop_playback)
+        # Returns None: returning False would stop the listener, and F9 would only work once
     
     if stop_playback_listener is None:
         stop_playback_listener = keyboard.Listener(on_release=on_f9_release)
@@ -347,133 +321,133 @@ def setup_playback_stop_listener():
 
 # --- NEW: Updater Functionality ---
 
+def get_updater():
+    """The shared Updater, created (and tinytask.updater imported) on first use."""
+    global updater
+    if updater is None:
+        from tinytask.updater import Updater
+        updater = Updater(GITHUB_RELEASES_API_URL)
+    return updater
+
+def start_update_checker():
+    """The background release checker, started on first use."""
+    global update_checker
+    if update_checker is None:
+        from tinytask.updater import UpdateChecker
+        update_checker = UpdateChecker(get_updater(), _on_update_checked, interval=UPDATE_CHECK_INTERVAL_S,
+                                       ttl=UPDATE_CHECK_TTL_S).start()
+    return update_checker
+
 def check_for_updates():
-    """Checks GitHub for the latest release version."""
+    """Checks GitHub for the latest release version (on the checker thread; returns at once)."""
     update_button.config(state=tk.DISABLED) # Disable button during check
     update_status("Checking for updates...")
-    try:
-        response = requests.get(GITHUB_RELEASES_API_URL, timeout=10)
-        response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
-        latest_release = response.json()
-        latest_version = latest_release['tag_name']
-        download_url = latest_release['zipball_url'] # URL to download the source code zip
-
-        if latest_version != CURRENT_VERSION:
-            update_status(f"New version {latest_version} available! Current: {CURRENT_VERSION}")
-            if messagebox.askyesno("Update Available",
-                                   f"Version {latest_version} is available. Do you want to download and install it?\n\n"
-                                   "Warning: This will overwrite your current script files. Please save any unsaved macros."):
-                
-                # Run download and install in a separate thread to keep GUI responsive
-                update_thread = threading.Thread(target=download_and_install_update, args=(download_url, latest_version))
-                update_thread.daemon = True
-                update_thread.start()
-            else:
-                update_status("Update cancelled by user.")
-                update_button.config(state=tk.NORMAL)
+    start_update_checker().check_now()
+
+def _on_update_checked(release, error, manual):
+    """Called on the checker thread; the dialogs are shown from the Tk thread."""
+    ui.post(_show_update_result, release, error, manual)
+
+def _show_update_result(release, error, manual):
+    import requests
+    from tinytask.updater import UpdateError
+    if error is not None:
+        if not manual:
+            log.info(f"Scheduled update check failed: {error}")
+            return
+        if isinstance(error, (requests.exceptions.RequestException, UpdateError)):
+            update_status(f"Error checking for updates: {error}")
+            messagebox.showerror("Update Error", f"Could not check for updates. Error: {error}\n\nPlease check your internet connection and GitHub repository name.")
         else:
+            update_status(f"An unexpected error occurred during update check: {error}")
+            messagebox.showerror("Update Error", f"An unexpected error occurred during update check: {error}")
+        update_button.config(state=tk.NORMAL)
+        return
+
+    latest_version = release.tag
+    if latest_version == CURRENT_VERSION:
+        if manual:
             update_status(f"You are running the latest version ({CURRENT_VERSION}).")
             messagebox.showinfo("No Update", f"You are running the latest version ({CURRENT_VERSION}).")
             update_button.config(state=tk.NORMAL)
-
-    except requests.exceptions.RequestException as e:
-        update_status(f"Error checking for updates: {e}")
-        messagebox.showerror("Update Error", f"Could not check for updates. Error: {e}\n\nPlease check your internet connection and GitHub repository name.")
-        update_button.config(state=tk.NORMAL)
-    except Exception as e:
-        update_status(f"An unexpected error occurred during update check: {e}")
-        messagebox.showerror("Update Error", f"An unexpected error occurred during update check: {e}")
+        return
+    update_status(f"New version {latest_version} available! Current: {CURRENT_VERSION}")
+    if not manual:
+        return # Scheduled checks only mention it; installing is up to the user
+    if messagebox.askyesno("Update Available",
+                           f"Version {latest_version} is available. Do you want to download and install it?\n\n"
+                           "Warning: This will overwrite your current script files. Please save any unsaved macros."):
+
+        # Run download and install in a separate thread to keep GUI responsive
+        update_thread = threading.Thread(target=download_and_install_update, args=(release,))
+        update_thread.daemon = True
+        update_thread.start()
+    else:
+        update_status("Update cancelled by user.")
         update_button.config(state=tk.NORMAL)
 
-def download_and_install_update(download_url, new_version):
+def download_and_install_update(release):
     """Downloads the new version and attempts to replace current files."""
+    import requests
+    import zipfile
+    from tinytask.updater import UpdateError
+    from tinytask.installer import plan_update, apply_update
+    updater = get_updater()
+    new_version = release.tag
+    # Get the directory of the current script
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    def on_progress(done, total):
+        if total:
+            update_status(f"Downloading update {new_version}... {done * 100 // total}%")
     try:
         update_status(f"Downloading update {new_version}...")
-        response = requests.get(download_url, stream=True, timeout=30)
-        response.raise_for_status()
-
-        # Get the directory of the current script
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        temp_zip_path = os.path.join(current_dir, "update.zip")
-        temp_extract_dir = os.path.join(current_dir, "temp_update_extract")
-
-        with open(temp_zip_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
-        update_status("Extracting update...")
-        with zipfile.ZipFile(temp_zip_path, 'r') as zip_ref:
-            # GitHub zipballs contain a top-level directory like repo-name-commit_hash
-            # We need to extract that and then move its contents.
-            # Get the name of the top-level directory
-            top_level_dir = zip_ref.namelist()[0].split('/')[0] # e.g., TinyTaskForMac-hash
-            zip_ref.extractall(temp_extract_dir)
-
-        # Move files from the extracted top-level directory to the current directory
-        extracted_source_path = os.path.join(temp_extract_dir, top_level_dir)
-        
-        update_status("Installing update...")
-        # Iterate over files/dirs in the extracted source and overwrite current ones
-        # Be careful: This will overwrite *all* files from the repo.
-        # If you have other files (like my_macro.json) that shouldn't be overwritten,
-        # you need to explicitly exclude them or handle them.
-        for item in os.listdir(extracted_source_path):
-            s = os.path.join(extracted_source_path, item)
-            d = os.path.join(current_dir, item)
-            
-            # Avoid overwriting the temp zip or the current running script immediately
-            # (though the script will be restarted, so it's less critical for the script itself)
-            if item == os.path.basename(__file__):
-                continue # Skip the main script for now, let's replace it last or restart will fail
-
-            if os.path.isdir(s):
-                if os.path.exists(d):
-                    shutil.rmtree(d) # Remove existing directory to ensure clean copy
-                shutil.copytree(s, d)
-            else:
-                shutil.copy2(s, d) # copy2 preserves metadata
-
-        # Now, replace the main script if it was updated
-        shutil.copy2(os.path.join(extracted_source_path, os.path.basename(__file__)), os.path.join(current_dir, os.path.basename(__file__)))
+        # Resumes an interrupted download, and is skipped entirely if this release is already cached;
+        # the archive is verified against the release's SHA-256 digest
+        zip_path = updater.download(release, progress=on_progress)
 
+        # Only files that differ from the installed ones are streamed out of the zip,
+        # staged, and swapped in; a failure part-way rolls everything back
+        plan = plan_update(zip_path, current_dir)
+        update_status(f"Installing update: {plan.describe()}...")
+        apply_update(plan)
 
         update_status("Update successful! Please restart the application.")
-        messagebox.showinfo("Update Complete",
+        ui.post(messagebox.showinfo, "Update Complete",
                              f"TinyTask for Mac has been updated to version {new_version}.\n\n"
                              "Please restart the application to apply the changes.")
 
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, UpdateError) as e:
         update_status(f"Error downloading update: {e}")
-        messagebox.showerror("Download Error", f"Failed to download update. Error: {e}")
+        ui.post(messagebox.showerror, "Download Error", f"Failed to download update. Error: {e}")
     except zipfile.BadZipFile:
         update_status("Error: Downloaded file is not a valid zip archive.")
-        messagebox.showerror("Update Error", "Downloaded file is corrupted or not a valid zip.")
+        ui.post(messagebox.showerror, "Update Error", "Downloaded file is corrupted or not a valid zip.")
     except Exception as e:
         update_status(f"An error occurred during update installation: {e}")
-        messagebox.showerror("Installation Error", f"An error occurred during installation: {e}")
+        ui.post(messagebox.showerror, "Installation Error", f"An error occurred during installation: {e}")
     finally:
-        # Clean up temporary files
-        if os.path.exists(temp_zip_path):
-            os.remove(temp_zip_path)
-        if os.path.exists(temp_extract_dir):
-            shutil.rmtree(temp_extract_dir)
-        
-        enable_buttons() # Re-enable buttons, especially update
+        try:
+            updater.prune() # The archive itself stays cached; only old releases go
+        except Exception as e: # e.g. an archive still open elsewhere; never leave the buttons disabled
+            log.warning(f"Could not prune the update cache: {e}")
+        ui.post(enable_buttons) # Re-enable buttons, especially update
 
 # --- GUI Setup ---
 def create_gui():
-    global status_label, record_button, stop_record_button, play_button, stop_play_button, save_button, load_button, update_button
+    global status_label, save_progress, record_button, stop_record_button, play_button, stop_play_button, save_button, load_button, update_button, timing_button
+    global speed_var, cap_pauses_var, keep_key_timing_var, repeat_var
 
     root = tk.Tk()
     root.title(f"TinyTask for Mac (v{CURRENT_VERSION})") # Show version in title
-    root.geometry("300x360") # Adjusted size for new button
+    root.geometry("300x480") # Adjusted size for the speed controls, timing report and save progress
     root.resizable(False, False)
 
-    setup_playback_stop_listener.root_instance = root
-
     status_label = tk.Label(root, text="Status: Idle.", font=("Helvetica", 12), wraplength=280)
     status_label.pack(pady=10)
 
+    save_progress = ttk.Progressbar(root, length=260, maximum=100, mode="determinate")
+    save_progress.pack(pady=(0, 5))
+
     button_width = 20
 
     record_button = tk.Button(root, text="Record", command=start_recording, width=button_width, bg="#4CAF50", fg="white")
@@ -488,12 +462,32 @@ def create_gui():
     stop_play_button = tk.Button(root, text="Stop Playback (F9)", command=stop_playback, width=button_width, bg="#FF9800", fg="white", state=tk.DISABLED)
     stop_play_button.pack(pady=3)
 
+    speed_frame = tk.Frame(root)
+    speed_frame.pack(pady=3)
+    tk.Label(speed_frame, text="Speed:").pack(side=tk.LEFT)
+    speed_var = tk.StringVar(root, value="1x")
+    tk.OptionMenu(speed_frame, speed_var, *SPEED_CHOICES).pack(side=tk.LEFT)
+    tk.Label(speed_frame, text="Repeat:").pack(side=tk.LEFT)
+    repeat_var = tk.StringVar(root, value="1")
+    tk.Spinbox(speed_frame, from_=0, to=1_000_000, width=6, textvariable=repeat_var).pack(side=tk.LEFT)
+    tk.Label(speed_frame, text="(0 = loop)").pack(side=tk.LEFT)
+
+    options_frame = tk.Frame(root)
+    options_frame.pack()
+    cap_pauses_var = tk.BooleanVar(root, value=False)
+    tk.Checkbutton(options_frame, text=f"Cap pauses ({MAX_IDLE_GAP_S:g} s)", variable=cap_pauses_var).pack(side=tk.LEFT)
+    keep_key_timing_var = tk.BooleanVar(root, value=False)
+    tk.Checkbutton(options_frame, text="Real typing speed", variable=keep_key_timing_var).pack(side=tk.LEFT)
+
     save_button = tk.Button(root, text="Save Macro", command=save_recorded_events_gui, width=button_width)
     save_button.pack(pady=3)
 
     load_button = tk.Button(root, text="Load Macro", command=load_recorded_events_gui, width=button_width)
     load_button.pack(pady=3)
 
+    timing_button = tk.Button(root, text="Timing Report", command=show_timing_report, width=button_width, state=tk.DISABLED)
+    timing_button.pack(pady=3)
+
     update_button = tk.Button(root, text="Check for Updates", command=check_for_updates, width=button_width, bg="#607D8B", fg="white") # New button
     update_button.pack(pady=10) # More padding for this one
 
@@ -501,28 +495,37 @@ def create_gui():
         hotkey_thread = threading.Thread(target=setup_playback_stop_listener)
         hotkey_thread.daemon = True
         hotkey_thread.start()
-        print("Background F9 stop listener started.")
+        log.info("Background F9 stop listener started.")
 
     def on_closing():
-        if is_recording:
+        if recorder.is_recording:
             stop_recording()
-        if is_playing:
+        if player.is_playing:
             stop_playback()
+        pending_save = save_thread
+        if pending_save is not None:
+            pending_save.join() # Don't lose a macro that is half-way to disk
         time.sleep(0.5) 
         root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", on_closing)
+    _poll_ui(root)
+    # Usually answered from the cache without touching the network
+    root.after(UPDATE_CHECK_DELAY_MS, lambda: start_update_checker().check_now(manual=False))
 
     root.mainloop()
 
 if __name__ == "__main__":
-    # Ensure requests is installed
-    try:
-        import requests
-    except ImportError:
+    # Ensure requests is installed (without paying for importing it yet)
+    import importlib.util
+    if importlib.util.find_spec("requests") is None:
         print("The 'requests' library is not installed. Please install it: pip install requests")
         exit()
 
+    setup_logging()
+    # Undo an update that was cut off mid-install (e.g. by a crash or power loss)
+    from tinytask.installer import recover_interrupted_install
+    recover_interrupted_install(os.path.dirname(os.path.abspath(__file__)))
     print(f"Starting TinyTask GUI for Mac (Version {CURRENT_VERSION})...")
     print("IMPORTANT: Ensure your Python environment or terminal has Accessibility and Input Monitoring permissions in System Settings.")
     create_gui()